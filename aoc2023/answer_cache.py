@@ -0,0 +1,141 @@
+# an opt-in, on-disk cache of answers, keyed by everything that can change them:
+# the source of the solution module and of every aoc2023 module it imports
+# (transitively), the input, and any extra arguments.
+# enable it with AOC2023_ANSWER_CACHE=1.
+
+import ast
+import functools
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+
+from aoc2023.inputs import atomic_write
+
+DEFAULT_CACHE_DIR = Path("~", ".cache", "aoc2023", "answers")
+DEFAULT_MAX_ENTRIES = 512
+PACKAGE = __package__ or "aoc2023"
+PACKAGE_DIR = Path(__file__).parent
+
+
+def module_path(module_name: str) -> Path | None:
+    package, _, name = module_name.partition(".")
+    path = PACKAGE_DIR / f"{name}.py"
+    if package != PACKAGE or "." in name or not path.exists():
+        return None
+    return path
+
+
+@functools.cache
+def direct_dependencies(module_name: str) -> frozenset[str]:
+    path = module_path(module_name)
+    if path is None:
+        raise ModuleNotFoundError(module_name)
+    tree = ast.parse(path.read_text())
+    imported = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.ImportFrom) and node.module is not None:
+            imported.add(node.module)
+            # `from aoc2023 import grid`
+            imported.update(f"{node.module}.{alias.name}" for alias in node.names)
+        elif isinstance(node, ast.Import):
+            imported.update(alias.name for alias in node.names)
+    return frozenset(name for name in imported if module_path(name) is not None)
+
+
+def dependencies(module_name: str) -> list[str]:
+    """
+    The module and all the aoc2023 modules it imports, directly or not.
+
+    >>> dependencies("aoc2023.d11b")  # doctest: +ELLIPSIS
+    [..., 'aoc2023.common', 'aoc2023.d11a', 'aoc2023.d11b', 'aoc2023.inputs', ...]
+    """
+    found = {module_name}
+    to_visit = [module_name]
+    while to_visit:
+        for dependency in direct_dependencies(to_visit.pop()):
+            if dependency not in found:
+                found.add(dependency)
+                to_visit.append(dependency)
+    return sorted(found)
+
+
+@functools.cache
+def source_hash(module_name: str) -> str:
+    digest = hashlib.sha256()
+    for name in dependencies(module_name):
+        digest.update(name.encode())
+        path = module_path(name)
+        assert path is not None
+        digest.update(hashlib.sha256(path.read_bytes()).digest())
+    return digest.hexdigest()
+
+
+class AnswerCache:
+    """
+    Answers are stored one per file, and a file's mtime is its last use,
+    so the least recently used answers are evicted first.
+
+    >>> import tempfile
+    >>> with tempfile.TemporaryDirectory() as tmp_dir:
+    ...     cache = AnswerCache(Path(tmp_dir), max_entries=2)
+    ...     for i in range(3):
+    ...         cache.put(f"key{i}", i)
+    ...     print(cache.get("key0"), cache.get("key2"))
+    None 2
+    """
+
+    def __init__(self, root: Path, max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.root = root
+        self.max_entries = max_entries
+        self._last_used_ns = 0
+
+    @staticmethod
+    def key(module_name: str, input_hash: str, args: tuple[object, ...] = ()) -> str:
+        digest = hashlib.sha256()
+        for part in [source_hash(module_name), input_hash, repr(args)]:
+            digest.update(part.encode())
+            digest.update(b"\0")
+        return digest.hexdigest()
+
+    def get(self, key: str) -> int | None:
+        path = self.root / f"{key}.json"
+        try:
+            answer: int = json.loads(path.read_text())["answer"]
+        except FileNotFoundError:
+            return None
+        self.mark_used(path)
+        return answer
+
+    def put(self, key: str, answer: int) -> None:
+        self.root.mkdir(parents=True, exist_ok=True)
+        path = self.root / f"{key}.json"
+        atomic_write(path, json.dumps({"answer": answer}).encode())
+        self.mark_used(path)
+        self.evict()
+
+    def mark_used(self, path: Path) -> None:
+        # filesystems keep coarse mtimes, so set a strictly increasing one ourselves
+        self._last_used_ns = max(time.time_ns(), self._last_used_ns + 1)
+        os.utime(path, ns=(self._last_used_ns, self._last_used_ns))
+
+    def evict(self) -> None:
+        entries = sorted(
+            self.root.glob("*.json"), key=lambda path: path.stat().st_mtime_ns
+        )
+        for path in entries[: max(0, len(entries) - self.max_entries)]:
+            path.unlink(missing_ok=True)
+
+
+def enabled() -> bool:
+    return os.environ.get("AOC2023_ANSWER_CACHE", "0") not in ["", "0"]
+
+
+@functools.cache
+def default_answer_cache() -> AnswerCache:
+    root = os.environ.get("AOC2023_ANSWER_CACHE_DIR", DEFAULT_CACHE_DIR)
+    max_entries = int(
+        os.environ.get("AOC2023_ANSWER_CACHE_SIZE", str(DEFAULT_MAX_ENTRIES))
+    )
+    return AnswerCache(Path(root).expanduser(), max_entries)
@@ -0,0 +1,206 @@
+# solve many inputs per solution: the inputs are streamed to a pool of worker
+# processes, each of which imports the solution module once, when it starts.
+
+import argparse
+import importlib
+import json
+import os
+import tarfile
+import traceback
+import zipfile
+from collections import deque
+from collections.abc import Iterable, Iterator
+from concurrent.futures import BrokenExecutor, Future, ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from time import perf_counter_ns
+from typing import TYPE_CHECKING, TextIO
+
+from aoc2023.inputs import normalize
+from aoc2023.registry import select_solutions
+
+if TYPE_CHECKING:
+    from aoc2023.common import Solution
+
+# inputs submitted to the pool ahead of the one being waited for, per worker
+PREFETCH_PER_WORKER = 2
+
+_solution: "Solution | None" = None
+
+
+@dataclass
+class BatchResult:
+    index: int
+    answer: int | None
+    solve_ms: float
+    error: str | None = None
+
+
+def _init_worker(module_name: str) -> None:
+    global _solution  # noqa: PLW0603
+    _solution = importlib.import_module(module_name).solution
+
+
+def _solve(index: int, data: str) -> BatchResult:
+    assert _solution is not None
+    t_start = perf_counter_ns()
+    try:
+        answer = _solution.process_lines(data)
+    except Exception as e:  # noqa: BLE001
+        t_ms = (perf_counter_ns() - t_start) / 1e6
+        error = traceback.format_exception_only(e)[-1].strip()
+        return BatchResult(index, None, t_ms, error)
+    return BatchResult(index, answer, (perf_counter_ns() - t_start) / 1e6)
+
+
+def solve_many(
+    module_name: str, inputs: Iterable[str], jobs: int | None = None
+) -> Iterator[BatchResult]:
+    """
+    Solve each input with the solution of module_name, yielding the results
+    in the order of the inputs. An input that fails yields a result with its error.
+    Only a few inputs per worker are read ahead, so inputs can be streamed.
+
+    A worker that dies (killed, or crashed) breaks the whole pool: the input
+    waited for is then run again alone in a new pool, so that it gets the
+    error only if it is the one that kills its worker, and the inputs after
+    it are resubmitted.
+
+    >>> results = solve_many("aoc2023.d1a", ["1abc2", "treb7uchet", "abc"], jobs=2)
+    >>> [(r.index, r.answer, r.error) for r in results]
+    [(0, 12, None), (1, 77, None), (2, None, 'ValueError: Invalid line: abc')]
+    """
+    jobs = jobs or os.cpu_count() or 1
+
+    def new_pool() -> ProcessPoolExecutor:
+        return ProcessPoolExecutor(
+            max_workers=jobs, initializer=_init_worker, initargs=(module_name,)
+        )
+
+    executor = new_pool()
+    pending: deque[tuple[int, str, Future[BatchResult]]] = deque()
+
+    def submit(index: int, data: str) -> None:
+        try:
+            future = executor.submit(_solve, index, data)
+        except BrokenExecutor as e:
+            # broken by an input in flight: it is resubmitted with the others
+            future = Future()
+            future.set_exception(e)
+        pending.append((index, data, future))
+
+    def next_result() -> BatchResult:
+        nonlocal executor
+        index, data, future = pending.popleft()
+        try:
+            return future.result()
+        except BrokenExecutor:
+            pass
+        executor.shutdown()
+        executor = new_pool()
+        t_start = perf_counter_ns()
+        try:
+            result = executor.submit(_solve, index, data).result()
+        except BrokenExecutor as e:
+            t_ms = (perf_counter_ns() - t_start) / 1e6
+            error = traceback.format_exception_only(e)[-1].strip()
+            result = BatchResult(index, None, t_ms, error)
+            executor.shutdown()
+            executor = new_pool()
+        for _ in range(len(pending)):
+            submit(*pending.popleft()[:2])
+        return result
+
+    try:
+        for index, data in enumerate(inputs):
+            submit(index, normalize(data))
+            if len(pending) >= jobs * PREFETCH_PER_WORKER:
+                yield next_result()
+        while pending:
+            yield next_result()
+    finally:
+        executor.shutdown()
+
+
+def read_inputs(path: Path) -> Iterator[tuple[str, str]]:
+    """
+    Yield (name, input) for every file in a directory, a zip or a tar archive,
+    in order of name.
+    """
+    if path.is_dir():
+        for file_path in sorted(p for p in path.rglob("*") if p.is_file()):
+            yield str(file_path.relative_to(path)), file_path.read_text()
+    elif zipfile.is_zipfile(path):
+        with zipfile.ZipFile(path) as archive:
+            for info in sorted(archive.infolist(), key=lambda info: info.filename):
+                if not info.is_dir():
+                    yield info.filename, archive.read(info).decode()
+    elif tarfile.is_tarfile(path):
+        with tarfile.open(path) as archive:
+            for member in sorted(archive.getmembers(), key=lambda m: m.name):
+                f = archive.extractfile(member)
+                if f is not None:
+                    yield member.name, f.read().decode()
+    else:
+        raise ValueError(f"not a directory, a zip or a tar archive: {path}")
+
+
+def solve_inputs(
+    module_name: str, path: Path, jobs: int | None, output: TextIO | None = None
+) -> None:
+    name = module_name.rpartition(".")[2]
+    # the results come back in order, so the names of the inputs read so far
+    # are matched to them first in, first out
+    names: deque[str] = deque()
+
+    def stream_inputs() -> Iterator[str]:
+        for input_name, data in read_inputs(path):
+            names.append(input_name)
+            yield data
+
+    count = failed = 0
+    total_ms = 0.0
+    for result in solve_many(module_name, stream_inputs(), jobs):
+        input_name = names.popleft()
+        outcome = result.answer if result.error is None else result.error
+        print(f"[{result.solve_ms:7.1f} ms] {name} {input_name}: {outcome}")
+        count += 1
+        failed += result.error is not None
+        total_ms += result.solve_ms
+        if output:
+            record = {"solution": name, "name": input_name, **asdict(result)}
+            output.write(json.dumps(record) + "\n")
+    print(f"{name}: {count} inputs, {failed} failed, {total_ms:.1f} ms in total\n")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Solve every input of a directory or an archive."
+    )
+    parser.add_argument("inputs", type=Path, help="directory, zip or tar archive")
+    parser.add_argument(
+        "solutions", nargs="+", help="solutions or days to run, e.g. d5 d7b"
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=os.cpu_count(),
+        help="number of worker processes (default: number of cores)",
+    )
+    parser.add_argument(
+        "-o", "--output", type=Path, help="also write the results as JSON lines"
+    )
+    args = parser.parse_args()
+
+    output = args.output.open("w") if args.output else None
+    try:
+        for spec in select_solutions(args.solutions):
+            solve_inputs(spec.module_name, args.inputs, args.jobs, output)
+    finally:
+        if output:
+            output.close()
+
+
+if __name__ == "__main__":
+    main()
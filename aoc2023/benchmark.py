@@ -0,0 +1,171 @@
+import argparse
+import functools
+import gc
+import json
+import math
+import statistics
+from collections.abc import Callable
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from time import perf_counter_ns
+from typing import Any, Self
+
+from aoc2023.common import Phases, Solution, shared_parse
+from aoc2023.memo import CacheStats, cache_stats, reset_stats
+from aoc2023.registry import select_solutions
+
+
+@dataclass
+class Stats:
+    repeat: int
+    min_ms: float
+    median_ms: float
+    p95_ms: float
+    stdev_ms: float
+
+    @classmethod
+    def from_samples(cls, samples_ns: list[int]) -> Self:
+        """
+        >>> Stats.from_samples([3_000_000, 1_000_000, 2_000_000])
+        Stats(repeat=3, min_ms=1.0, median_ms=2.0, p95_ms=3.0, stdev_ms=1.0)
+        >>> Stats.from_samples([1_500_000])
+        Stats(repeat=1, min_ms=1.5, median_ms=1.5, p95_ms=1.5, stdev_ms=0.0)
+        """
+        samples_ms = sorted(sample / 1e6 for sample in samples_ns)
+        # nearest-rank percentile
+        p95_ms = samples_ms[math.ceil(0.95 * len(samples_ms)) - 1]
+        stdev_ms = statistics.stdev(samples_ms) if len(samples_ms) > 1 else 0.0
+        return cls(
+            repeat=len(samples_ms),
+            min_ms=samples_ms[0],
+            median_ms=statistics.median(samples_ms),
+            p95_ms=p95_ms,
+            stdev_ms=stdev_ms,
+        )
+
+
+@dataclass
+class BenchmarkResult:
+    name: str
+    year: int
+    day: int
+    part: str
+    answer: int
+    import_ms: float | None
+    warmup: int
+    phases: dict[str, Stats]
+    # phases of a single extra run, with instrumentation enabled
+    spans: Phases
+    # the memo caches used by that same run
+    caches: dict[str, CacheStats]
+
+    def to_json(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+def time_ns(f: Callable[[], Any]) -> tuple[Any, int]:
+    # like timeit, keep the garbage collector out of the measured region
+    gc.collect()
+    gc.disable()
+    try:
+        t_start = perf_counter_ns()
+        result = f()
+        t_end = perf_counter_ns()
+    finally:
+        gc.enable()
+    return result, t_end - t_start
+
+
+def benchmark_solution(
+    solution: Solution,
+    warmup: int = 1,
+    repeat: int = 5,
+    import_ms: float | None = None,
+) -> BenchmarkResult:
+    if repeat < 1:
+        raise ValueError(f"repeat must be positive, got {repeat}")
+    for _ in range(warmup):
+        solution.process_lines(solution.get_input())
+
+    # with a parse step shared by both parts, time it apart from solve_parsed
+    parse, solve_parsed = solution.parse, solution.solve_parsed
+    samples: dict[str, list[int]] = {"load": [], "solve": []}
+    if parse is not None and solve_parsed is not None:
+        samples = {"load": [], "parse": [], "solve": []}
+    answers = set()
+    for _ in range(repeat):
+        data, t_load = time_ns(solution.get_input)
+        samples["load"].append(t_load)
+        if parse is not None and solve_parsed is not None:
+            parsed, t_parse = time_ns(functools.partial(parse, data))
+            answer, t_solve = time_ns(functools.partial(solve_parsed, parsed))
+            samples["parse"].append(t_parse)
+        else:
+            answer, t_solve = time_ns(functools.partial(solution.process_lines, data))
+        samples["solve"].append(t_solve)
+        answers.add(answer)
+    if len(answers) != 1:
+        raise RuntimeError(f"{solution.name} is not deterministic: {answers}")
+    reset_stats()
+    _answer, spans = solution.solve_with_phases(shared_parse([solution]))
+    caches = {
+        name: stats
+        for name, stats in cache_stats().items()
+        if stats.hits or stats.misses
+    }
+
+    return BenchmarkResult(
+        name=solution.name,
+        year=solution.year,
+        day=solution.day,
+        part=solution.part,
+        answer=answers.pop(),
+        import_ms=import_ms,
+        warmup=warmup,
+        phases={phase: Stats.from_samples(s) for phase, s in samples.items()},
+        spans=spans,
+        caches=caches,
+    )
+
+
+def print_result(result: BenchmarkResult) -> None:
+    for phase, stats in result.phases.items():
+        print(
+            f"{result.name:>4} {phase:<5} "
+            f"min {stats.min_ms:9.2f} ms | median {stats.median_ms:9.2f} ms | "
+            f"p95 {stats.p95_ms:9.2f} ms | stdev {stats.stdev_ms:8.2f} ms"
+        )
+    for phase, phase_stats in result.spans.items():
+        print(f"{result.name:>4} {phase:>15}: {phase_stats}")
+    for name, cache in result.caches.items():
+        print(f"{result.name:>4} {name}: {cache}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark solutions.")
+    parser.add_argument(
+        "solutions", nargs="*", help="solutions or days to run, e.g. d5 d7b"
+    )
+    parser.add_argument("-w", "--warmup", type=int, default=1)
+    parser.add_argument("-r", "--repeat", type=int, default=5)
+    parser.add_argument(
+        "-o",
+        "--output-dir",
+        type=Path,
+        default=Path("benchmarks"),
+        help="directory for the per-solution JSON reports",
+    )
+    args = parser.parse_args()
+
+    args.output_dir.mkdir(parents=True, exist_ok=True)
+    for spec in select_solutions(args.solutions):
+        solution, import_ms = spec.load_timed()
+        result = benchmark_solution(solution, args.warmup, args.repeat, import_ms)
+        print_result(result)
+        args.output_dir.joinpath(f"{spec.name}.json").write_text(
+            json.dumps(result.to_json(), indent=2) + "\n"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,100 @@
-from collections.abc import Callable
+import contextlib
+import functools
+import sys
+from collections.abc import Callable, Iterable, Iterator, Sequence
 from dataclasses import dataclass
-from typing import Any, Self
+from time import perf_counter_ns, process_time_ns
+from typing import TYPE_CHECKING, Any, Self
 
-from aocd import get_data, submit  # type: ignore[attr-defined]
+from aoc2023 import answer_cache
+from aoc2023.inputs import default_store
+
+if TYPE_CHECKING:
+    from aoc2023.batch import BatchResult
 
 SolveInput = str | tuple[Any, ...]
 SolveFunc = Callable[[Any], int]
 SolveOutput = int | Callable[[], int]
+ParseFunc = Callable[[str], Any]
+SolveParsedFunc = Callable[[Any], int]
+
+
+@dataclass
+class PhaseStats:
+    calls: int = 0
+    wall_ns: int = 0
+    cpu_ns: int = 0
+    # net change in the number of memory blocks allocated by the interpreter
+    alloc_blocks: int = 0
+
+    def __str__(self) -> str:
+        return (
+            f"{self.wall_ns / 1e6:9.2f} ms wall | {self.cpu_ns / 1e6:9.2f} ms cpu | "
+            f"{self.alloc_blocks:+9} blocks | {self.calls} calls"
+        )
+
+
+Phases = dict[str, PhaseStats]
+
+
+class _Span:
+    __slots__ = ("stats", "wall_start", "cpu_start", "blocks_start")
+
+    def __init__(self, stats: PhaseStats):
+        self.stats = stats
+
+    def __enter__(self) -> None:
+        self.blocks_start = sys.getallocatedblocks()
+        self.cpu_start = process_time_ns()
+        self.wall_start = perf_counter_ns()
+
+    def __exit__(self, *exc_info: object) -> None:
+        wall_end = perf_counter_ns()
+        cpu_end = process_time_ns()
+        blocks_end = sys.getallocatedblocks()
+        self.stats.calls += 1
+        self.stats.wall_ns += wall_end - self.wall_start
+        self.stats.cpu_ns += cpu_end - self.cpu_start
+        self.stats.alloc_blocks += blocks_end - self.blocks_start
+
+
+_active_phases: Phases | None = None
+_NO_SPAN = contextlib.nullcontext()
+
+
+def span(name: str) -> contextlib.AbstractContextManager[None]:
+    """
+    Time a named phase of a solution, e.g. `with span("parse"): ...`.
+    Does nothing unless phases are being recorded, see `record_phases`.
+    Spans with the same name are summed up.
+
+    >>> with span("parse"):
+    ...     pass
+    >>> with record_phases() as phases:
+    ...     for _ in range(3):
+    ...         with span("parse"):
+    ...             pass
+    >>> list(phases), phases["parse"].calls
+    (['parse'], 3)
+    """
+    if _active_phases is None:
+        return _NO_SPAN
+    stats = _active_phases.get(name)
+    if stats is None:
+        stats = _active_phases[name] = PhaseStats()
+    return _Span(stats)
+
+
+@contextlib.contextmanager
+def record_phases() -> Iterator[Phases]:
+    global _active_phases  # noqa: PLW0603
+    previous_phases = _active_phases
+    phases: Phases = {}
+    _active_phases = phases
+    try:
+        yield phases
+    finally:
+        _active_phases = previous_phases
 
 
 @dataclass
@@ -16,18 +104,33 @@ class Solution:
     part: str
     process_lines: SolveFunc
     tests: dict[SolveInput, SolveOutput]
+    # optionally, a parse step shared by both parts of the day, and a solver
+    # of its result: process_lines(lines) is solve_parsed(parse(lines)).
+    # solve_parsed must not modify the parsed input, as the other part reuses it.
+    parse: ParseFunc | None = None
+    solve_parsed: SolveParsedFunc | None = None
 
     @classmethod
-    def from_file(
+    def from_file(  # noqa: PLR0913
         cls,
         filename: str,
         process_lines: SolveFunc,
         tests: dict[SolveInput, SolveOutput],
+        parse: ParseFunc | None = None,
+        solve_parsed: SolveParsedFunc | None = None,
     ) -> Self:
         year = int(filename.split("/")[-2][-4:])
         day = int(filename.split("/")[-1].split(".")[0][1:-1])
         part = filename.split("/")[-1].split(".")[0][-1]
-        return cls(year, day, part, process_lines, tests)
+        return cls(year, day, part, process_lines, tests, parse, solve_parsed)
+
+    @property
+    def name(self) -> str:
+        return f"d{self.day}{self.part}"
+
+    @property
+    def module_name(self) -> str:
+        return f"{__package__}.{self.name}"
 
     def test_inputs(self) -> None:
         for i, (test, expected_f) in enumerate(self.tests.items()):
@@ -38,8 +141,121 @@ class Solution:
             expected = expected_f() if callable(expected_f) else expected_f
             assert actual == expected, f"{i}: {actual=} {expected=}"
 
-    def solve(self) -> int:
-        return self.process_lines(get_data(day=self.day, year=self.year))
+    def get_input(self) -> str:
+        store = default_store()
+        data = store.get(self.year, self.day)
+        if data is None:
+            # aocd is slow to import, so it is loaded only when an input is missing
+            from aocd import get_data  # type: ignore[attr-defined]
+
+            data = get_data(day=self.day, year=self.year)
+            store.put(self.year, self.day, data)
+        return data
+
+    def input_hash(self) -> str:
+        store = default_store()
+        digest = store.hash_of(self.year, self.day)
+        if digest is None:
+            store.put(self.year, self.day, self.get_input())
+            digest = store.hash_of(self.year, self.day)
+            assert digest is not None
+        return digest
+
+    def compute(self, parsed: Callable[[], Any] | None = None) -> int:
+        if parsed is None or self.solve_parsed is None:
+            return self.process_lines(self.get_input())
+        return self.solve_parsed(parsed())
+
+    def solve(
+        self,
+        *,
+        use_cache: bool | None = None,
+        parsed: Callable[[], Any] | None = None,
+    ) -> int:
+        """
+        Solve for the user's input.
+        With use_cache (default: $AOC2023_ANSWER_CACHE), reuse a stored answer
+        if neither the input nor the source code of the solution has changed.
+        With parsed, from shared_parse, solve from the day's shared parsed input.
+        """
+        if use_cache is None:
+            use_cache = answer_cache.enabled()
+        if not use_cache:
+            return self.compute(parsed)
+        cache = answer_cache.default_answer_cache()
+        key = cache.key(self.module_name, self.input_hash())
+        answer = cache.get(key)
+        if answer is None:
+            answer = self.compute(parsed)
+            cache.put(key, answer)
+        return answer
+
+    def solve_many(
+        self, inputs: Iterable[str], jobs: int | None = None
+    ) -> Iterator["BatchResult"]:
+        """
+        Solve many inputs in a pool of worker processes that import
+        the solution once, yielding the results in the order of the inputs.
+        """
+        from aoc2023.batch import solve_many
+
+        return solve_many(self.module_name, inputs, jobs)
+
+    def solve_with_phases(
+        self, parsed: Callable[[], Any] | None = None
+    ) -> tuple[int, Phases]:
+        """
+        Solve, recording the time spent loading the input ("load") and in
+        process_lines ("solve"), along with any spans the solution code opens.
+        With parsed, the first part to call it also records "load" and "parse",
+        and "solve" is the time spent in solve_parsed.
+        """
+        with record_phases() as phases:
+            if parsed is None or self.solve_parsed is None:
+                with span("load"):
+                    data = self.get_input()
+                with span("solve"):
+                    answer = self.process_lines(data)
+            else:
+                parsed_input = parsed()
+                with span("solve"):
+                    answer = self.solve_parsed(parsed_input)
+        return answer, phases
 
     def submit(self) -> None:
+        from aocd import submit  # type: ignore[attr-defined]
+
         submit(self.solve(), part=self.part, day=self.day, year=self.year)
+
+
+def shared_parse(solutions: Sequence[Solution]) -> Callable[[], Any] | None:
+    """
+    If the solutions all declare the same parse step, return a function that
+    loads and parses their input when first called, and returns the same
+    parsed input after that. Otherwise return None.
+
+    >>> from aoc2023 import d4a, d4b, d7a, d7b, d16a, d16b
+    >>> shared_parse([d4a.solution, d4b.solution]) is not None
+    True
+    >>> shared_parse([d16a.solution, d16b.solution]) is not None
+    True
+    >>> shared_parse([d7a.solution, d7b.solution]) is None
+    True
+    """
+    first = solutions[0]
+    parse = first.parse
+    if parse is None or any(
+        # != rather than `is not`: a classmethod is a new bound method every time
+        solution.parse != parse or solution.solve_parsed is None
+        for solution in solutions
+    ):
+        return None
+
+    @functools.cache
+    def parsed() -> Any:
+        with span("load"):
+            data = first.get_input()
+        with span("parse"):
+            return parse(data)
+
+    return parsed
@@ -0,0 +1,182 @@
+# cycle detection for iterated states: once a state repeats, iteration n
+# is known without running the n steps. states are compared by a compact
+# encoding (e.g. a packed bitset), and the table keeps only an 8-byte
+# fingerprint per state, not the states themselves.
+
+import hashlib
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass, field
+from typing import Generic, TypeVar
+
+import numpy as np
+import numpy.typing as npt
+
+S = TypeVar("S")
+T = TypeVar("T")
+
+Step = Callable[[S], S]
+Encode = Callable[[S], bytes]
+
+
+def pack_bools(flags: npt.ArrayLike) -> bytes:
+    """
+    One bit per flag (of an array of any shape, flattened).
+
+    >>> pack_bools([True, False, True, True, False, False, False, False, True])
+    b'\\xb0\\x80'
+    """
+    return np.packbits(np.asarray(flags, dtype=np.bool_)).tobytes()
+
+
+def fingerprint(encoding: bytes) -> int:
+    """A 64-bit digest of the encoding: unlike hash(), stable across runs."""
+    return int.from_bytes(hashlib.blake2b(encoding, digest_size=8).digest())
+
+
+@dataclass(frozen=True)
+class Cycle:
+    """
+    The states from iteration start on repeat every length iterations.
+
+    >>> cycle = Cycle(start=3, length=4)
+    >>> [cycle.index(n) for n in [2, 3, 6, 7, 1_000_000_000]]
+    [2, 3, 6, 3, 4]
+    """
+
+    start: int
+    length: int
+
+    def index(self, n: int) -> int:
+        """The first iteration with the same state as iteration n."""
+        if n < self.start:
+            return n
+        return self.start + (n - self.start) % self.length
+
+    def extrapolate(self, totals: Sequence[int], n: int) -> int:
+        """
+        The value at iteration n of a running total, that grows by the same
+        amount in every cycle: totals holds it for iterations 0..start+length.
+
+        >>> Cycle(start=1, length=2).extrapolate([0, 5, 6, 8], 10)
+        18
+        """
+        index = self.index(n)
+        per_cycle = totals[self.start + self.length] - totals[self.start]
+        return totals[index] + (n - index) // self.length * per_cycle
+
+
+@dataclass
+class CycleFinder(Generic[S, T]):
+    """
+    Steps through the states from initial, until one repeats, with a table
+    from the fingerprint of each state to its iteration. A measure of each
+    state (like a load or a counter) is kept, to answer for any iteration
+    without more steps.
+
+    >>> step = lambda x: (x * x + 1) % 255
+    >>> finder = CycleFinder(3, step, lambda x: bytes([x]), measure=lambda x: -x)
+    >>> finder.run(), finder.iteration
+    (Cycle(start=2, length=6), 8)
+    >>> finder.measure_at(1_000_000), finder.state_at(1_000_001)
+    (-5, 26)
+    """
+
+    state: S
+    step: Step[S]
+    encode: Encode[S]
+    measure: Callable[[S], T] | None = None
+    iteration: int = 0
+    cycle: Cycle | None = None
+    measures: list[T] = field(default_factory=list)
+    _table: dict[int, int] = field(default_factory=dict)
+
+    def __post_init__(self) -> None:
+        self._visit()
+
+    def _visit(self) -> None:
+        if self.measure is not None:
+            self.measures.append(self.measure(self.state))
+        key = fingerprint(self.encode(self.state))
+        start = self._table.setdefault(key, self.iteration)
+        if start != self.iteration:
+            self.cycle = Cycle(start, self.iteration - start)
+
+    def run(self, limit: int | None = None) -> Cycle | None:
+        """Step until a state repeats, or until iteration limit."""
+        while self.cycle is None and (limit is None or self.iteration < limit):
+            self.state = self.step(self.state)
+            self.iteration += 1
+            self._visit()
+        return self.cycle
+
+    def state_at(self, n: int) -> S:
+        """
+        The state at iteration n: once the cycle is found, it takes
+        fewer than cycle.length more steps.
+        """
+        cycle = self.run(n)
+        if cycle is None or n < cycle.start:
+            if n < self.iteration:
+                raise ValueError(f"iteration {n} is already past")
+            steps = n - self.iteration
+        else:
+            steps = (cycle.index(n) - cycle.index(self.iteration)) % cycle.length
+        for _ in range(steps):
+            self.state = self.step(self.state)
+        self.iteration += steps
+        return self.state
+
+    def measure_at(self, n: int) -> T:
+        """The measure of the state at iteration n."""
+        cycle = self.run(n)
+        return self.measures[n if cycle is None else cycle.index(n)]
+
+
+def floyd(initial: S, step: Step[S], encode: Encode[S]) -> Cycle:
+    """
+    Floyd's tortoise and hare: constant memory, but three walks through
+    the states. Never returns if no state repeats.
+
+    >>> floyd(3, lambda x: (x * x + 1) % 255, lambda x: bytes([x]))
+    Cycle(start=2, length=6)
+    """
+    tortoise, hare = step(initial), step(step(initial))
+    while encode(tortoise) != encode(hare):
+        tortoise, hare = step(tortoise), step(step(hare))
+    start, tortoise = 0, initial
+    while encode(tortoise) != encode(hare):
+        tortoise, hare = step(tortoise), step(hare)
+        start += 1
+    length, hare = 1, step(tortoise)
+    while encode(tortoise) != encode(hare):
+        hare = step(hare)
+        length += 1
+    return Cycle(start, length)
+
+
+def brent(initial: S, step: Step[S], encode: Encode[S]) -> Cycle:
+    """
+    Brent's algorithm: constant memory, and fewer steps than Floyd's.
+    The tortoise jumps to the hare at every power of two, so the hare
+    finds the length directly. Never returns if no state repeats.
+
+    >>> brent(3, lambda x: (x * x + 1) % 255, lambda x: bytes([x]))
+    Cycle(start=2, length=6)
+    """
+    power = length = 1
+    tortoise, hare = encode(initial), step(initial)
+    while tortoise != encode(hare):
+        if power == length:
+            tortoise = encode(hare)
+            power *= 2
+            length = 0
+        hare = step(hare)
+        length += 1
+    # a hare length steps ahead meets the tortoise at the start of the cycle
+    start, slow, fast = 0, initial, initial
+    for _ in range(length):
+        fast = step(fast)
+    while encode(slow) != encode(fast):
+        slow, fast = step(slow), step(fast)
+        start += 1
+    return Cycle(start, length)
@@ -63,35 +63,61 @@ def get_next_direction(next_pipe: str, direction: Point) -> Point:
     raise ValueError("No next direction found")
 
 
-def find_farthest(lines: list[str]) -> int:
-    """
-    >>> find_farthest(TEST_INPUT_1.splitlines())
-    4
-    >>> find_farthest(TEST_INPUT_2.splitlines())
-    8
-    """
+@dataclass
+class Loop:
+    height: int
+    width: int
+    # the locations of the loop from the start, and the direction leaving each one
+    locations: list[Point]
+    directions: list[Point]
+
+
+def trace_loop(lines: list[str]) -> Loop:
     location = start_location = get_start_location(lines)
     direction = get_start_direction(lines, start_location)
-    loop_size = 1
+    locations, directions = [start_location], [direction]
     while (next_location := location + direction) != start_location:
-        loop_size += 1
         next_pipe = lines[next_location.y][next_location.x]
         try:
             next_direction = get_next_direction(next_pipe, direction)
         except ValueError as e:
             raise ValueError(f"disconnected loop at {next_location}") from e
+        locations.append(next_location)
+        directions.append(next_direction)
         location = next_location
         direction = next_direction
-    max_distance = loop_size // 2
+    return Loop(len(lines), len(lines[0]), locations, directions)
+
+
+def find_farthest(lines: list[str]) -> int:
+    """
+    >>> find_farthest(TEST_INPUT_1.splitlines())
+    4
+    >>> find_farthest(TEST_INPUT_2.splitlines())
+    8
+    """
+    return solve_parsed(trace_loop(lines))
+
+
+def parse_input(lines: str) -> Loop:
+    return trace_loop(lines.splitlines())
+
+
+def solve_parsed(loop: Loop) -> int:
+    max_distance = len(loop.locations) // 2
     return max_distance
 
 
 def process_lines(lines: str) -> int:
-    return find_farthest(lines.splitlines())
+    return solve_parsed(parse_input(lines))
 
 
 solution = Solution.from_file(
-    __file__, process_lines, {TEST_INPUT_1: 4, TEST_INPUT_2: 8}
+    __file__,
+    process_lines,
+    {TEST_INPUT_1: 4, TEST_INPUT_2: 8},
+    parse_input,
+    solve_parsed,
 )
 
 if __name__ == "__main__":
@@ -1,12 +1,7 @@
 import numpy as np
 
 from aoc2023.common import Solution
-from aoc2023.d10a import (
-    Point,
-    get_next_direction,
-    get_start_direction,
-    get_start_location,
-)
+from aoc2023.d10a import Loop, Point, parse_input, trace_loop
 
 TEST_INPUT_1 = """\
 ...........
@@ -73,21 +68,21 @@ def find_enclosed(lines: list[str]) -> int:
     >>> find_enclosed(TEST_INPUT_4.splitlines())
     10
     """
-    location = start_location = get_start_location(lines)
-    direction = start_direction = get_start_direction(lines, start_location)
-    turns = np.zeros(shape=(len(lines), len(lines[0])), dtype=int)
-    part_of_loop = np.zeros(shape=(len(lines), len(lines[0])), dtype=bool)
-    while True:
-        next_location = location + direction
+    return count_enclosed(trace_loop(lines))
+
+
+def count_enclosed(loop: Loop) -> int:
+    turns = np.zeros(shape=(loop.height, loop.width), dtype=int)
+    part_of_loop = np.zeros(shape=(loop.height, loop.width), dtype=bool)
+    # each location, with the directions entering and leaving it,
+    # from the one after the start around to the start
+    for next_location, direction, next_direction in zip(
+        loop.locations[1:] + loop.locations[:1],
+        loop.directions,
+        loop.directions[1:] + loop.directions[:1],
+        strict=True,
+    ):
         part_of_loop[next_location.y, next_location.x] = True
-        if next_location != start_location:
-            next_pipe = lines[next_location.y][next_location.x]
-            try:
-                next_direction = get_next_direction(next_pipe, direction)
-            except ValueError as e:
-                raise ValueError(f"disconnected loop at {next_location}") from e
-        else:
-            next_direction = start_direction
         if next_direction != direction:
             fill_below = next_direction.y > 0 or direction.y < 0
             fill_right = next_direction.x > 0 or direction.x < 0
@@ -97,10 +92,6 @@ def find_enclosed(lines: list[str]) -> int:
             turns[: next_location.y, : next_location.x] += below_right_sign
             turns[next_location.y :, : next_location.x] += -below_right_sign
             turns[: next_location.y :, next_location.x :] += -below_right_sign
-        if next_location == start_location:
-            break
-        location = next_location
-        direction = next_direction
     turns = turns * ~part_of_loop
     assert ((turns % 4) == 0).all()
     full_turns = abs(turns // 4)
@@ -108,14 +99,20 @@ def find_enclosed(lines: list[str]) -> int:
     return int(inner_locations)
 
 
+def solve_parsed(loop: Loop) -> int:
+    return count_enclosed(loop)
+
+
 def process_lines(lines: str) -> int:
-    return find_enclosed(lines.splitlines())
+    return solve_parsed(parse_input(lines))
 
 
 solution = Solution.from_file(
     __file__,
     process_lines,
     {TEST_INPUT_1: 4, TEST_INPUT_2: 4, TEST_INPUT_3: 8, TEST_INPUT_4: 10},
+    parse_input,
+    solve_parsed,
 )
 
 if __name__ == "__main__":
@@ -1,5 +1,8 @@
+import bisect
 import itertools
 from collections.abc import Generator, Iterable
+from dataclasses import dataclass
+from typing import Self
 
 from aoc2023.common import Solution
 
@@ -61,6 +64,44 @@ def extract_galaxies(grid: list[str]) -> Generator[tuple[int, int], None, None]:
                 yield i, j
 
 
+def find_empty_rows_and_cols(grid: list[str]) -> tuple[list[int], list[int]]:
+    """
+    >>> find_empty_rows_and_cols(TEST_INPUT.splitlines())
+    ([3, 7], [2, 5, 8])
+    """
+    empty_rows = [i for i, line in enumerate(grid) if line == "." * len(line)]
+    empty_cols = [
+        i for i in range(len(grid[0])) if all(line[i] == "." for line in grid)
+    ]
+    return empty_rows, empty_cols
+
+
+@dataclass
+class GalaxyMap:
+    galaxies: list[tuple[int, int]]
+    empty_rows: list[int]
+    empty_cols: list[int]
+
+    @classmethod
+    def from_lines(cls, lines: list[str]) -> Self:
+        return cls(list(extract_galaxies(lines)), *find_empty_rows_and_cols(lines))
+
+    def expanded_galaxies(self, expansion_factor: int) -> list[tuple[int, int]]:
+        """
+        >>> galaxy_map = GalaxyMap.from_lines(TEST_INPUT.splitlines())
+        >>> expanded = extract_galaxies(TEST_INPUT_EXPENDED.splitlines())
+        >>> galaxy_map.expanded_galaxies(2) == list(expanded)
+        True
+        """
+        return [
+            (
+                y + bisect.bisect(self.empty_rows, y) * (expansion_factor - 1),
+                x + bisect.bisect(self.empty_cols, x) * (expansion_factor - 1),
+            )
+            for y, x in self.galaxies
+        ]
+
+
 def distance_galaxies(
     galaxies: Iterable[tuple[int, int]]
 ) -> Generator[int, None, None]:
@@ -83,11 +124,21 @@ def distance_galaxies_on_map(lines: list[str]) -> list[int]:
     return list(distances)
 
 
+def parse_input(lines: str) -> GalaxyMap:
+    return GalaxyMap.from_lines(lines.splitlines())
+
+
+def solve_parsed(galaxy_map: GalaxyMap) -> int:
+    return sum(distance_galaxies(galaxy_map.expanded_galaxies(2)))
+
+
 def process_lines(lines: str) -> int:
-    return sum(distance_galaxies_on_map(lines.splitlines()))
+    return solve_parsed(parse_input(lines))
 
 
-solution = Solution.from_file(__file__, process_lines, {TEST_INPUT: 374})
+solution = Solution.from_file(
+    __file__, process_lines, {TEST_INPUT: 374}, parse_input, solve_parsed
+)
 
 if __name__ == "__main__":
     solution.test_inputs()
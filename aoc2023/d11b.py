@@ -2,19 +2,13 @@ import itertools
 from collections.abc import Generator, Iterable
 
 from aoc2023.common import Solution
-from aoc2023.d11a import TEST_INPUT, extract_galaxies
-
-
-def find_empty_rows_and_cols(grid: list[str]) -> tuple[list[int], list[int]]:
-    """
-    >>> find_empty_rows_and_cols(TEST_INPUT.splitlines())
-    ([3, 7], [2, 5, 8])
-    """
-    empty_rows = [i for i, line in enumerate(grid) if line == "." * len(line)]
-    empty_cols = [
-        i for i in range(len(grid[0])) if all(line[i] == "." for line in grid)
-    ]
-    return empty_rows, empty_cols
+from aoc2023.d11a import (
+    TEST_INPUT,
+    GalaxyMap,
+    extract_galaxies,
+    find_empty_rows_and_cols,
+    parse_input,
+)
 
 
 def distance_galaxies(
@@ -72,10 +66,22 @@ def process_lines(lines: str, expansion_factor: int = 1000000) -> int:
     >>> process_lines(TEST_INPUT, 100)
     8410
     """
-    return sum(distance_galaxies_on_map(lines.splitlines(), expansion_factor))
+    return solve_parsed(parse_input(lines), expansion_factor)
+
+
+def solve_parsed(galaxy_map: GalaxyMap, expansion_factor: int = 1000000) -> int:
+    distances = distance_galaxies(
+        galaxy_map.galaxies,
+        galaxy_map.empty_rows,
+        galaxy_map.empty_cols,
+        expansion_factor=expansion_factor,
+    )
+    return sum(distances)
 
 
-solution = Solution.from_file(__file__, process_lines, {TEST_INPUT: 82000210})
+solution = Solution.from_file(
+    __file__, process_lines, {TEST_INPUT: 82000210}, parse_input, solve_parsed
+)
 
 if __name__ == "__main__":
     solution.test_inputs()
@@ -1,6 +1,7 @@
 import functools
 
 from aoc2023.common import Solution
+from aoc2023.memo import record_cache_info
 
 TEST_INPUT = """\
 ???.### 1,1,3
@@ -73,10 +74,16 @@ def count_arrangements(hot_springs: str, group_sizes: tuple[int, ...]) -> int:
                 return count
         raise RuntimeError("unreachable")
 
-    return count_arrangements_(0, 0, False)
+    count = count_arrangements_(0, 0, False)
+    # counted by functools, in C, and only gathered here once per record
+    record_cache_info("d12a.count_arrangements", count_arrangements_.cache_info())
+    return count
 
 
-def parse(line: str) -> tuple[str, tuple[int, ...]]:
+Record = tuple[str, tuple[int, ...]]
+
+
+def parse(line: str) -> Record:
     """
     >>> parse(TEST_INPUT.splitlines()[0])
     ('???.###', (1, 1, 3))
@@ -85,11 +92,21 @@ def parse(line: str) -> tuple[str, tuple[int, ...]]:
     return s1, tuple(int(x) for x in s2.split(","))
 
 
+def parse_input(lines: str) -> list[Record]:
+    return [parse(line) for line in lines.splitlines()]
+
+
+def solve_parsed(records: list[Record]) -> int:
+    return sum(count_arrangements(*record) for record in records)
+
+
 def process_lines(lines: str) -> int:
-    return sum(count_arrangements(*parse(line)) for line in lines.splitlines())
+    return solve_parsed(parse_input(lines))
 
 
-solution = Solution.from_file(__file__, process_lines, {TEST_INPUT: 21})
+solution = Solution.from_file(
+    __file__, process_lines, {TEST_INPUT: 21}, parse_input, solve_parsed
+)
 
 if __name__ == "__main__":
     solution.test_inputs()
@@ -1,18 +1,22 @@
 from aoc2023.common import Solution
-from aoc2023.d12a import TEST_INPUT, count_arrangements, parse
+from aoc2023.d12a import TEST_INPUT, Record, count_arrangements, parse_input
 
 
 def duplicate(record: str, damaged: tuple[int, ...]) -> tuple[str, tuple[int, ...]]:
     return "?".join([record] * 5), damaged * 5
 
 
+def solve_parsed(records: list[Record]) -> int:
+    return sum(count_arrangements(*duplicate(*record)) for record in records)
+
+
 def process_lines(lines: str) -> int:
-    return sum(
-        count_arrangements(*duplicate(*parse(line))) for line in lines.splitlines()
-    )
+    return solve_parsed(parse_input(lines))
 
 
-solution = Solution.from_file(__file__, process_lines, {TEST_INPUT: 525152})
+solution = Solution.from_file(
+    __file__, process_lines, {TEST_INPUT: 525152}, parse_input, solve_parsed
+)
 
 if __name__ == "__main__":
     solution.test_inputs()
@@ -96,11 +96,17 @@ def split_maps(lines: str) -> list[list[str]]:
     return [s.splitlines() for s in lines.split("\n\n")]
 
 
+def solve_parsed(maps: list[list[str]]) -> int:
+    return sum(analyze_map(mirrors) for mirrors in maps)
+
+
 def process_lines(lines: str) -> int:
-    return sum(analyze_map(mirrors) for mirrors in split_maps(lines))
+    return solve_parsed(split_maps(lines))
 
 
-solution = Solution.from_file(__file__, process_lines, {TEST_INPUT: 405})
+solution = Solution.from_file(
+    __file__, process_lines, {TEST_INPUT: 405}, split_maps, solve_parsed
+)
 
 if __name__ == "__main__":
     solution.test_inputs()
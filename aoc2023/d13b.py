@@ -72,11 +72,17 @@ def analyze_map(mirrors: list[str]) -> int:
     return sum(mirror_row) + sum(mirror_col)
 
 
+def solve_parsed(maps: list[list[str]]) -> int:
+    return sum(analyze_map(mirrors) for mirrors in maps)
+
+
 def process_lines(lines: str) -> int:
-    return sum(analyze_map(mirrors) for mirrors in split_maps(lines))
+    return solve_parsed(split_maps(lines))
 
 
-solution = Solution.from_file(__file__, process_lines, {TEST_INPUT: 400})
+solution = Solution.from_file(
+    __file__, process_lines, {TEST_INPUT: 400}, split_maps, solve_parsed
+)
 
 if __name__ == "__main__":
     solution.test_inputs()
@@ -1,7 +1,11 @@
 from dataclasses import dataclass
 from typing import Self
 
+import numpy as np
+
 from aoc2023.common import Solution
+from aoc2023.cycles import pack_bools
+from aoc2023.grid import ByteGrid
 
 TEST_INPUT = """\
 O....#....
@@ -17,47 +21,35 @@ O.#..O.#.#
 """
 
 
-def tilt_line(line: str) -> str:
+def tilt_line(line: bytes) -> bytes:
     """
-    >>> tilt_line('O....#....')
-    'O....#....'
-    >>> tilt_line('O.OO#....#')
-    'OOO.#....#'
-    >>> tilt_line('.....##...')
-    '.....##...'
-    >>> tilt_line('OO.#O....O')
-    'OO.#OO....'
+    >>> tilt_line(b'O....#....')
+    b'O....#....'
+    >>> tilt_line(b'O.OO#....#')
+    b'OOO.#....#'
+    >>> tilt_line(b'.....##...')
+    b'.....##...'
+    >>> tilt_line(b'OO.#O....O')
+    b'OO.#OO....'
     """
-    new_line: list[str] = []
-    new_section_rocks = 0
-    new_section_spaces = 0
-    for c in line:
-        match c:
-            case "O":
-                new_section_rocks += 1
-            case ".":
-                new_section_spaces += 1
-            case "#":
-                new_line += (
-                    ["O"] * new_section_rocks + ["."] * new_section_spaces + ["#"]
-                )
-                new_section_rocks = 0
-                new_section_spaces = 0
-            case _:
-                raise ValueError(f"illegal character {c!r}")
-    new_line += ["O"] * new_section_rocks + ["."] * new_section_spaces
-    return "".join(new_line)
-
-
-@dataclass
-class RocksMap:
-    array: list[str]
+    new_sections = []
+    for section in line.split(b"#"):
+        rocks = section.count(b"O")
+        new_sections.append(b"O" * rocks + b"." * (len(section) - rocks))
+    return b"#".join(new_sections)
 
-    def __hash__(self) -> int:
-        return hash("".join(self.array))
+
+@dataclass(eq=False)
+class RocksMap:
+    # tilting north, east or south tilts a transposed or flipped view west
+    grid: ByteGrid
 
     def __str__(self) -> str:
-        return "\n".join(self.array)
+        return str(self.grid)
+
+    def encode(self) -> bytes:
+        """The round rocks, as a bitset: the cube rocks never move."""
+        return pack_bools(self.grid.data == ord("O"))
 
     def transpose(self) -> Self:
         """
@@ -74,7 +66,7 @@ class RocksMap:
         ....#.....
         .#.O.#O...
         """
-        return self.__class__(["".join(line) for line in zip(*self.array, strict=True)])
+        return self.__class__(self.grid.transpose())
 
     def tilt_west(self) -> Self:
         """
@@ -91,7 +83,8 @@ class RocksMap:
         #....###..
         #OO..#....
         """
-        return self.__class__([tilt_line(line) for line in self.array])
+        rows = [tilt_line(row) for row in self.grid.row_bytes()]
+        return self.__class__(ByteGrid.from_rows(rows))
 
     def tilt_north(self) -> Self:
         """
@@ -125,14 +118,20 @@ class RocksMap:
         #....###..
         #..OO#....
         """
-        return self.__class__([tilt_line(line[::-1])[::-1] for line in self.array])
+        return self.flip().tilt_west().flip()
+
+    def flip(self) -> Self:
+        return self.__class__(self.grid.flip())
 
     def tilt_south(self) -> Self:
         return self.transpose().tilt_east().transpose()
 
     @classmethod
     def from_lines(cls, lines: list[str]) -> Self:
-        return cls(lines)
+        grid = ByteGrid.from_string("\n".join(lines))
+        if not set(grid.present_codes()) <= set(b"O.#"):
+            raise ValueError("illegal character in the map")
+        return cls(grid)
 
     def total_load_north(self) -> int:
         """
@@ -140,19 +139,26 @@ class RocksMap:
         >>> rocks.tilt_north().total_load_north()
         136
         """
-        return sum(
-            len(column) - row
-            for column in self.transpose().array
-            for row, char in enumerate(column)
-            if char == "O"
-        )
+        height = self.grid.data.shape[0]
+        rocks_per_row = (self.grid.data == ord("O")).sum(axis=1)
+        return int(rocks_per_row @ np.arange(height, 0, -1))
+
+
+def parse_input(lines: str) -> RocksMap:
+    return RocksMap.from_lines(lines.splitlines())
+
+
+def solve_parsed(rocks: RocksMap) -> int:
+    return rocks.tilt_north().total_load_north()
 
 
 def process_lines(lines: str) -> int:
-    return RocksMap.from_lines(lines.splitlines()).tilt_north().total_load_north()
+    return solve_parsed(parse_input(lines))
 
 
-solution = Solution.from_file(__file__, process_lines, {TEST_INPUT: 136})
+solution = Solution.from_file(
+    __file__, process_lines, {TEST_INPUT: 136}, parse_input, solve_parsed
+)
 
 if __name__ == "__main__":
     solution.test_inputs()
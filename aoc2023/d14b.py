@@ -1,5 +1,6 @@
 from aoc2023.common import Solution
-from aoc2023.d14a import TEST_INPUT, RocksMap
+from aoc2023.cycles import CycleFinder
+from aoc2023.d14a import TEST_INPUT, RocksMap, parse_input
 
 
 def cycle(rocks: RocksMap, n: int) -> RocksMap:
@@ -39,29 +40,28 @@ def cycle(rocks: RocksMap, n: int) -> RocksMap:
     #...O###.O
     #.OOO#...O
     """
-    cache = {hash(rocks): 0}
-    cycle_length = i = None
-    for i in range(1, n + 1):
-        rocks = rocks.tilt_north().tilt_west().tilt_south().tilt_east()
-        rocks_b = hash(rocks)
-        if rocks_b in cache:
-            cycle_start = cache[rocks_b]
-            cycle_length = i - cycle_start
-            break
-        cache[rocks_b] = i
-    if cycle_length is not None:
-        while (n - i) % cycle_length != 0:
-            i += 1
-            rocks = rocks.tilt_north().tilt_west().tilt_south().tilt_east()
-    return rocks
+    return CycleFinder(rocks, spin_cycle, RocksMap.encode).state_at(n)
+
+
+def spin_cycle(rocks: RocksMap) -> RocksMap:
+    return rocks.tilt_north().tilt_west().tilt_south().tilt_east()
+
+
+def solve_parsed(rocks: RocksMap) -> int:
+    # only the load of each state is kept: no more steps once the cycle is found
+    finder = CycleFinder(
+        rocks, spin_cycle, RocksMap.encode, measure=RocksMap.total_load_north
+    )
+    return finder.measure_at(1_000_000_000)
 
 
 def process_lines(lines: str) -> int:
-    rocks = RocksMap.from_lines(lines.splitlines())
-    return cycle(rocks, 1_000_000_000).total_load_north()
+    return solve_parsed(parse_input(lines))
 
 
-solution = Solution.from_file(__file__, process_lines, {TEST_INPUT: 64})
+solution = Solution.from_file(
+    __file__, process_lines, {TEST_INPUT: 64}, parse_input, solve_parsed
+)
 
 if __name__ == "__main__":
     solution.test_inputs()
@@ -16,11 +16,21 @@ def hash_value(instruction: str) -> int:
     return value
 
 
+def split_instructions(line: str) -> list[str]:
+    return line.split(",")
+
+
+def solve_parsed(instructions: list[str]) -> int:
+    return sum(hash_value(instruction) for instruction in instructions)
+
+
 def process_lines(line: str) -> int:
-    return sum(hash_value(instruction) for instruction in line.split(","))
+    return solve_parsed(split_instructions(line))
 
 
-solution = Solution.from_file(__file__, process_lines, {TEST_INPUT: 1320})
+solution = Solution.from_file(
+    __file__, process_lines, {TEST_INPUT: 1320}, split_instructions, solve_parsed
+)
 
 if __name__ == "__main__":
     solution.test_inputs()
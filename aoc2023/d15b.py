@@ -1,5 +1,5 @@
 from aoc2023.common import Solution
-from aoc2023.d15a import TEST_INPUT, hash_value
+from aoc2023.d15a import TEST_INPUT, hash_value, split_instructions
 
 
 def follow_instructions(line: str) -> tuple[dict[int, list[str]], dict[str, int]]:
@@ -12,9 +12,15 @@ def follow_instructions(line: str) -> tuple[dict[int, list[str]], dict[str, int]
     >>> label_to_len_power
     {'rn': 1, 'cm': 2, 'ot': 7, 'ab': 5, 'pc': 6}
     """
+    return follow_instruction_list(split_instructions(line))
+
+
+def follow_instruction_list(
+    instructions: list[str],
+) -> tuple[dict[int, list[str]], dict[str, int]]:
     box_to_order: dict[int, list[str]] = {i: [] for i in range(256)}
     label_to_len_power: dict[str, int] = {}
-    for instruction in line.split(","):
+    for instruction in instructions:
         value: int | None
         if "-" in instruction:
             label = instruction.split("-")[0]
@@ -53,11 +59,17 @@ def focusing_powers(
     }
 
 
+def solve_parsed(instructions: list[str]) -> int:
+    return sum(focusing_powers(*follow_instruction_list(instructions)).values())
+
+
 def process_lines(line: str) -> int:
-    return sum(focusing_powers(*follow_instructions(line)).values())
+    return solve_parsed(split_instructions(line))
 
 
-solution = Solution.from_file(__file__, process_lines, {TEST_INPUT: 145})
+solution = Solution.from_file(
+    __file__, process_lines, {TEST_INPUT: 145}, split_instructions, solve_parsed
+)
 
 if __name__ == "__main__":
     solution.test_inputs()
@@ -88,11 +88,17 @@ class MirrorGrid(Grid):
         return len(visited_positions)
 
 
+def solve_parsed(mirrors: MirrorGrid) -> int:
+    return mirrors.beam_energy()
+
+
 def process_lines(lines: str) -> int:
-    return MirrorGrid.from_string(lines).beam_energy()
+    return solve_parsed(MirrorGrid.from_string(lines))
 
 
-solution = Solution.from_file(__file__, process_lines, {TEST_INPUT: 46})
+solution = Solution.from_file(
+    __file__, process_lines, {TEST_INPUT: 46}, MirrorGrid.from_string, solve_parsed
+)
 
 if __name__ == "__main__":
     solution.test_inputs()
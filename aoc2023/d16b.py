@@ -1,16 +1,15 @@
-from joblib.parallel import Parallel, delayed  # type: ignore[import-untyped]
-
 from aoc2023.common import Solution
 from aoc2023.d16a import TEST_INPUT, MirrorGrid
 from aoc2023.grid import Point
 
 
-def max_energized(line: str) -> int:
+def max_energized(mirrors: MirrorGrid) -> int:
     """
-    >>> max_energized(TEST_INPUT)
+    >>> max_energized(MirrorGrid.from_string(TEST_INPUT))
     51
     """
-    mirrors = MirrorGrid.from_string(line)
+    from joblib.parallel import Parallel, delayed  # type: ignore[import-untyped]
+
     max_y, max_x = mirrors.data.shape
     init_positions = (
         [(Point(y, 0), Point(0, 1)) for y in range(max_y)]
@@ -25,10 +24,12 @@ def max_energized(line: str) -> int:
 
 
 def process_lines(lines: str) -> int:
-    return max_energized(lines)
+    return max_energized(MirrorGrid.from_string(lines))
 
 
-solution = Solution.from_file(__file__, process_lines, {TEST_INPUT: 51})
+solution = Solution.from_file(
+    __file__, process_lines, {TEST_INPUT: 51}, MirrorGrid.from_string, max_energized
+)
 
 if __name__ == "__main__":
     solution.test_inputs()
@@ -1,11 +1,9 @@
-import itertools
-from collections.abc import Generator
+from collections.abc import Callable
 from dataclasses import dataclass
-from typing import Any, Self
+from typing import Self
 
-import igraph as ig  # type: ignore[import-untyped]
-
-from aoc2023.common import Solution
+from aoc2023.common import Solution, span
+from aoc2023.search import dial
 
 TEST_INPUT = """\
 2413432311323
@@ -32,79 +30,73 @@ class HeatGrid:
     def from_line(cls, line: str) -> Self:
         return cls(line.splitlines())
 
-    def get_weighted_edges(
-        self, min_line: int = 1, max_line: int = 3
-    ) -> Generator[tuple[Any, Any, int], None, None]:
-        # most nodes are of the form (y, x, last_dy, last_dx)
-        for row, line in enumerate(self.data):
-            for col, char in enumerate(line):
-                # add edges from (*, *, *, *) to (row, col, *, *)
-                c = int(char)
-                for sign in [-1, 1]:
-                    # after change direction
-                    for distance in itertools.chain(
-                        range(min_line, max_line + 1),
-                        range(-min_line, -max_line - 1, -1),
-                    ):
-                        # from above/below
-                        yield (
-                            (row - sign, col, 0, distance),
-                            (row, col, sign, 0),
-                            c,
-                        )
-                        # from left/right
-                        yield (
-                            (row, col - sign, distance, 0),
-                            (row, col, 0, sign),
-                            c,
-                        )
-                    # after a straight line
-                    for distance in range(max_line):
-                        # from above/below
-                        yield (
-                            (row - sign, col, sign * distance, 0),
-                            (row, col, sign * (distance + 1), 0),
-                            c,
-                        )
-                        # from left/right
-                        yield (
-                            (row, col - sign, 0, sign * distance),
-                            (row, col, 0, sign * (distance + 1)),
-                            c,
-                        )
-        yield "start", (0, 0, 0, 0), 0
-        y_end = len(self.data) - 1
-        x_end = len(self.data[0]) - 1
-        for distance in range(min_line, max_line + 1):
-            yield (y_end, x_end, 0, +distance), "end", 0
-            yield (y_end, x_end, 0, -distance), "end", 0
-            yield (y_end, x_end, +distance, 0), "end", 0
-            yield (y_end, x_end, -distance, 0), "end", 0
-
-    def to_graph(self, min_line: int = 1, max_line: int = 3) -> ig.Graph:
-        edges_w = list(self.get_weighted_edges(min_line, max_line))
-        edges = [(str(edge[0]), str(edge[1])) for edge in edges_w]
-        weights = [edge[2] for edge in edges_w]
-        nodes = list({edge[0] for edge in edges} | {edge[1] for edge in edges})
-
-        graph = ig.Graph(directed=True)
-        graph.add_vertices(nodes)
-        graph.add_edges(edges, attributes={"weight": weights})
-        return graph
+    @property
+    def height(self) -> int:
+        return len(self.data)
+
+    @property
+    def width(self) -> int:
+        return len(self.data[0])
+
+    def moves(
+        self, heat: list[int], min_line: int, max_line: int
+    ) -> Callable[[int], list[tuple[int, int]]]:
+        """
+        A state is cell * 2 + axis: the crucible is at the cell (a flat index),
+        and turns to go along the axis (0: up or down, 1: left or right).
+        A move goes min_line to max_line cells straight, then turns.
+        """
+        height, width = self.height, self.width
+
+        def moves_from(state: int) -> list[tuple[int, int]]:
+            cell, axis = divmod(state, 2)
+            y, x = divmod(cell, width)
+            moves = []
+            for sign in (-1, 1):
+                dy, dx = (sign, 0) if axis == 0 else (0, sign)
+                heat_loss = 0
+                for distance in range(1, max_line + 1):
+                    ny, nx = y + dy * distance, x + dx * distance
+                    if not (0 <= ny < height and 0 <= nx < width):
+                        break
+                    next_cell = ny * width + nx
+                    heat_loss += heat[next_cell]
+                    if distance >= min_line:
+                        moves.append((next_cell * 2 + 1 - axis, heat_loss))
+            return moves
+
+        return moves_from
 
     def least_heat_loss(self, min_line: int = 1, max_line: int = 3) -> int:
-        graph = self.to_graph(min_line, max_line)
-        shortest_path_length = int(
-            graph.distances("start", "end", weights="weight")[0][0]
-        )
-        return shortest_path_length
+        with span("build"):
+            heat = [int(char) for line in self.data for char in line]
+            end = len(heat) - 1
+        with span("compute"):
+            result = dial(
+                # from the top left corner, going either down or right
+                [0, 1],
+                self.moves(heat, min_line, max_line),
+                lambda state: state // 2 == end,
+                max_cost=max(heat) * max_line,
+            )
+        if result.cost is None:
+            raise ValueError("the end cannot be reached")
+        return result.cost
+
+
+def solve_parsed(heat_grid: HeatGrid) -> int:
+    return heat_grid.least_heat_loss()
 
 
 def process_lines(lines: str) -> int:
-    return HeatGrid.from_line(lines).least_heat_loss()
+    with span("parse"):
+        heat_grid = HeatGrid.from_line(lines)
+    return solve_parsed(heat_grid)
 
 
-solution = Solution.from_file(__file__, process_lines, {TEST_INPUT: 102})
+solution = Solution.from_file(
+    __file__, process_lines, {TEST_INPUT: 102}, HeatGrid.from_line, solve_parsed
+)
 
 if __name__ == "__main__":
     solution.test_inputs()
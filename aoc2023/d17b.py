@@ -1,4 +1,4 @@
-from aoc2023.common import Solution
+from aoc2023.common import Solution, span
 from aoc2023.d17a import TEST_INPUT, HeatGrid
 
 TEST_INPUT_2 = """\
@@ -10,12 +10,22 @@ TEST_INPUT_2 = """\
 """
 
 
+def solve_parsed(heat_grid: HeatGrid) -> int:
+    return heat_grid.least_heat_loss(4, 10)
+
+
 def process_lines(lines: str) -> int:
-    return HeatGrid.from_line(lines).least_heat_loss(4, 10)
+    with span("parse"):
+        heat_grid = HeatGrid.from_line(lines)
+    return solve_parsed(heat_grid)
 
 
 solution = Solution.from_file(
-    __file__, process_lines, {TEST_INPUT: 94, TEST_INPUT_2: 71}
+    __file__,
+    process_lines,
+    {TEST_INPUT: 94, TEST_INPUT_2: 71},
+    HeatGrid.from_line,
+    solve_parsed,
 )
 
 if __name__ == "__main__":
@@ -85,14 +85,25 @@ class Part:
         return last_result == "A"
 
 
-def process_lines(lines: str) -> int:
+def parse_input(lines: str) -> tuple[dict[str, Pipeline], list[Part]]:
     pipelines_s, parts_s = lines.split("\n\n")
-    parts = [Part.from_line(line) for line in parts_s.splitlines()]
     pipelines = dict(Pipeline.from_line(line) for line in pipelines_s.splitlines())
+    parts = [Part.from_line(line) for line in parts_s.splitlines()]
+    return pipelines, parts
+
+
+def solve_parsed(pipelines_and_parts: tuple[dict[str, Pipeline], list[Part]]) -> int:
+    pipelines, parts = pipelines_and_parts
     return sum(part.all_ratings for part in parts if part.use_pipelines(pipelines))
 
 
-solution = Solution.from_file(__file__, process_lines, {TEST_INPUT: 19114})
+def process_lines(lines: str) -> int:
+    return solve_parsed(parse_input(lines))
+
+
+solution = Solution.from_file(
+    __file__, process_lines, {TEST_INPUT: 19114}, parse_input, solve_parsed
+)
 
 if __name__ == "__main__":
     solution.test_inputs()
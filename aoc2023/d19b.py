@@ -1,149 +1,74 @@
-from dataclasses import dataclass
-from typing import Self
-
 from aoc2023.common import Solution
-from aoc2023.d19a import TEST_INPUT, Pipeline
-
-
-@dataclass
-class Range:
-    min_value: int
-    max_value: int
-
-    @property
-    def distinct_combinations(self) -> int:
-        return self.max_value - self.min_value + 1
-
-    @classmethod
-    def range_or_none(cls, min_value: int, max_value: int) -> Self | None:
-        if min_value > max_value:
-            return None
-        return cls(min_value, max_value)
-
-    def cut(self, value: int, op: str) -> tuple[Self | None, Self | None]:
-        cls = type(self)
-        if op == "<":
-            return (
-                cls.range_or_none(self.min_value, value - 1),
-                cls.range_or_none(value, self.max_value),
-            )
-        if op == ">":
-            return (
-                cls.range_or_none(value + 1, self.max_value),
-                cls.range_or_none(self.min_value, value),
-            )
-        raise ValueError(f"illegal op {op!r}")
-
-
-@dataclass
-class PartRange:
-    x: Range
-    m: Range
-    a: Range
-    s: Range
-
-    @classmethod
-    def full_range(cls) -> Self:
-        x = Range(1, 4000)
-        m = Range(1, 4000)
-        a = Range(1, 4000)
-        s = Range(1, 4000)
-        return cls(x, m, a, s)
-
-    def cut(self, key: str, value: int, op: str) -> tuple[Self | None, Self | None]:
-        range_key: Range = getattr(self, key)
-        cut_ranges: tuple[Range | None, Range | None] = range_key.cut(value, op)
-        part_ranges = tuple(
-            (
-                None
-                if cut_range is None
-                else type(self)(
-                    x=cut_range if key == "x" else self.x,
-                    m=cut_range if key == "m" else self.m,
-                    a=cut_range if key == "a" else self.a,
-                    s=cut_range if key == "s" else self.s,
-                )
-            )
-            for cut_range in cut_ranges
-        )
-        assert len(part_ranges) == 2  # noqa: PLR2004
-        return part_ranges
-
-    @property
-    def distinct_combinations(self) -> int:
-        return (
-            self.x.distinct_combinations
-            * self.m.distinct_combinations
-            * self.a.distinct_combinations
-            * self.s.distinct_combinations
-        )
-
-    def use_rule(self, rule: str) -> tuple[Self | None, Self | None, str]:
-        if ":" not in rule:
-            return self, None, rule
-        cond, ret = rule.split(":")
-        key = cond[0]
-        op = cond[1]
-        value_s = cond[2:]
-        value = int(value_s)
-        range_true, range_false = self.cut(key, value, op)
-        return range_true, range_false, ret
-
-    def use_pipeline(self, pipeline: Pipeline) -> list[tuple[Self, str]]:
-        part_ranges_and_results = []
-        range_false: Self | None = self
+from aoc2023.d19a import TEST_INPUT, Part, Pipeline, parse_input
+from aoc2023.intervals import BoxSet
+
+CATEGORIES = "xmas"
+MIN_RATING = 1
+MAX_RATING = 4000
+
+
+def use_rule(boxes: BoxSet, rule: str) -> tuple[BoxSet, BoxSet | None, str]:
+    """
+    Split the boxes into the parts the rule matches and the rest (None if the
+    rule matches everything), and return where the matched parts go.
+
+    >>> matched, rest, ret = use_rule(BoxSet.full(4, 1, 11), "m>3:A")
+    >>> matched.volume(), rest.volume(), ret
+    (7000, 3000, 'A')
+    """
+    if ":" not in rule:
+        return boxes, None, rule
+    cond, ret = rule.split(":")
+    axis = CATEGORIES.index(cond[0])
+    op = cond[1]
+    value = int(cond[2:])
+    if op == "<":
+        below, rest = boxes.split(axis, value)
+        return below, rest, ret
+    if op == ">":
+        rest, above = boxes.split(axis, value + 1)
+        return above, rest, ret
+    raise ValueError(f"illegal op {op!r}")
+
+
+def accepted_boxes(pipelines: dict[str, Pipeline]) -> BoxSet:
+    """
+    Send all the possible parts through the pipelines, as sets of boxes
+    of ratings, each set cut by a rule with array operations.
+    """
+    to_process = [(BoxSet.full(len(CATEGORIES), MIN_RATING, MAX_RATING + 1), "in")]
+    accepted = []
+    while to_process:
+        boxes, pipeline_name = to_process.pop()
+        pipeline = pipelines[pipeline_name]
+        remaining: BoxSet | None = boxes
         for rule in pipeline.rules:
-            assert range_false is not None
-            range_true, range_false, ret = range_false.use_rule(rule)
-            if range_true is not None:
-                part_ranges_and_results.append((range_true, ret))
-            if range_false is None:
+            assert remaining is not None
+            matched, remaining, ret = use_rule(remaining, rule)
+            if len(matched):
+                if ret == "A":
+                    accepted.append(matched)
+                elif ret != "R":
+                    to_process.append((matched, ret))
+            if remaining is None or not len(remaining):
                 break
         else:
-            raise ValueError(f"no rule matched {range_false=} in {pipeline=}")
-        return part_ranges_and_results
+            raise ValueError(f"no rule matched {remaining=} in {pipeline=}")
+    return BoxSet.concat(accepted)
 
 
-def use_pipelines(
-    part_ranges_and_pipelines: list[tuple[PartRange, str]],
-    pipelines: dict[str, Pipeline],
-) -> list[tuple[PartRange, bool]]:
-    part_ranges_and_pipelines = part_ranges_and_pipelines[:]
-    part_ranges_finished = []
-    while part_ranges_and_pipelines:
-        part_range, pipeline_name = part_ranges_and_pipelines.pop()
-        pipeline = pipelines[pipeline_name]
-        part_ranges_and_results = part_range.use_pipeline(pipeline)
-        part_ranges_and_pipelines.extend(
-            [
-                (part_range, pipeline_name)
-                for part_range, pipeline_name in part_ranges_and_results
-                if pipeline_name not in ["A", "R"]
-            ]
-        )
-        part_ranges_finished.extend(
-            [
-                (part_range, accepted == "A")
-                for part_range, accepted in part_ranges_and_results
-                if accepted in ["A", "R"]
-            ]
-        )
-    return part_ranges_finished
+def solve_parsed(pipelines_and_parts: tuple[dict[str, Pipeline], list[Part]]) -> int:
+    pipelines, _parts = pipelines_and_parts
+    return accepted_boxes(pipelines).volume()
 
 
 def process_lines(lines: str) -> int:
-    pipelines_s, _parts_s = lines.split("\n\n")
-    pipelines = dict(Pipeline.from_line(line) for line in pipelines_s.splitlines())
-    part_ranges = [(PartRange.full_range(), "in")]
-    part_ranges_and_accepted = use_pipelines(part_ranges, pipelines)
-    return sum(
-        part_range.distinct_combinations
-        for part_range, accepted in part_ranges_and_accepted
-        if accepted
-    )
+    return solve_parsed(parse_input(lines))
 
 
-solution = Solution.from_file(__file__, process_lines, {TEST_INPUT: 167409079868000})
+solution = Solution.from_file(
+    __file__, process_lines, {TEST_INPUT: 167409079868000}, parse_input, solve_parsed
+)
 
 if __name__ == "__main__":
     solution.test_inputs()
@@ -2,12 +2,13 @@ import math
 from collections import defaultdict
 from dataclasses import dataclass, field
 from enum import StrEnum
-from typing import Self
-
-import matplotlib.pyplot as plt
-import networkx as nx
+from typing import TYPE_CHECKING, Self
 
 from aoc2023.common import Solution
+from aoc2023.cycles import CycleFinder, pack_bools
+
+if TYPE_CHECKING:
+    import networkx as nx
 
 TEST_INPUT = """\
 broadcaster -> a, b, c
@@ -31,11 +32,6 @@ class ModuleType(StrEnum):
     BROADCASTER = "broadcaster"
 
 
-ModulesState = tuple[
-    tuple[tuple[str, bool], ...], tuple[tuple[str, frozenset[str]], ...]
-]
-
-
 @dataclass
 class Modules:
     modules: dict[str, ModuleType]
@@ -43,6 +39,8 @@ class Modules:
     memory_flipflop: dict[str, bool]
     memory_conjunction: dict[str, set[str]]
     module_num_inputs: dict[str, int] = field(init=False)
+    # the (conjunction, input) pairs, in a fixed order for encode_memory
+    conjunction_inputs: list[tuple[str, str]] = field(init=False)
     signals: list[tuple[str, str, str]] = field(default_factory=list)
     signals_low: int = 0
     signals_high: int = 0
@@ -53,8 +51,16 @@ class Modules:
         for target_names in self.cables.values():
             for target_name in target_names:
                 self.module_num_inputs[target_name] += 1
+        self.conjunction_inputs = [
+            (target_name, source_name)
+            for source_name, target_names in self.cables.items()
+            for target_name in target_names
+            if target_name in self.memory_conjunction
+        ]
+
+    def to_graph(self, *, only_conj: bool = False) -> "nx.DiGraph":
+        import networkx as nx
 
-    def to_graph(self, *, only_conj: bool = False) -> nx.DiGraph:
         graph = nx.DiGraph()
         for module_name, module_type in self.modules.items():
             if not only_conj or module_type == ModuleType.CONJUNCTION:
@@ -72,6 +78,9 @@ class Modules:
         return graph
 
     def plot_graph(self, *, only_conj: bool = False) -> None:
+        import matplotlib.pyplot as plt
+        import networkx as nx
+
         color_map = {
             "broadcaster": "blue",
             "%": "green",
@@ -107,31 +116,37 @@ class Modules:
                 memory_conjunction[module_name] = set()
         return cls(modules, cables, memory_flipflop, memory_conjunction)
 
-    def freeze_memory(self) -> ModulesState:
-        memory_flipflop = tuple((k, v) for k, v in self.memory_flipflop.items())
-        memory_conjunction = tuple(
-            (k, frozenset(v)) for k, v in self.memory_conjunction.items()
+    def encode_memory(self) -> bytes:
+        """The flip-flops, and the inputs the conjunctions remember as high, as bits."""
+        return pack_bools(
+            [
+                *self.memory_flipflop.values(),
+                *(
+                    source in self.memory_conjunction[target]
+                    for target, source in self.conjunction_inputs
+                ),
+            ]
         )
-        return memory_flipflop, memory_conjunction
+
+    def signal_counts(self) -> tuple[int, int]:
+        return self.signals_low, self.signals_high
+
+    def press(self) -> Self:
+        self.signals.append(("button", "low", "broadcaster"))
+        self.button_pressed += 1
+        self.process_signals()
+        return self
 
     def press_button(self, n: int) -> tuple[int, int]:
-        cache: dict[ModulesState, tuple[int, int, int]] = {}
-        for _ in range(n):
-            state = self.freeze_memory()
-            if state in cache:
-                remaining_presses = n - self.button_pressed
-                cycle = self.button_pressed - cache[state][0]
-                if remaining_presses % cycle == 0:
-                    remaining_cycles = remaining_presses // cycle
-                    low_per_cycle = self.signals_low - cache[state][1]
-                    high_per_cycle = self.signals_high - cache[state][2]
-                    self.signals_low += low_per_cycle * remaining_cycles
-                    self.signals_high += high_per_cycle * remaining_cycles
-                    return self.signals_low, self.signals_high
-            cache[state] = self.button_pressed, self.signals_low, self.signals_high
-            self.signals.append(("button", "low", "broadcaster"))
-            self.button_pressed += 1
-            self.process_signals()
+        # the counts grow by the same amount in every cycle of the memory
+        finder = CycleFinder(
+            self, Modules.press, Modules.encode_memory, measure=Modules.signal_counts
+        )
+        cycle = finder.run(n)
+        if cycle is not None:
+            lows, highs = zip(*finder.measures, strict=True)
+            self.signals_low = cycle.extrapolate(lows, n)
+            self.signals_high = cycle.extrapolate(highs, n)
         return self.signals_low, self.signals_high
 
     def rx_low_count(self) -> int:
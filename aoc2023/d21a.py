@@ -1,5 +1,10 @@
+import functools
+
+import numpy as np
+import numpy.typing as npt
+
 from aoc2023.common import Solution
-from aoc2023.grid import Point
+from aoc2023.grid import ByteGrid, count_reachable
 
 TEST_INPUT = """\
 ...........
@@ -16,59 +21,37 @@ TEST_INPUT = """\
 """
 
 
-def map_to_locations(lines: str) -> tuple[Point, set[Point]]:
-    valid_locations = set()
-    start = None
-    for y, line in enumerate(lines.splitlines()):
-        for x, char in enumerate(line):
-            if char == "S":
-                start = Point(y, x)
-            if char in ["S", "."]:
-                valid_locations.add(Point(y, x))
-    assert start is not None
-    return start, valid_locations
-
-
-def step(
-    last_new_locations: set[Point],
-    last_old_locations: set[Point],
-    previous_locations: set[Point],
-    valid_locations: set[Point],
-) -> tuple[set[Point], set[Point], set[Point]]:
-    new_locations = set()
-    for location in last_new_locations:
-        for new_location in [
-            location.up(),
-            location.down(),
-            location.left(),
-            location.right(),
-        ]:
-            if (new_location in valid_locations) and (
-                new_location not in previous_locations
-            ):
-                new_locations.add(new_location)
-    return new_locations, previous_locations, last_new_locations | last_old_locations
-
-
-def steps(start: Point, valid_locations: set[Point], n: int) -> set[Point]:
-    last_new_locations: set[Point] = {start}
-    last_old_locations: set[Point] = set()
-    previous_locations: set[Point] = set()
-    for _ in range(n):
-        last_new_locations, last_old_locations, previous_locations = step(
-            last_new_locations, last_old_locations, previous_locations, valid_locations
-        )
-    return last_new_locations | last_old_locations
-
-
-def count_reachable(start: Point, valid_locations: set[Point], n: int) -> int:
-    assert start in valid_locations
-    return len(steps(start, valid_locations, n))
+def is_garden_plot(c: str) -> bool:
+    return c != "#"
+
+
+@functools.lru_cache(maxsize=1)
+def parse_garden(lines: str) -> ByteGrid:
+    """
+    The grid of the input, parsed once for all the calls on the same input,
+    so its cached adjacency is reused.
+
+    >>> distances = distance_map(TEST_INPUT), distance_map(TEST_INPUT, 6)
+    >>> len(parse_garden(TEST_INPUT)._adjacencies)
+    1
+    """
+    return ByteGrid.from_string(lines)
+
+
+def distance_map(lines: str, max_steps: int | None = None) -> npt.NDArray[np.int32]:
+    """
+    The number of steps from S to each garden plot, or -1.
+
+    >>> distances = distance_map(TEST_INPUT)
+    >>> int(distances.max()), int((distances >= 0).sum())
+    (14, 81)
+    """
+    garden = parse_garden(lines)
+    return garden.distance_map(garden.find("S"), is_garden_plot, max_steps=max_steps)
 
 
 def process_lines(lines: str, n: int = 64) -> int:
-    start, valid_locations = map_to_locations(lines)
-    return count_reachable(start, valid_locations, n)
+    return count_reachable(distance_map(lines, n), n)
 
 
 solution = Solution.from_file(__file__, process_lines, {(TEST_INPUT, 6): 16})
@@ -1,7 +1,7 @@
 from aoc2023.common import Solution
-from aoc2023.d21a import map_to_locations, step
+from aoc2023.d21a import is_garden_plot, parse_garden
 from aoc2023.d21a import process_lines as process_lines_a
-from aoc2023.grid import Point
+from aoc2023.grid import PeriodicGrid, count_reachable_by_distance
 
 TEST_INPUT = """\
 ...........
@@ -34,25 +34,6 @@ def expand_map(data: str, n: int) -> str:
 TEST_INPUT_EXPANDED = expand_map(TEST_INPUT, 5)
 
 
-def count_reachable(
-    start: Point, valid_locations: set[Point], ns: list[int]
-) -> list[int]:
-    assert start in valid_locations
-    assert ns == sorted(ns)
-    last_new_locations: set[Point] = {start}
-    last_old_locations: set[Point] = set()
-    previous_locations: set[Point] = set()
-    reachable = []
-    for n in range(ns[-1]):
-        if n in ns:
-            reachable.append(len(last_new_locations | last_old_locations))
-        last_new_locations, last_old_locations, previous_locations = step(
-            last_new_locations, last_old_locations, previous_locations, valid_locations
-        )
-    reachable.append(len(last_new_locations | last_old_locations))
-    return reachable
-
-
 def solve_quadratic_series(series: list[int], k: int) -> int:
     d1, d2 = series[1] - series[0], series[2] - series[1]
     dd1 = d2 - d1
@@ -69,11 +50,12 @@ def count_infinite_reachable(lines: str, n: int) -> int:
     st = size_y // 2
     k = (n - st) // size_y
     assert n == st + k * size_y
-    expanded_lines = expand_map(lines, 4)
-    start, valid_locations = map_to_locations(expanded_lines)
-    reachable = count_reachable(
-        start, valid_locations, [st + i * size_y for i in range(3)]
+    ns = [st + i * size_y for i in range(3)]
+    garden = parse_garden(lines)
+    counts = PeriodicGrid(garden).distance_counts(
+        garden.find("S"), is_garden_plot, ns[-1]
     )
+    reachable = [count_reachable_by_distance(counts, n) for n in ns]
     return solve_quadratic_series(reachable, k)
 
 
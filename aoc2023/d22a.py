@@ -5,7 +5,8 @@ from typing import Self
 
 import numpy as np
 
-from aoc2023.common import Solution
+from aoc2023.common import Solution, span
+from aoc2023.parsing import extract_records
 
 TEST_INPUT = """\
 1,0,1~1,2,1
@@ -100,13 +101,41 @@ def safe_to_disintegrate(supported_by: dict[int, set[int]]) -> set[int]:
     return safe_bricks
 
 
+def parse_bricks(lines: str) -> list[Brick]:
+    records = extract_records(lines, 6)
+    assert (records[:, :3] <= records[:, 3:]).all()
+    return [
+        Brick(Point3D(*record[:3]), Point3D(*record[3:])) for record in records.tolist()
+    ]
+
+
+def settle_bricks(lines: str) -> tuple[dict[int, Brick], dict[int, set[int]]]:
+    # the shared parse: its caller already records it as the "parse" phase
+    bricks = parse_bricks(lines)
+    with span("build"):
+        return drop_bricks(bricks)
+
+
+def solve_parsed(
+    settled_bricks: tuple[dict[int, Brick], dict[int, set[int]]],
+) -> int:
+    _falled_bricks, supported_by = settled_bricks
+    with span("compute"):
+        safe_bricks = safe_to_disintegrate(supported_by)
+    return len(safe_bricks)
+
+
 def process_lines(lines: str) -> int:
-    bricks = [Brick.from_line(line) for line in lines.splitlines()]
-    falled_bricks, supported_by = drop_bricks(bricks)
-    return len(safe_to_disintegrate(supported_by))
+    with span("parse"):
+        bricks = parse_bricks(lines)
+    with span("build"):
+        settled_bricks = drop_bricks(bricks)
+    return solve_parsed(settled_bricks)
 
 
-solution = Solution.from_file(__file__, process_lines, {TEST_INPUT: 5})
+solution = Solution.from_file(
+    __file__, process_lines, {TEST_INPUT: 5}, settle_bricks, solve_parsed
+)
 
 if __name__ == "__main__":
     solution.test_inputs()
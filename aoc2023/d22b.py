@@ -1,47 +1,64 @@
-import networkx as nx
+from aoc2023.common import Solution, span
+from aoc2023.d22a import (
+    TEST_INPUT,
+    Brick,
+    drop_bricks,
+    parse_bricks,
+    safe_to_disintegrate,
+    settle_bricks,
+)
+from aoc2023.graph import CSRGraph
 
-from aoc2023.common import Solution
-from aoc2023.d22a import TEST_INPUT, Brick, drop_bricks, safe_to_disintegrate
 
+def get_support_graph(supported_by: dict[int, set[int]]) -> CSRGraph:
+    """An edge from each brick (or the ground, 0) to each brick it supports."""
+    sources = [
+        support
+        for brick_supported_by in supported_by.values()
+        for support in brick_supported_by
+    ]
+    targets = [
+        b
+        for b, brick_supported_by in supported_by.items()
+        for _support in brick_supported_by
+    ]
+    return CSRGraph.from_edges(sources, targets, num_nodes=len(supported_by) + 1)
 
-def get_support_graph(
-    falled_bricks: dict[int, Brick], supported_by: dict[int, set[int]]
-) -> nx.DiGraph:
-    graph = nx.DiGraph()
-    for b, brick_supported_by in supported_by.items():
-        for support in brick_supported_by:
-            graph.add_edge(support, b)
-    for b, brick in falled_bricks.items():
-        graph.nodes[b]["subset"] = brick.end1.z
-    graph.nodes[0]["subset"] = 0
-    return graph
 
-
-def bricks_falling(
-    falled_bricks: dict[int, Brick], supported_by: dict[int, set[int]]
-) -> dict[int, int]:
-    graph = get_support_graph(falled_bricks, supported_by)
+def bricks_falling(supported_by: dict[int, set[int]]) -> dict[int, int]:
+    graph = get_support_graph(supported_by)
     num_falling = {}
     safe_to_disintegrate_bricks = safe_to_disintegrate(supported_by)
     for brick in supported_by:
         if brick in safe_to_disintegrate_bricks:
             num_falling[brick] = 0
             continue
-        after_remove = graph.copy()
-        after_remove.remove_node(brick)
-        non_falling: set[int] = nx.descendants(after_remove, 0)  # type: ignore[no-untyped-call]
+        non_falling = graph.descendants(0, removed=[brick])
         # (-1 for itself and -1 for the root)
-        num_falling[brick] = len(graph) - len(non_falling) - 2
+        num_falling[brick] = graph.num_nodes - len(non_falling) - 2
     return num_falling
 
 
+def solve_parsed(
+    settled_bricks: tuple[dict[int, Brick], dict[int, set[int]]],
+) -> int:
+    _, supported_by = settled_bricks
+    with span("compute"):
+        num_falling = bricks_falling(supported_by)
+    return sum(num_falling.values())
+
+
 def process_lines(lines: str) -> int:
-    bricks = [Brick.from_line(line) for line in lines.splitlines()]
-    falled_bricks, supported_by = drop_bricks(bricks)
-    return sum(bricks_falling(falled_bricks, supported_by).values())
+    with span("parse"):
+        bricks = parse_bricks(lines)
+    with span("build"):
+        settled_bricks = drop_bricks(bricks)
+    return solve_parsed(settled_bricks)
 
 
-solution = Solution.from_file(__file__, process_lines, {TEST_INPUT: 7})
+solution = Solution.from_file(
+    __file__, process_lines, {TEST_INPUT: 7}, settle_bricks, solve_parsed
+)
 
 if __name__ == "__main__":
     solution.test_inputs()
@@ -1,9 +1,8 @@
-import networkx as nx
-import numpy as np
-import numpy.typing as npt
+from dataclasses import dataclass
 
-from aoc2023.common import Solution
-from aoc2023.grid import Point
+from aoc2023.common import Solution, span
+from aoc2023.graph import CSRGraph, NodeIndex
+from aoc2023.grid import ByteGrid, Point
 
 TEST_INPUT = """\
 #.#####################
@@ -32,25 +31,43 @@ TEST_INPUT = """\
 """
 
 
-def get_graph(lines: str) -> nx.DiGraph:
-    maze = np.array([list(line) for line in lines.splitlines()])
-    graph = nx.DiGraph()
+GraphNode = Point | str
+
+
+@dataclass(frozen=True)
+class TrailGraph:
+    """The junctions of the maze, between a "start" and an "end" node."""
+
+    graph: CSRGraph
+    nodes: NodeIndex[GraphNode]
+
+
+def get_graph(lines: str) -> TrailGraph:
+    maze = ByteGrid.from_string(lines)
     start = Point(0, 1)
-    end = Point(maze.shape[0] - 1, maze.shape[1] - 2)
-    graph.add_edge("start", start, weight=0)
-    graph.add_edge(end, "end", weight=0)
+    end = Point(maze.data.shape[0] - 1, maze.data.shape[1] - 2)
+    edges: dict[tuple[GraphNode, GraphNode], int] = {
+        ("start", start): 0,
+        (end, "end"): 0,
+    }
     nodes_to_visit = [start]
+    visited = {start}
     while nodes_to_visit:
         pos = nodes_to_visit.pop()
         connected_nodes = follow_path(maze, pos, start, end)
         for connected_node, path_len in connected_nodes:
-            nodes_to_visit.append(connected_node)
-            graph.add_edge(pos, connected_node, weight=path_len)
-    return graph
+            if connected_node not in visited:
+                visited.add(connected_node)
+                nodes_to_visit.append(connected_node)
+            edges[pos, connected_node] = path_len
+    graph, nodes = CSRGraph.from_named_edges(
+        (source, target, weight) for (source, target), weight in edges.items()
+    )
+    return TrailGraph(graph, nodes)
 
 
 def follow_path(
-    maze: npt.NDArray[np.str_], entry: Point, start: Point, end: Point
+    maze: ByteGrid, entry: Point, start: Point, end: Point
 ) -> list[tuple[Point, int]]:
     directions = []
     if entry == start:
@@ -58,13 +75,13 @@ def follow_path(
     elif entry == end:
         return []
     else:
-        if maze[entry.up().to_tuple()] == "^":
+        if maze[entry.up()] == "^":
             directions.append(Point(-1, 0))
-        if maze[entry.down().to_tuple()] == "v":
+        if maze[entry.down()] == "v":
             directions.append(Point(1, 0))
-        if maze[entry.left().to_tuple()] == "<":
+        if maze[entry.left()] == "<":
             directions.append(Point(0, -1))
-        if maze[entry.right().to_tuple()] == ">":
+        if maze[entry.right()] == ">":
             directions.append(Point(0, 1))
     if not directions:
         raise ValueError(f"Could not find a direction from {entry}")
@@ -75,7 +92,7 @@ def follow_path(
 
 
 def follow_simple_path(
-    maze: npt.NDArray[np.str_], entry: Point, direction: Point, end: Point
+    maze: ByteGrid, entry: Point, direction: Point, end: Point
 ) -> tuple[Point, int]:
     last_move = direction
     path_len = 1
@@ -87,37 +104,44 @@ def follow_simple_path(
             if new_move == -1 * last_move:
                 continue
             new_pos = pos + new_move
-            if new_pos.y < 0 or new_pos.y >= maze.shape[0]:
-                continue
-            if new_pos.x < 0 or new_pos.x >= maze.shape[1]:
+            if not maze.in_bounds(new_pos):
                 continue
-            if maze[*new_pos.to_tuple()] == "#":
+            char = maze[new_pos]
+            if char == "#":
                 continue
-            if maze[*new_pos.to_tuple()] == ".":
+            if char == ".":
                 path_len += 1
                 pos = new_pos
                 last_move = new_move
                 break
-            if maze[*new_pos.to_tuple()] in "^v<>":
+            if char in "^v<>":
                 path_len += 2
                 pos = new_pos + new_move
                 last_move = new_move
                 return pos, path_len
-            raise ValueError(f"Unexpected maze character {maze[*new_pos.to_tuple()]}")
+            raise ValueError(f"Unexpected maze character {char}")
         else:
             raise ValueError(f"Could not find a new move from {entry}")
 
 
-def longest_path(graph: nx.DiGraph) -> int:
-    path: int = nx.algorithms.dag_longest_path_length(graph, weight="weight")
-    return path
+def longest_path(trails: TrailGraph) -> int:
+    return trails.graph.dag_longest_path_length()
+
+
+def solve_parsed(trails: TrailGraph) -> int:
+    with span("compute"):
+        return longest_path(trails)
 
 
 def process_lines(lines: str) -> int:
-    return longest_path(get_graph(lines))
+    with span("build"):
+        graph = get_graph(lines)
+    return solve_parsed(graph)
 
 
-solution = Solution.from_file(__file__, process_lines, {TEST_INPUT: 94})
+solution = Solution.from_file(
+    __file__, process_lines, {TEST_INPUT: 94}, get_graph, solve_parsed
+)
 
 if __name__ == "__main__":
     solution.test_inputs()
@@ -1,64 +1,112 @@
 import itertools
+from dataclasses import dataclass
+from typing import Self
 
-import networkx as nx
+from aoc2023.common import Solution, span
+from aoc2023.d23a import TEST_INPUT, GraphNode, TrailGraph, get_graph
+from aoc2023.graph import CSRGraph
+from aoc2023.memo import BoundedCache
 
-from aoc2023.common import Solution
-from aoc2023.d23a import TEST_INPUT, get_graph
-from aoc2023.grid import Point
+
+@dataclass(frozen=True)
+class UndirectedTrails:
+    """
+    The trails in both directions, as lists for the recursion below, where
+    a set of nodes is a bitmask of their ids.
+    """
+
+    neighbours: list[list[int]]
+    weights: list[list[int]]
+    neighbour_masks: list[int]
+    start: int
+    end: int
+
+    @classmethod
+    def from_trails(cls, trails: TrailGraph) -> Self:
+        graph = CSRGraph.from_edges(
+            trails.graph.edge_sources(),
+            trails.graph.indices,
+            trails.graph.weights,
+            num_nodes=trails.graph.num_nodes,
+            directed=False,
+        )
+        neighbours = [graph.neighbours(node) for node in range(graph.num_nodes)]
+        return cls(
+            neighbours,
+            [graph.edge_weights(node) for node in range(graph.num_nodes)],
+            [sum(1 << n for n in node_neighbours) for node_neighbours in neighbours],
+            trails.nodes["start"],
+            trails.nodes["end"],
+        )
+
+    @property
+    def all_nodes(self) -> int:
+        return (1 << len(self.neighbours)) - 1
+
+    def remove_node(self, nodes: int, node: int) -> int:
+        """The component of end in the graph of nodes, without node."""
+        assert node != self.end, "cannot remove end"
+        nodes &= ~(1 << node)
+        component = frontier = 1 << self.end
+        while frontier:
+            reached = 0
+            for n in iter_nodes(frontier):
+                reached |= self.neighbour_masks[n]
+            frontier = reached & nodes & ~component
+            component |= frontier
+        return component
+
+
+def iter_nodes(nodes: int) -> list[int]:
+    """
+    >>> iter_nodes(0b10110)
+    [1, 2, 4]
+    """
+    return [n for n in range(nodes.bit_length()) if nodes >> n & 1]
 
 
-def get_undirected_graph(lines: str) -> nx.Graph:
-    graph = nx.Graph()
-    dag = get_graph(lines)
-    for edge in dag.edges:
-        graph.add_edge(edge[0], edge[1], weight=dag.edges[edge]["weight"])
-    return graph
+def get_undirected_graph(lines: str) -> UndirectedTrails:
+    return to_undirected(get_graph(lines))
 
 
-def path_length(graph: nx.Graph, path: list[Point]) -> int:
+def to_undirected(trails: TrailGraph) -> UndirectedTrails:
+    return UndirectedTrails.from_trails(trails)
+
+
+def path_length(trails: TrailGraph, path: list[GraphNode]) -> int:
     path_len = 0
     for node1, node2 in itertools.pairwise(path):
-        path_len += graph.edges[node1, node2]["weight"]
+        id1, id2 = trails.nodes[node1], trails.nodes[node2]
+        neighbours = trails.graph.neighbours(id1)
+        path_len += trails.graph.edge_weights(id1)[neighbours.index(id2)]
     return path_len
 
 
-def remove_node(graph: nx.Graph, node: Point | str) -> nx.Graph:
-    assert "end" in graph, "end not found"
-    assert node != "end", "cannot remove end"
-    new_graph = graph.copy()
-    new_graph.remove_node(node)
-    # return the component that contains end
-    components = list(nx.connected_components(new_graph))
-    for component in components:
-        if "end" in component:
-            # TODO: repeatdly remove all nodes that have degree 1, except start and end
-            subgraph: nx.Graph = new_graph.subgraph(component)
-            return subgraph
-    assert False, "unreachable"  # noqa: B011
-
-
-GraphNode = Point | str
-GraphNodeSet = frozenset[GraphNode]
-longest_path_cache: dict[tuple[GraphNodeSet, GraphNode], tuple[int, bool]] = {}
+# (nodes, start) -> (longest path from start to end, or an upper bound on it,
+# and whether it is exact)
+longest_path_cache: BoundedCache[tuple[int, int], tuple[int, bool]] = BoundedCache(
+    "d23b.longest_path", max_entries=1 << 20
+)
 
 
 def longest_path(
-    graph: nx.Graph,
-    start: Point | str,
+    graph: UndirectedTrails,
+    nodes: int,
+    start: int,
     current_path: int = 0,
     cutoff: int = 0,
 ) -> int | None:
     # short conditions
-    if start == "end":
+    if start == graph.end:
         return current_path
 
-    if start not in graph or not graph[start]:
+    if not nodes >> start & 1 or not graph.neighbour_masks[start] & nodes:
         return None
 
     # check the cache
-    graph_nodes = frozenset(graph.nodes)
-    if (graph_nodes, start) in longest_path_cache:
-        value, is_exact = longest_path_cache[graph_nodes, start]
+    cached = longest_path_cache.get((nodes, start))
+    if cached is not None:
+        value, is_exact = cached
         if is_exact:
             return current_path + value
         # we know that the best possible path is <= value
@@ -66,42 +114,58 @@ def longest_path(
             return None
 
     # compute the best path
-    best_path = longest_path_(graph, start, current_path, cutoff)
+    best_path = longest_path_(graph, nodes, start, current_path, cutoff)
 
     # update the cache
     if best_path is not None:
-        longest_path_cache[graph_nodes, start] = best_path - current_path, True
+        longest_path_cache.put((nodes, start), (best_path - current_path, True))
     else:
         # we know that cutoff - current_path < value, so it is a better bound
-        longest_path_cache[graph_nodes, start] = cutoff - current_path, False
+        longest_path_cache.put((nodes, start), (cutoff - current_path, False))
 
     return best_path
 
 
 def longest_path_(
-    graph: nx.Graph,
-    start: Point | str,
+    graph: UndirectedTrails,
+    nodes: int,
+    start: int,
     current_path: int = 0,
     cutoff: int = 0,
 ) -> int | None:
     """
-    return the longest path (at least cutoff) from start to end
+    return the longest path (at least cutoff) from start to end,
+    through the nodes of the bitmask nodes
     return None if there is no such path
     """
     if current_path < cutoff:
         best_case = current_path + sum(
-            max(graph[n1][n2]["weight"] for n2 in graph[n1]) for n1 in graph
+            max(
+                (
+                    weight
+                    for n2, weight in zip(
+                        graph.neighbours[n1], graph.weights[n1], strict=True
+                    )
+                    if nodes >> n2 & 1
+                ),
+                default=0,
+            )
+            for n1 in iter_nodes(nodes)
         )
         if best_case <= cutoff:
             # no path can be better than cutoff
             return None
 
     best_path = cutoff
-    for node in graph[start]:
+    remaining_nodes = graph.remove_node(nodes, start)
+    for node, weight in zip(graph.neighbours[start], graph.weights[start], strict=True):
+        if not nodes >> node & 1:
+            continue
         path_len = longest_path(
-            remove_node(graph, start),
+            graph,
+            remaining_nodes,
             node,
-            current_path + graph[start][node]["weight"],
+            current_path + weight,
             best_path,
         )
         if path_len is not None and path_len > best_path:
@@ -111,13 +175,24 @@ def longest_path_(
     return best_path if best_path > cutoff else None
 
 
-def process_lines(lines: str) -> int:
-    graph = get_undirected_graph(lines)
-    best_path = longest_path(graph, "start")
+def solve_parsed(trails: TrailGraph) -> int:
+    with span("build"):
+        graph = to_undirected(trails)
+    # node ids are only meaningful within one graph
+    with span("compute"), longest_path_cache.scope():
+        best_path = longest_path(graph, graph.all_nodes, graph.start)
     return best_path or -1
 
 
-solution = Solution.from_file(__file__, process_lines, {TEST_INPUT: 154})
+def process_lines(lines: str) -> int:
+    with span("build"):
+        dag = get_graph(lines)
+    return solve_parsed(dag)
+
+
+solution = Solution.from_file(
+    __file__, process_lines, {TEST_INPUT: 154}, get_graph, solve_parsed
+)
 
 if __name__ == "__main__":
     solution.test_inputs()
@@ -3,6 +3,7 @@ from dataclasses import dataclass
 from typing import Self
 
 from aoc2023.common import Solution
+from aoc2023.parsing import extract_records
 
 TEST_INPUT = """\
 19, 13, 30 @ -2,  1, -2
@@ -83,8 +84,15 @@ def is_cross_path_xy(a: HailStone, b: HailStone, min_xy: int, max_xy: int) -> bo
     return min_xy <= px <= max_xy and min_xy <= py <= max_xy
 
 
+def parse_input(lines: str) -> list[HailStone]:
+    return [HailStone(*record) for record in extract_records(lines, 6).tolist()]
+
+
 def crossing_stones(lines: str, min_xy: int, max_xy: int) -> int:
-    stones = [HailStone.from_line(line) for line in lines.splitlines()]
+    return count_crossing(parse_input(lines), min_xy, max_xy)
+
+
+def count_crossing(stones: list[HailStone], min_xy: int, max_xy: int) -> int:
     return sum(
         is_cross_path_xy(a, b, min_xy, max_xy)
         for a, b in itertools.combinations(stones, 2)
@@ -97,7 +105,17 @@ def process_lines(
     return crossing_stones(lines, min_xy, max_xy)
 
 
-solution = Solution.from_file(__file__, process_lines, {(TEST_INPUT, 7, 27): 2})
+def solve_parsed(
+    stones: list[HailStone],
+    min_xy: int = 200000000000000,
+    max_xy: int = 400000000000000,
+) -> int:
+    return count_crossing(stones, min_xy, max_xy)
+
+
+solution = Solution.from_file(
+    __file__, process_lines, {(TEST_INPUT, 7, 27): 2}, parse_input, solve_parsed
+)
 
 if __name__ == "__main__":
     solution.test_inputs()
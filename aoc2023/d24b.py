@@ -1,12 +1,12 @@
 from collections.abc import Iterable
 
-import sympy
-
 from aoc2023.common import Solution
-from aoc2023.d24a import TEST_INPUT, HailStone
+from aoc2023.d24a import TEST_INPUT, HailStone, parse_input
 
 
 def find_crossing_rock(hail_stones: Iterable[HailStone]) -> HailStone:
+    import sympy
+
     hail_stones = list(hail_stones)
     equations = []
     x, y, z = sympy.symbols("x y z")
@@ -34,15 +34,17 @@ def find_crossing_rock(hail_stones: Iterable[HailStone]) -> HailStone:
     )
 
 
+def solve_parsed(hail_stones: list[HailStone]) -> int:
+    return sum(find_crossing_rock(hail_stones).position)
+
+
 def process_lines(lines: str) -> int:
-    return sum(
-        find_crossing_rock(
-            HailStone.from_line(line) for line in lines.splitlines()
-        ).position
-    )
+    return solve_parsed(parse_input(lines))
 
 
-solution = Solution.from_file(__file__, process_lines, {TEST_INPUT: 47})
+solution = Solution.from_file(
+    __file__, process_lines, {TEST_INPUT: 47}, parse_input, solve_parsed
+)
 
 if __name__ == "__main__":
     solution.test_inputs()
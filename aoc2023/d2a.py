@@ -70,15 +70,21 @@ class Game:
         return is_valid_game
 
 
+def parse_input(lines: str) -> list[Game]:
+    return [Game.from_line(line) for line in lines.splitlines()]
+
+
+def solve_parsed(games: list[Game]) -> int:
+    return sum(game.game_id for game in games if game.is_valid())
+
+
 def process_lines(lines: str) -> int:
-    return sum(
-        game.game_id
-        for line in lines.splitlines()
-        if (game := Game.from_line(line)).is_valid()
-    )
+    return solve_parsed(parse_input(lines))
 
 
-solution = Solution.from_file(__file__, process_lines, {TEST_INPUT: 8})
+solution = Solution.from_file(
+    __file__, process_lines, {TEST_INPUT: 8}, parse_input, solve_parsed
+)
 
 if __name__ == "__main__":
     solution.test_inputs()
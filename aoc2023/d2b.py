@@ -1,5 +1,5 @@
 from aoc2023.common import Solution
-from aoc2023.d2a import TEST_INPUT, Game
+from aoc2023.d2a import TEST_INPUT, Game, parse_input
 
 
 class GameWithPower(Game):
@@ -13,11 +13,17 @@ class GameWithPower(Game):
         return max_balls.red * max_balls.green * max_balls.blue
 
 
+def solve_parsed(games: list[Game]) -> int:
+    return sum(GameWithPower(game.game_id, game.draws).power for game in games)
+
+
 def process_lines(lines: str) -> int:
-    return sum(GameWithPower.from_line(line).power for line in lines.splitlines())
+    return solve_parsed(parse_input(lines))
 
 
-solution = Solution.from_file(__file__, process_lines, {TEST_INPUT: 2286})
+solution = Solution.from_file(
+    __file__, process_lines, {TEST_INPUT: 2286}, parse_input, solve_parsed
+)
 
 if __name__ == "__main__":
     solution.test_inputs()
@@ -1,6 +1,7 @@
 from dataclasses import dataclass
 
 from aoc2023.common import Solution
+from aoc2023.parsing import extract_records
 
 TEST_INPUT = """\
 Card 1: 41 48 83 86 17 | 83 86  6 31 17  9 48 53
@@ -43,11 +44,36 @@ class Card:
         return score
 
 
+def parse_input(lines: str) -> list[Card]:
+    """
+    >>> card = parse_input(TEST_INPUT)[2]
+    >>> card.card_id, card.winning_numbers
+    (3, [1, 21, 53, 59, 44])
+    """
+    # each side of "|" is parsed apart, so every card must have as many
+    # winning numbers, and as many numbers, as the first one
+    sides = [line.partition("|") for line in lines.splitlines() if line.strip()]
+    ids_and_winning = extract_records("\n".join(side[0] for side in sides))
+    card_numbers = extract_records("\n".join(side[2] for side in sides))
+    return [
+        Card(winning[0], winning[1:], numbers)
+        for winning, numbers in zip(
+            ids_and_winning.tolist(), card_numbers.tolist(), strict=True
+        )
+    ]
+
+
+def solve_parsed(cards: list[Card]) -> int:
+    return sum(card.score() for card in cards)
+
+
 def process_lines(lines: str) -> int:
-    return sum(Card.from_line(line).score() for line in lines.splitlines())
+    return solve_parsed(parse_input(lines))
 
 
-solution = Solution.from_file(__file__, process_lines, {TEST_INPUT: 13})
+solution = Solution.from_file(
+    __file__, process_lines, {TEST_INPUT: 13}, parse_input, solve_parsed
+)
 
 if __name__ == "__main__":
     solution.test_inputs()
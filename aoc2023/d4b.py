@@ -1,5 +1,5 @@
 from aoc2023.common import Solution
-from aoc2023.d4a import TEST_INPUT, Card
+from aoc2023.d4a import TEST_INPUT, Card, parse_input
 
 
 def get_cards_count(cards: list[Card]) -> list[int]:
@@ -15,11 +15,17 @@ def get_cards_count(cards: list[Card]) -> list[int]:
     return cards_count
 
 
+def solve_parsed(cards: list[Card]) -> int:
+    return sum(get_cards_count(cards))
+
+
 def process_lines(lines: str) -> int:
-    return sum(get_cards_count([Card.from_line(line) for line in lines.splitlines()]))
+    return solve_parsed(parse_input(lines))
 
 
-solution = Solution.from_file(__file__, process_lines, {TEST_INPUT: 30})
+solution = Solution.from_file(
+    __file__, process_lines, {TEST_INPUT: 30}, parse_input, solve_parsed
+)
 
 if __name__ == "__main__":
     solution.test_inputs()
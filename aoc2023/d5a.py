@@ -3,6 +3,7 @@ from dataclasses import dataclass
 import more_itertools
 
 from aoc2023.common import Solution
+from aoc2023.parsing import extract_ints, extract_records
 
 TEST_INPUT = """\
 seeds: 79 14 55 13
@@ -79,7 +80,8 @@ class Map:
 
     @classmethod
     def from_lines(cls, lines: list[str]) -> "Map":
-        return cls([RangeMap.from_line(line) for line in lines])
+        records = extract_records("\n".join(lines), 3)
+        return cls([RangeMap(*record) for record in records.tolist()])
 
     def pass_value(self, value: int) -> int:
         """
@@ -109,16 +111,32 @@ def create_maps(lines: list[str]) -> dict[str, Map]:
     return maps
 
 
+@dataclass
+class Almanac:
+    seeds: list[int]
+    maps: dict[str, Map]
+
+    @classmethod
+    def from_lines(cls, lines: list[str]) -> "Almanac":
+        seeds_line, empty_line, *maps_lines = lines
+        assert empty_line == ""
+        seeds = extract_ints(seeds_line).tolist()
+        return cls(seeds, create_maps(maps_lines))
+
+
+def find_locations(almanac: Almanac) -> list[int]:
+    seed_locations = {
+        seed: find_location_from_seed(almanac.maps, seed) for seed in almanac.seeds
+    }
+    return list(seed_locations.values())
+
+
 def find_locations_from_input(lines: list[str]) -> list[int]:
     """
     >>> find_locations_from_input(TEST_INPUT.splitlines())
     [82, 43, 86, 35]
     """
-    seeds = [int(w) for w in lines.pop(0).split(":")[1].split()]
-    assert lines.pop(0) == ""
-    maps = create_maps(lines)
-    seed_locations = {seed: find_location_from_seed(maps, seed) for seed in seeds}
-    return list(seed_locations.values())
+    return find_locations(Almanac.from_lines(lines))
 
 
 def find_location_from_seed(maps: dict[str, Map], seed: int) -> int:
@@ -137,11 +155,21 @@ def find_location_from_seed(maps: dict[str, Map], seed: int) -> int:
     return current_value
 
 
+def parse_input(lines: str) -> Almanac:
+    return Almanac.from_lines(lines.splitlines())
+
+
+def solve_parsed(almanac: Almanac) -> int:
+    return min(find_locations(almanac))
+
+
 def process_lines(lines: str) -> int:
-    return min(find_locations_from_input(lines.splitlines()))
+    return solve_parsed(parse_input(lines))
 
 
-solution = Solution.from_file(__file__, process_lines, {TEST_INPUT: 35})
+solution = Solution.from_file(
+    __file__, process_lines, {TEST_INPUT: 35}, parse_input, solve_parsed
+)
 
 if __name__ == "__main__":
     solution.test_inputs()
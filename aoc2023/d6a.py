@@ -2,6 +2,7 @@ import math
 from dataclasses import dataclass
 
 from aoc2023.common import Solution
+from aoc2023.parsing import extract_ints
 
 TEST_INPUT = """\
 Time:      7  15   30
@@ -39,8 +40,8 @@ def parse_lines(lines: list[str]) -> list[Race]:
     >>> parse_lines(TEST_INPUT.splitlines())
     [Race(time=7, distance=9), Race(time=15, distance=40), Race(time=30, distance=200)]
     """
-    times = [int(x) for x in lines[0].split()[1:]]
-    distances = [int(x) for x in lines[1].split()[1:]]
+    times = extract_ints(lines[0]).tolist()
+    distances = extract_ints(lines[1]).tolist()
     return [Race(t, d) for t, d in zip(times, distances, strict=True)]
 
 
@@ -4,7 +4,7 @@ from dataclasses import dataclass
 from enum import IntEnum
 from typing import Self
 
-from aoc2023.common import Solution
+from aoc2023.common import Solution, span
 
 TEST_INPUT = """\
 32T3K 765
@@ -74,7 +74,11 @@ def get_winning(hands: Iterable[Hand]) -> list[int]:
 
 
 def process_lines(lines: str) -> int:
-    return sum(get_winning(Hand.from_line(line) for line in lines.splitlines()))
+    with span("parse"):
+        hands = [Hand.from_line(line) for line in lines.splitlines()]
+    with span("compute"):
+        winnings = get_winning(hands)
+    return sum(winnings)
 
 
 solution = Solution.from_file(__file__, process_lines, {TEST_INPUT: 6440})
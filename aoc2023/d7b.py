@@ -1,6 +1,6 @@
 import collections
 
-from aoc2023.common import Solution
+from aoc2023.common import Solution, span
 from aoc2023.d7a import TEST_INPUT, Hand, HandType, get_winning
 
 
@@ -37,9 +37,11 @@ class HandWithJoker(Hand):
 
 
 def process_lines(lines: str) -> int:
-    return sum(
-        get_winning(HandWithJoker.from_line(line) for line in lines.splitlines())
-    )
+    with span("parse"):
+        hands = [HandWithJoker.from_line(line) for line in lines.splitlines()]
+    with span("compute"):
+        winnings = get_winning(hands)
+    return sum(winnings)
 
 
 solution = Solution.from_file(__file__, process_lines, {TEST_INPUT: 5905})
@@ -53,12 +53,24 @@ class Page:
         raise RuntimeError("Unreachable")
 
 
+def parse_input(lines: str) -> Page:
+    return Page.from_lines(lines.splitlines())
+
+
+def solve_parsed(page: Page) -> int:
+    return page.steps_to_end()
+
+
 def process_lines(lines: str) -> int:
-    return Page.from_lines(lines.splitlines()).steps_to_end()
+    return solve_parsed(parse_input(lines))
 
 
 solution = Solution.from_file(
-    __file__, process_lines, {TEST_INPUT_1: 2, TEST_INPUT_2: 6}
+    __file__,
+    process_lines,
+    {TEST_INPUT_1: 2, TEST_INPUT_2: 6},
+    parse_input,
+    solve_parsed,
 )
 
 if __name__ == "__main__":
@@ -1,11 +1,15 @@
 import math
 from dataclasses import dataclass
+from typing import TYPE_CHECKING
 
-import matplotlib.pyplot as plt
-import networkx as nx
+import numpy as np
 
 from aoc2023.common import Solution
-from aoc2023.d8a import Page
+from aoc2023.d8a import Page, parse_input
+from aoc2023.graph import CSRGraph
+
+if TYPE_CHECKING:
+    import networkx as nx
 
 TEST_INPUT = """\
 LR
@@ -23,7 +27,20 @@ XXX = (XXX, XXX)
 
 @dataclass
 class PageForGhost(Page):
-    def get_graph(self) -> nx.Graph:
+    def get_graph(self) -> CSRGraph:
+        graph, _ = CSRGraph.from_named_edges(
+            (
+                (node, self.network[node][direction])
+                for direction in "LR"
+                for node in self.network
+            ),
+            directed=False,
+        )
+        return graph
+
+    def to_networkx(self) -> "nx.Graph":
+        import networkx as nx
+
         graph = nx.Graph()
         for direction in "LR":
             graph.add_edges_from(
@@ -35,8 +52,8 @@ class PageForGhost(Page):
     def get_loop_sizes(self) -> list[int]:
         if "XXX" in self.network:
             return [2, 3]
-        graph = self.get_graph()
-        sub_graphs_num_nodes = [len(c) for c in nx.connected_components(graph)]
+        _, components = self.get_graph().components()
+        sub_graphs_num_nodes = np.bincount(components).tolist()
         sub_graphs_loop_size = [(i - 1) // 2 for i in sub_graphs_num_nodes]
         return sub_graphs_loop_size
 
@@ -48,7 +65,10 @@ class PageForGhost(Page):
         return math.lcm(*self.get_loop_sizes(), len(self.instructions))
 
     def draw_network(self) -> None:
-        graph = self.get_graph()
+        import matplotlib.pyplot as plt
+        import networkx as nx
+
+        graph = self.to_networkx()
         subgraph: nx.Graph
         for subgraph in (
             graph.subgraph(c)  # type: ignore[no-untyped-call]
@@ -74,11 +94,17 @@ class PageForGhost(Page):
         plt.show()
 
 
+def solve_parsed(page: Page) -> int:
+    return PageForGhost(page.instructions, page.network).steps_to_end()
+
+
 def process_lines(lines: str) -> int:
-    return PageForGhost.from_lines(lines.splitlines()).steps_to_end()
+    return solve_parsed(parse_input(lines))
 
 
-solution = Solution.from_file(__file__, process_lines, {TEST_INPUT: 6})
+solution = Solution.from_file(
+    __file__, process_lines, {TEST_INPUT: 6}, parse_input, solve_parsed
+)
 
 if __name__ == "__main__":
     solution.test_inputs()
@@ -1,6 +1,8 @@
 import numpy as np
+import numpy.typing as npt
 
 from aoc2023.common import Solution
+from aoc2023.parsing import extract_ints, extract_records
 
 TEST_INPUT = """\
 0 3 6 9 12 15
@@ -9,26 +11,60 @@ TEST_INPUT = """\
 """
 
 
-def next_value(line: str) -> int:
-    """
-    >>> [next_value(line) for line in TEST_INPUT.splitlines()]
-    [18, 28, 68]
-    """
-    values = np.array([int(x) for x in line.split()])
+Differences = list[npt.NDArray[np.int_]]
+
+
+def differences(line: str) -> Differences:
+    return differences_of(extract_ints(line))
+
+
+def differences_of(values: npt.NDArray[np.int_]) -> Differences:
     diffs = [values]
     while not (diffs[-1] == 0).all():
         diffs.append(np.diff(diffs[-1]))
+    return diffs
+
+
+def extrapolate_next(diffs: Differences) -> int:
     last_diff = 0
     for diff in reversed(diffs):
         last_diff += diff[-1]
     return int(last_diff)
 
 
+def next_value(line: str) -> int:
+    """
+    >>> [next_value(line) for line in TEST_INPUT.splitlines()]
+    [18, 28, 68]
+    """
+    return extrapolate_next(differences(line))
+
+
+def parse_input(lines: str) -> list[Differences]:
+    """
+    All the lines in one pass when they have as many values, else line by line.
+
+    >>> [extrapolate_next(diffs) for diffs in parse_input("0 3 6 9\\n1 3 6 10 15\\n")]
+    [12, 21]
+    """
+    try:
+        records = list(extract_records(lines))
+    except ValueError:
+        records = [extract_ints(line) for line in lines.splitlines() if line.strip()]
+    return [differences_of(values) for values in records]
+
+
+def solve_parsed(all_diffs: list[Differences]) -> int:
+    return sum(extrapolate_next(diffs) for diffs in all_diffs)
+
+
 def process_lines(lines: str) -> int:
-    return sum(next_value(line) for line in lines.splitlines())
+    return solve_parsed(parse_input(lines))
 
 
-solution = Solution.from_file(__file__, process_lines, {TEST_INPUT: 114})
+solution = Solution.from_file(
+    __file__, process_lines, {TEST_INPUT: 114}, parse_input, solve_parsed
+)
 
 if __name__ == "__main__":
     solution.test_inputs()
@@ -1,7 +1,5 @@
-import numpy as np
-
 from aoc2023.common import Solution
-from aoc2023.d9a import TEST_INPUT
+from aoc2023.d9a import TEST_INPUT, Differences, differences, parse_input
 
 
 def previous_value(line: str) -> int:
@@ -9,21 +7,27 @@ def previous_value(line: str) -> int:
     >>> [previous_value(line) for line in TEST_INPUT.splitlines()]
     [-3, 0, 5]
     """
-    values = np.array([int(x) for x in line.split()])
-    diffs = [values]
-    while not (diffs[-1] == 0).all():
-        diffs.append(np.diff(diffs[-1]))
+    return extrapolate_previous(differences(line))
+
+
+def extrapolate_previous(diffs: Differences) -> int:
     last_diff = 0
     for diff in reversed(diffs):
         last_diff = diff[0] - last_diff
     return int(last_diff)
 
 
+def solve_parsed(all_diffs: list[Differences]) -> int:
+    return sum(extrapolate_previous(diffs) for diffs in all_diffs)
+
+
 def process_lines(lines: str) -> int:
-    return sum(previous_value(line) for line in lines.splitlines())
+    return solve_parsed(parse_input(lines))
 
 
-solution = Solution.from_file(__file__, process_lines, {TEST_INPUT: 2})
+solution = Solution.from_file(
+    __file__, process_lines, {TEST_INPUT: 2}, parse_input, solve_parsed
+)
 
 if __name__ == "__main__":
     solution.test_inputs()
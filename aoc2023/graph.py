@@ -0,0 +1,280 @@
+# graphs over integer node ids, in CSR form, for the hot paths that used
+# networkx: any hashable node names are interned to 0..n-1 by a NodeIndex,
+# and the traversals expand whole frontiers with array operations.
+
+from collections.abc import Hashable, Iterable, Iterator
+from dataclasses import dataclass
+from typing import Any, Generic, Self, TypeVar
+
+import numpy as np
+import numpy.typing as npt
+
+from aoc2023.grid import IndexArray
+
+N = TypeVar("N", bound=Hashable)
+WeightArray = npt.NDArray[np.int64]
+
+
+class NodeIndex(Generic[N]):
+    """
+    Interns node names to the ids 0, 1, 2, ... in order of first use.
+
+    >>> index = NodeIndex(["start"])
+    >>> index.add("a"), index.add("b"), index.add("a"), index["start"]
+    (1, 2, 1, 0)
+    >>> index.name(2), len(index), "c" in index
+    ('b', 3, False)
+    """
+
+    def __init__(self, names: Iterable[N] = ()):
+        self._ids: dict[N, int] = {}
+        self.names: list[N] = []
+        for name in names:
+            self.add(name)
+
+    def add(self, name: N) -> int:
+        node = self._ids.get(name)
+        if node is None:
+            node = self._ids[name] = len(self.names)
+            self.names.append(name)
+        return node
+
+    def __getitem__(self, name: N) -> int:
+        return self._ids[name]
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._ids
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __iter__(self) -> Iterator[N]:
+        return iter(self.names)
+
+    def name(self, node: int) -> N:
+        return self.names[node]
+
+
+@dataclass(frozen=True)
+class CSRGraph:
+    """
+    A directed graph over the nodes 0..num_nodes-1: the edges out of node i
+    go to indices[indptr[i]:indptr[i + 1]], with the same slice of weights.
+    An undirected graph has each edge in both directions.
+
+    >>> graph = CSRGraph.from_edges([0, 0, 1, 2], [1, 2, 3, 3], [5, 1, 1, 2])
+    >>> graph.neighbours(0), graph.edge_weights(0)
+    ([1, 2], [5, 1])
+    >>> graph.descendants(0).tolist(), graph.descendants(0, removed=[1]).tolist()
+    ([1, 2, 3], [2, 3])
+    >>> graph.topological_order().tolist(), graph.dag_longest_path_length()
+    ([0, 1, 2, 3], 6)
+    """
+
+    indptr: IndexArray
+    indices: IndexArray
+    weights: WeightArray
+
+    @classmethod
+    def from_edges(  # noqa: PLR0913
+        cls,
+        sources: npt.ArrayLike,
+        targets: npt.ArrayLike,
+        weights: npt.ArrayLike | None = None,
+        *,
+        num_nodes: int | None = None,
+        directed: bool = True,
+    ) -> Self:
+        """
+        Build from parallel arrays of edges (all of weight 1 by default).
+        The edges out of each node keep their order.
+        """
+        sources = np.asarray(sources, dtype=np.int64)
+        targets = np.asarray(targets, dtype=np.int64)
+        weights = (
+            np.ones(len(sources), dtype=np.int64)
+            if weights is None
+            else np.asarray(weights, dtype=np.int64)
+        )
+        if not directed:
+            sources, targets = (
+                np.concatenate([sources, targets]),
+                np.concatenate([targets, sources]),
+            )
+            weights = np.concatenate([weights, weights])
+        if num_nodes is None:
+            num_nodes = int(max(sources.max(initial=-1), targets.max(initial=-1))) + 1
+        order = np.argsort(sources, kind="stable")
+        indptr = np.zeros(num_nodes + 1, dtype=np.int64)
+        np.cumsum(np.bincount(sources, minlength=num_nodes), out=indptr[1:])
+        return cls(indptr, targets[order], weights[order])
+
+    @classmethod
+    def from_named_edges(
+        cls,
+        edges: Iterable[tuple[N, N] | tuple[N, N, int]],
+        index: NodeIndex[N] | None = None,
+        *,
+        directed: bool = True,
+    ) -> tuple[Self, NodeIndex[N]]:
+        """
+        Build from (source, target) or (source, target, weight) edges between
+        named nodes, interning the names to ids with index.
+
+        >>> graph, index = CSRGraph.from_named_edges([("a", "b", 3), ("b", "c", 4)])
+        >>> [index.name(node) for node in graph.neighbours(index["b"])]
+        ['c']
+        """
+        index = NodeIndex() if index is None else index
+        sources, targets, weights = [], [], []
+        for edge in edges:
+            sources.append(index.add(edge[0]))
+            targets.append(index.add(edge[1]))
+            weights.append(edge[2] if len(edge) == 3 else 1)  # noqa: PLR2004
+        graph = cls.from_edges(
+            sources, targets, weights, num_nodes=len(index), directed=directed
+        )
+        return graph, index
+
+    @property
+    def num_nodes(self) -> int:
+        return len(self.indptr) - 1
+
+    @property
+    def num_edges(self) -> int:
+        return len(self.indices)
+
+    def neighbours(self, node: int) -> list[int]:
+        neighbours: list[int] = self.indices[
+            self.indptr[node] : self.indptr[node + 1]
+        ].tolist()
+        return neighbours
+
+    def edge_weights(self, node: int) -> list[int]:
+        weights: list[int] = self.weights[
+            self.indptr[node] : self.indptr[node + 1]
+        ].tolist()
+        return weights
+
+    def out_degrees(self) -> IndexArray:
+        return np.diff(self.indptr)
+
+    def in_degrees(self) -> IndexArray:
+        return np.bincount(self.indices, minlength=self.num_nodes)
+
+    def edge_sources(self) -> IndexArray:
+        return np.repeat(np.arange(self.num_nodes), self.out_degrees())
+
+    def reverse(self) -> Self:
+        return type(self).from_edges(
+            self.indices, self.edge_sources(), self.weights, num_nodes=self.num_nodes
+        )
+
+    def to_scipy(self) -> Any:
+        """The weighted adjacency matrix, as a scipy.sparse.csr_array."""
+        import scipy.sparse  # type: ignore[import-untyped]
+
+        return scipy.sparse.csr_array(
+            (self.weights, self.indices, self.indptr),
+            shape=(self.num_nodes, self.num_nodes),
+        )
+
+    def out_edges(self, nodes: IndexArray) -> tuple[IndexArray, IndexArray]:
+        """
+        The edges out of all the nodes at once: the position of each in
+        indices/weights, and the node it leaves from.
+        """
+        starts = self.indptr[nodes]
+        counts = self.indptr[nodes + 1] - starts
+        owners = np.repeat(np.arange(len(nodes)), counts)
+        first_of_owner = np.cumsum(counts) - counts
+        positions = starts[owners] + np.arange(counts.sum()) - first_of_owner[owners]
+        return positions, nodes[owners]
+
+    def bfs_layers(
+        self, sources: npt.ArrayLike, removed: npt.ArrayLike = ()
+    ) -> Iterator[IndexArray]:
+        """
+        Breadth-first search from all the sources at once, that never enters
+        the removed nodes: the nodes at distance 0, 1, 2, ... each as an array.
+
+        >>> graph = CSRGraph.from_edges([0, 0, 1, 2], [1, 2, 3, 4], directed=False)
+        >>> [layer.tolist() for layer in graph.bfs_layers([0])]
+        [[0], [1, 2], [3, 4]]
+        """
+        seen = np.zeros(self.num_nodes, dtype=np.bool_)
+        seen[np.asarray(removed, dtype=np.int64)] = True
+        frontier = np.unique(np.asarray(sources, dtype=np.int64))
+        frontier = frontier[~seen[frontier]]
+        while len(frontier):
+            seen[frontier] = True
+            yield frontier
+            positions, _ = self.out_edges(frontier)
+            neighbours = self.indices[positions]
+            frontier = np.unique(neighbours[~seen[neighbours]])
+
+    def reachable(
+        self, sources: npt.ArrayLike, removed: npt.ArrayLike = ()
+    ) -> npt.NDArray[np.bool_]:
+        """Whether each node can be reached from the sources."""
+        reached = np.zeros(self.num_nodes, dtype=np.bool_)
+        for layer in self.bfs_layers(sources, removed):
+            reached[layer] = True
+        return reached
+
+    def descendants(self, source: int, removed: npt.ArrayLike = ()) -> IndexArray:
+        """The nodes reachable from source (not itself), avoiding removed."""
+        reached = self.reachable([source], removed)
+        reached[source] = False
+        return np.flatnonzero(reached)
+
+    def components(self) -> tuple[int, IndexArray]:
+        """
+        The number of weakly connected components, and the component of each node.
+
+        >>> CSRGraph.from_edges([0, 3], [1, 2], num_nodes=5).components()
+        (3, array([0, 0, 1, 1, 2], dtype=int32))
+        """
+        import scipy.sparse.csgraph  # type: ignore[import-untyped]
+
+        count, labels = scipy.sparse.csgraph.connected_components(
+            self.to_scipy(), directed=True, connection="weak"
+        )
+        return int(count), labels
+
+    def topological_layers(self) -> Iterator[IndexArray]:
+        """
+        Kahn's algorithm, a whole layer at a time: the nodes without in-edges,
+        then those whose in-edges all come from the previous layers, and so on.
+        Raises ValueError if the graph has a cycle.
+        """
+        in_degrees = self.in_degrees()
+        layer = np.flatnonzero(in_degrees == 0)
+        count = 0
+        while len(layer):
+            yield layer
+            count += len(layer)
+            positions, _ = self.out_edges(layer)
+            targets, removed_edges = np.unique(
+                self.indices[positions], return_counts=True
+            )
+            in_degrees[targets] -= removed_edges
+            layer = targets[in_degrees[targets] == 0]
+        if count < self.num_nodes:
+            raise ValueError("the graph has a cycle")
+
+    def topological_order(self) -> IndexArray:
+        layers = list(self.topological_layers())
+        return np.concatenate(layers) if layers else np.zeros(0, dtype=np.int64)
+
+    def dag_longest_path_length(self) -> int:
+        """The largest total weight of a path in the DAG."""
+        longest = np.zeros(self.num_nodes, dtype=np.int64)
+        for layer in self.topological_layers():
+            positions, sources = self.out_edges(layer)
+            np.maximum.at(
+                longest,
+                self.indices[positions],
+                longest[sources] + self.weights[positions],
+            )
+        return int(longest.max(initial=0))
@@ -1,5 +1,6 @@
 # can be used in 3, 10, 11, ...
-from collections.abc import Callable
+import os
+from collections.abc import Callable, Iterable, Iterator
 from dataclasses import dataclass
 from typing import Any, Optional, Self
 
@@ -59,9 +60,198 @@ class Point:
         return top, bottom, left, right
 
 
+class PointCodec:
+    """
+    The points of a height x width grid, as flat indices y * width + x.
+    Indices are plain ints, so they are much cheaper than Points to create,
+    hash and compare in hot loops. Like Point's, up/down/left/right do not
+    check the bounds (and left/right wrap around rows), neighbours does.
+
+    >>> codec = PointCodec(3, 4)
+    >>> codec.encode(Point(1, 2)), codec.decode(6)
+    (6, P(1, 2))
+    >>> codec.up(6), codec.down(6), codec.left(6), codec.right(6)
+    (2, 10, 5, 7)
+    >>> codec.neighbours(0), codec.neighbours(6)
+    ([4, 1], [2, 10, 5, 7])
+    >>> codec.decode_many(codec.encode_many([Point(0, 0), Point(2, 3)]))
+    [P(0, 0), P(2, 3)]
+    >>> codec.manhattan_distance(0, 11)
+    5
+    """
+
+    __slots__ = ("height", "width")
+
+    def __init__(self, height: int, width: int):
+        self.height = height
+        self.width = width
+
+    def __repr__(self) -> str:
+        return f"PointCodec({self.height}, {self.width})"
+
+    def encode(self, p: Point) -> int:
+        return p.y * self.width + p.x
+
+    def decode(self, index: int) -> Point:
+        return Point(*divmod(index, self.width))
+
+    def encode_many(self, points: Iterable[Point]) -> list[int]:
+        width = self.width
+        return [p.y * width + p.x for p in points]
+
+    def decode_many(self, indices: Iterable[int]) -> list[Point]:
+        width = self.width
+        return [Point(*divmod(index, width)) for index in indices]
+
+    def in_bounds(self, p: Point) -> bool:
+        return 0 <= p.y < self.height and 0 <= p.x < self.width
+
+    def up(self, index: int) -> int:
+        return index - self.width
+
+    def down(self, index: int) -> int:
+        return index + self.width
+
+    def left(self, index: int) -> int:
+        return index - 1
+
+    def right(self, index: int) -> int:
+        return index + 1
+
+    def neighbours(self, index: int) -> list[int]:
+        """The in-bounds neighbours up, down, left and right, in that order."""
+        width = self.width
+        y, x = divmod(index, width)
+        neighbours = []
+        if y > 0:
+            neighbours.append(index - width)
+        if y < self.height - 1:
+            neighbours.append(index + width)
+        if x > 0:
+            neighbours.append(index - 1)
+        if x < width - 1:
+            neighbours.append(index + 1)
+        return neighbours
+
+    def manhattan_distance(self, a: int, b: int) -> int:
+        ay, ax = divmod(a, self.width)
+        by, bx = divmod(b, self.width)
+        return abs(ay - by) + abs(ax - bx)
+
+
+IndexArray = npt.NDArray[np.signedinteger[Any]]
+# up, down, left, right, then the diagonals
+ORTHOGONAL_OFFSETS = [(-1, 0), (1, 0), (0, -1), (0, 1)]
+DIAGONAL_OFFSETS = [(-1, -1), (-1, 1), (1, -1), (1, 1)]
+# per grid, for as many passable functions
+MAX_CACHED_ADJACENCIES = 8
+
+
+@dataclass(frozen=True)
+class GridAdjacency:
+    """
+    The neighbours of every cell in CSR form, over the flat indices of codec:
+    the neighbours of cell i are indices[indptr[i]:indptr[i + 1]].
+
+    >>> adjacency = ByteGrid.from_string("..#\\n...\\n").adjacency(lambda c: c != "#")
+    >>> adjacency.neighbours(1), adjacency.neighbours(2)
+    ([4, 0], [])
+    >>> sources, neighbours = adjacency.neighbours_of([0, 2, 4])
+    >>> sources.tolist(), neighbours.tolist()
+    ([0, 0, 4, 4, 4], [3, 1, 1, 3, 5])
+    """
+
+    codec: PointCodec
+    indptr: IndexArray
+    indices: IndexArray
+
+    @classmethod
+    def from_mask(
+        cls, passable: npt.NDArray[np.bool_], *, include_diagonals: bool = False
+    ) -> Self:
+        """Connect each passable cell to its passable neighbours."""
+        height, width = passable.shape
+        offsets = ORTHOGONAL_OFFSETS + (DIAGONAL_OFFSETS if include_diagonals else [])
+        # half the memory of int64 for all but the largest grids
+        dtype = np.int32 if height * width < 2**31 else np.int64
+        flat_indices = np.arange(height * width, dtype=dtype).reshape(height, width)
+        # the neighbour of each cell in each direction, or -1
+        neighbours = np.full((height, width, len(offsets)), -1, dtype=dtype)
+        for k, (dy, dx) in enumerate(offsets):
+            # the cells [y0:y1, x0:x1] have a neighbour at (dy, dx) in the grid
+            y0, y1 = max(0, -dy), height - max(0, dy)
+            x0, x1 = max(0, -dx), width - max(0, dx)
+            connected = (
+                passable[y0:y1, x0:x1] & passable[y0 + dy : y1 + dy, x0 + dx : x1 + dx]
+            )
+            neighbours[y0:y1, x0:x1, k] = np.where(
+                connected, flat_indices[y0 + dy : y1 + dy, x0 + dx : x1 + dx], -1
+            )
+        by_cell = neighbours.reshape(height * width, len(offsets))
+        is_neighbour = by_cell >= 0
+        indptr = np.zeros(height * width + 1, dtype=np.int64)
+        np.cumsum(is_neighbour.sum(axis=1), out=indptr[1:])
+        # row-major, so grouped by cell, in the order of offsets
+        return cls(PointCodec(height, width), indptr, by_cell[is_neighbour])
+
+    def neighbours(self, index: int) -> list[int]:
+        neighbours: list[int] = self.indices[
+            self.indptr[index] : self.indptr[index + 1]
+        ].tolist()
+        return neighbours
+
+    def neighbours_of(self, indices: npt.ArrayLike) -> tuple[IndexArray, IndexArray]:
+        """
+        The neighbours of all the cells at once, and the cell each one is
+        a neighbour of.
+        """
+        indices = np.asarray(indices, dtype=np.int64)
+        starts = self.indptr[indices]
+        counts = self.indptr[indices + 1] - starts
+        # for each neighbour, its position in indices, then in self.indices
+        owners = np.repeat(np.arange(len(indices)), counts)
+        first_of_owner = np.cumsum(counts) - counts
+        positions = starts[owners] + np.arange(counts.sum()) - first_of_owner[owners]
+        return indices[owners], self.indices[positions]
+
+    def distances(
+        self, sources: npt.ArrayLike, max_steps: int | None = None
+    ) -> npt.NDArray[np.int32]:
+        """
+        Breadth-first search from all the sources at once: the number of steps
+        to each cell, or -1 if it cannot be reached (within max_steps).
+        Each step expands the whole frontier with array operations.
+
+        >>> grid = ByteGrid.from_string(".#.\\n...\\n")
+        >>> adjacency = grid.adjacency(lambda c: c == ".")
+        >>> adjacency.distances([0]).tolist()
+        [0, -1, 4, 1, 2, 3]
+        >>> adjacency.distances([0, 2], max_steps=1).tolist()
+        [0, -1, 0, 1, -1, 1]
+        """
+        distances = np.full(len(self.indptr) - 1, -1, dtype=np.int32)
+        frontier = np.unique(np.asarray(sources, dtype=np.int64))
+        distances[frontier] = 0
+        step = 0
+        while len(frontier) and (max_steps is None or step < max_steps):
+            step += 1
+            _, neighbours = self.neighbours_of(frontier)
+            frontier = np.unique(neighbours[distances[neighbours] < 0])
+            distances[frontier] = step
+        return distances
+
+
 class Grid:
     def __init__(self, data: npt.NDArray[Any]):
         self.data = data
+        self._adjacencies: dict[
+            tuple[Callable[[Any], Any] | None, bool], GridAdjacency
+        ] = {}
+
+    @property
+    def codec(self) -> PointCodec:
+        height, width = self.data.shape
+        return PointCodec(height, width)
 
     def in_bounds(self, p: Point) -> bool:
         return 0 <= p.y < self.data.shape[0] and 0 <= p.x < self.data.shape[1]
@@ -96,21 +286,125 @@ class Grid:
     def find(self, value: Any) -> list[Point]:
         return [Point(*yx) for yx in np.argwhere(self.data == value)]
 
+    def mask(self, f: Callable[[Any], Any]) -> npt.NDArray[np.bool_]:
+        mask: npt.NDArray[np.bool_] = np.vectorize(f, otypes=[np.bool_])(self.data)
+        return mask
+
+    def adjacency(
+        self,
+        passable: Callable[[Any], Any] | None = None,
+        *,
+        include_diagonals: bool = False,
+    ) -> GridAdjacency:
+        """
+        The adjacency between the cells for which passable is true (all cells
+        by default), built on the first call and cached on the grid per
+        passable function: pass the same function (not a new lambda) to reuse it.
+
+        >>> grid = ByteGrid.from_string("..\\n.#\\n")
+        >>> def is_open(c): return c == "."
+        >>> grid.adjacency(is_open) is grid.adjacency(is_open)
+        True
+        >>> for _ in range(20): _ = grid.adjacency(lambda c: c == ".")
+        >>> len(grid._adjacencies) == MAX_CACHED_ADJACENCIES
+        True
+        """
+        key = passable, include_diagonals
+        if key not in self._adjacencies:
+            if len(self._adjacencies) >= MAX_CACHED_ADJACENCIES:
+                # the oldest first
+                del self._adjacencies[next(iter(self._adjacencies))]
+            if passable is None:
+                mask = np.ones(self.data.shape, dtype=np.bool_)
+            else:
+                mask = self.mask(passable)
+            self._adjacencies[key] = GridAdjacency.from_mask(
+                mask, include_diagonals=include_diagonals
+            )
+        return self._adjacencies[key]
+
+    def neighbours_of(
+        self,
+        indices: npt.ArrayLike,
+        passable: Callable[[Any], Any] | None = None,
+        *,
+        include_diagonals: bool = False,
+    ) -> tuple[IndexArray, IndexArray]:
+        """
+        Batch neighbours: for the flat indices (see codec), return the indices
+        of all their neighbours, and the cell each one is a neighbour of.
+
+        >>> grid = Grid.from_string("abc\\ndef")
+        >>> sources, neighbours = grid.neighbours_of([0, 4], include_diagonals=True)
+        >>> sources.tolist(), neighbours.tolist()
+        ([0, 0, 0, 4, 4, 4, 4, 4], [3, 1, 4, 1, 3, 5, 0, 2])
+        """
+        adjacency = self.adjacency(passable, include_diagonals=include_diagonals)
+        return adjacency.neighbours_of(indices)
+
+    def distance_map(
+        self,
+        sources: Iterable[Point],
+        passable: Callable[[Any], Any] | None = None,
+        *,
+        include_diagonals: bool = False,
+        max_steps: int | None = None,
+    ) -> npt.NDArray[np.int32]:
+        """
+        The number of steps from the nearest source to each cell, through
+        passable cells, or -1 if it cannot be reached (within max_steps).
+
+        >>> grid = ByteGrid.from_string("S.#\\n#..\\n...\\n")
+        >>> distances = grid.distance_map(grid.find("S"), lambda c: c != "#")
+        >>> distances.tolist()
+        [[0, 1, -1], [-1, 2, 3], [4, 3, 4]]
+        >>> count_reachable(distances, 2), count_reachable(distances, 3)
+        (2, 3)
+        >>> count_reachable(distances, 3, exact=False)
+        5
+        """
+        adjacency = self.adjacency(passable, include_diagonals=include_diagonals)
+        flat = adjacency.distances(self.codec.encode_many(sources), max_steps)
+        return flat.reshape(self.data.shape)
+
     def __str__(self) -> str:
         return "\n".join("".join(value) for value in self.data)
 
     def __repr__(self) -> str:
         return f"Grid({self.data!r})"
 
+    def encode_value(self, value: Any) -> Any:
+        """How a value is stored in data."""
+        return value
+
     def mark(self, yx: Point | PointTuple, value: Any) -> Self:
         y, x = yx.to_tuple() if isinstance(yx, Point) else yx
         data = self.data.copy()
-        data[y, x] = value
+        data[y, x] = self.encode_value(value)
         return type(self)(data)
 
     def slice(self, top: int, bottom: int, left: int, right: int) -> Self:  # noqa: A003
         return type(self)(self.data[top:bottom, left:right])
 
+    # the orientations are views of the same data, with no copy
+
+    def transpose(self) -> Self:
+        return type(self)(self.data.T)
+
+    def rotate90(self, k: int = 1) -> Self:
+        """Rotate clockwise k times."""
+        return type(self)(np.rot90(self.data, -k))
+
+    def flip(self, axis: int = 1) -> Self:
+        """Mirror left to right (axis=1), or top to bottom (axis=0)."""
+        return type(self)(np.flip(self.data, axis))
+
+    def rows(self) -> Iterator[npt.NDArray[Any]]:
+        return iter(self.data)
+
+    def columns(self) -> Iterator[npt.NDArray[Any]]:
+        return iter(self.data.T)
+
     def neighbours(
         self, yx: Point | PointTuple, *, include_diagonals: bool = True
     ) -> list[Any]:
@@ -128,6 +422,408 @@ class Grid:
         return neighbours
 
 
+def count_reachable(
+    distances: npt.NDArray[np.int32], steps: int, *, exact: bool = True
+) -> int:
+    """
+    The number of cells of a distance map that can be reached in exactly steps
+    steps, by going back and forth (at the same parity, within steps),
+    or with exact=False, in at most steps steps.
+    """
+    reachable = (distances >= 0) & (distances <= steps)
+    if exact:
+        reachable &= distances % 2 == steps % 2
+    return int(reachable.sum())
+
+
+def count_reachable_by_distance(
+    counts: npt.NDArray[np.int64], steps: int, *, exact: bool = True
+) -> int:
+    """
+    Like count_reachable, from the number of cells at each distance
+    (see PeriodicGrid.distance_counts).
+
+    >>> count_reachable_by_distance(np.array([1, 2, 3, 4]), 2)
+    4
+    """
+    within = counts[: steps + 1]
+    if exact:
+        within = within[steps % 2 :: 2]
+    return int(within.sum())
+
+
+NEWLINE = ord("\n")
+# cells counted at once by ByteGrid.present_codes
+PRESENT_CODES_CHUNK = 1 << 24
+# bytes searched at once for the end of the first row
+FIRST_NEWLINE_CHUNK = 1 << 16
+
+
+def first_newline(flat: npt.NDArray[np.uint8]) -> int:
+    """
+    The index of the first newline, or the length if there is none,
+    without comparing the whole (possibly memory-mapped) buffer.
+
+    >>> first_newline(np.frombuffer(b"abc\\nde\\n", dtype=np.uint8))
+    3
+    """
+    for start in range(0, len(flat), FIRST_NEWLINE_CHUNK):
+        found = np.flatnonzero(flat[start : start + FIRST_NEWLINE_CHUNK] == NEWLINE)
+        if len(found):
+            return start + int(found[0])
+    return len(flat)
+
+
+def count_newlines(flat: npt.NDArray[np.uint8]) -> int:
+    return sum(
+        int(np.count_nonzero(flat[start : start + PRESENT_CODES_CHUNK] == NEWLINE))
+        for start in range(0, len(flat), PRESENT_CODES_CHUNK)
+    )
+
+
+def byte_code(value: str | int) -> int:
+    """
+    >>> byte_code("#"), byte_code(35)
+    (35, 35)
+    >>> byte_code("ab")
+    Traceback (most recent call last):
+    ...
+    ValueError: not a single byte: 'ab'
+    """
+    if isinstance(value, str):
+        encoded = value.encode("ascii")
+        if len(encoded) != 1:
+            raise ValueError(f"not a single byte: {value!r}")
+        return encoded[0]
+    if not 0 <= value < 256:  # noqa: PLR2004
+        raise ValueError(f"not a single byte: {value!r}")
+    return value
+
+
+class ByteGrid(Grid):
+    """
+    A grid of characters stored as uint8 byte codes (1 byte per cell, instead of
+    4 for a <U1 array), loaded straight from the bytes of the input.
+    Cells read back as characters. apply (and so map_values and map_some_values)
+    and where call their function once per distinct byte, not once per cell,
+    and then gather through a 256-entry lookup table.
+
+    >>> grid = ByteGrid.from_string("#.#\\n..S\\n")
+    >>> grid.data.dtype, grid.data.shape, grid[1, 2]
+    (dtype('uint8'), (2, 3), 'S')
+    >>> print(grid.map_values({"#": "X", ".": "o", "S": "S"}))
+    XoX
+    ooS
+    >>> print(grid.map_some_values({"S": "."}).where(lambda c: c == "#", "?"))
+    #?#
+    ???
+    >>> grid.find("S"), grid.neighbours(Point(0, 0), include_diagonals=False)
+    ([P(1, 2)], ['.', '.'])
+    """
+
+    @classmethod
+    def from_string(cls, data: str) -> Self:
+        return cls.from_bytes(data.encode("ascii"))
+
+    @classmethod
+    def from_bytes(cls, data: bytes | memoryview | npt.NDArray[np.uint8]) -> Self:
+        """
+        A read-only view of the bytes, without any copy: the rows are strided
+        over the buffer, skipping the newlines. The final newline is optional.
+
+        >>> grid = ByteGrid.from_bytes(b"ab\\ncd")
+        >>> str(grid), grid.data.strides, grid.data.base is not None
+        ('ab\\ncd', (3, 1), True)
+        >>> ByteGrid.from_bytes(b"ab\\nc\\n")
+        Traceback (most recent call last):
+        ...
+        ValueError: the rows have different lengths
+        """
+        flat = np.frombuffer(data, dtype=np.uint8)
+        # bytes search faster than arrays, which is what matters for small grids
+        if isinstance(data, bytes):
+            width = data.find(b"\n")
+            if width < 0:
+                width = len(data)
+            total_newlines = data.count(b"\n")
+        else:
+            width = first_newline(flat)
+            total_newlines = count_newlines(flat)
+        row_size = width + 1
+        height = -(-len(flat) // row_size)
+        newlines = flat[width::row_size]
+        # all the newlines are at the end of a row, and all the rows but the
+        # last end with one
+        if (
+            len(flat) not in [height * row_size, height * row_size - 1]
+            or len(newlines) != total_newlines
+            or (newlines != NEWLINE).any()
+        ):
+            raise ValueError("the rows have different lengths")
+        if len(flat) == height * row_size:
+            rows = flat.reshape(height, row_size)[:, :width]
+        else:
+            rows = np.lib.stride_tricks.as_strided(
+                flat, shape=(height, width), strides=(row_size, 1), writeable=False
+            )
+        return cls(rows)
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[bytes]) -> Self:
+        """
+        >>> print(ByteGrid.from_rows([b"ab", b"cd"]).rotate90())
+        ca
+        db
+        """
+        rows = list(rows)
+        flat = np.frombuffer(b"".join(rows), dtype=np.uint8)
+        return cls(flat.reshape(len(rows), -1))
+
+    @classmethod
+    def from_file(cls, path: str | os.PathLike[str]) -> Self:
+        """
+        Map the file into memory, so that a grid larger than the memory
+        can be used: pages of the file are only read when they are accessed.
+
+        >>> import tempfile
+        >>> with tempfile.NamedTemporaryFile("w", suffix=".txt") as f:
+        ...     _ = f.write("#.#\\n..S\\n")
+        ...     f.flush()
+        ...     ByteGrid.from_file(f.name).find("S")
+        [P(1, 2)]
+        """
+        return cls.from_bytes(np.memmap(path, dtype=np.uint8, mode="r"))
+
+    def __getitem__(self, item: Point | PointTuple) -> Any:
+        value = super().__getitem__(item)
+        if isinstance(value, np.integer):
+            return chr(value)
+        return value
+
+    def present_codes(self) -> list[int]:
+        # a few rows at a time, as ravel copies a strided view
+        counts = np.zeros(256, dtype=np.int64)
+        rows = max(1, PRESENT_CODES_CHUNK // max(1, self.data.shape[1]))
+        for start in range(0, self.data.shape[0], rows):
+            chunk = self.data[start : start + rows].ravel()
+            counts += np.bincount(chunk, minlength=256)
+        codes: list[int] = np.flatnonzero(counts).tolist()
+        return codes
+
+    def lookup_table(self, f: Callable[[str], Any], dtype: Any) -> npt.NDArray[Any]:
+        # only the bytes in the grid: f may not be defined for the others
+        table = np.zeros(256, dtype=dtype)
+        for code in self.present_codes():
+            table[code] = f(chr(code))
+        return table
+
+    def apply(self, f: Callable[[Any], Any]) -> Self:
+        """
+        f must map characters to characters, as the cells are stored as bytes
+        (Grid.apply keeps whatever f returns).
+
+        >>> ByteGrid.from_string("12\\n").apply(int)
+        Traceback (most recent call last):
+        ...
+        TypeError: ByteGrid.apply needs a character, got 1
+        """
+
+        def code(char: str) -> int:
+            value = f(char)
+            if not isinstance(value, str) or len(value) != 1:
+                raise TypeError(f"ByteGrid.apply needs a character, got {value!r}")
+            return byte_code(value)
+
+        table = self.lookup_table(code, np.uint8)
+        return type(self)(table[self.data])
+
+    def mask(self, f: Callable[[Any], Any]) -> npt.NDArray[np.bool_]:
+        mask: npt.NDArray[np.bool_] = self.lookup_table(f, np.bool_)[self.data]
+        return mask
+
+    def where(self, f: Callable[[Any], np.bool_], other: Any | Self) -> Self:
+        cond = self.mask(f)
+        other_data = other.data if isinstance(other, Grid) else byte_code(other)
+        return type(self)(np.where(cond, self.data, other_data))
+
+    def find(self, value: Any) -> list[Point]:
+        return [Point(*yx) for yx in np.argwhere(self.data == byte_code(value))]
+
+    def __str__(self) -> str:
+        return "\n".join(row.decode("ascii") for row in self.row_bytes())
+
+    def row_bytes(self) -> list[bytes]:
+        """
+        The rows as bytes, cut from one contiguous copy of the grid, which is
+        much cheaper than joining characters (e.g. for the columns of a view).
+
+        >>> grid = ByteGrid.from_string("ab\\ncd")
+        >>> grid.row_bytes(), grid.column_bytes(), grid.flip(0).row_bytes()
+        ([b'ab', b'cd'], [b'ac', b'bd'], [b'cd', b'ab'])
+        """
+        height, width = self.data.shape
+        if width == 0:
+            return [b""] * height
+        flat = np.ascontiguousarray(self.data).tobytes()
+        return [flat[start : start + width] for start in range(0, len(flat), width)]
+
+    def column_bytes(self) -> list[bytes]:
+        return self.transpose().row_bytes()
+
+    def __repr__(self) -> str:
+        return f"ByteGrid({str(self)!r})"
+
+    def encode_value(self, value: Any) -> Any:
+        return byte_code(value)
+
+    def neighbours(
+        self, yx: Point | PointTuple, *, include_diagonals: bool = True
+    ) -> list[Any]:
+        codes = super().neighbours(yx, include_diagonals=include_diagonals)
+        return [chr(code) for code in codes]
+
+
+class MutableGrid(Grid):
+    """
+    A grid that mark and mark_many change in place, for algorithms that
+    mark cells one at a time. The data is copied on the first write only
+    (copy-on-write): the array the grid was made from (e.g. by a derived view,
+    or from the input bytes) and the snapshots taken so far never change.
+
+    >>> grid = MutableGrid.from_string("...\\n...")
+    >>> source = grid.data
+    >>> grid.mark(Point(0, 0), "#") is grid
+    True
+    >>> snapshot = grid.snapshot()
+    >>> print(grid.mark_many([4, 5], "o"))
+    #..
+    .oo
+    >>> print(snapshot)
+    #..
+    ...
+    >>> str(source[0, 0]), type(snapshot).__name__
+    ('.', 'Grid')
+    """
+
+    snapshot_type: type[Grid] = Grid
+
+    def __init__(self, data: npt.NDArray[Any]):
+        super().__init__(data)
+        # until the first write, data may be shared with another grid
+        self._owns_data = False
+
+    def writable_data(self) -> npt.NDArray[Any]:
+        if not self._owns_data:
+            self.data = np.array(self.data, order="C")
+            self._owns_data = True
+        # the cached adjacencies may not hold after the write
+        self._adjacencies.clear()
+        return self.data
+
+    def mark(self, yx: Point | PointTuple, value: Any) -> Self:
+        y, x = yx.to_tuple() if isinstance(yx, Point) else yx
+        self.writable_data()[y, x] = self.encode_value(value)
+        return self
+
+    def mark_many(self, indices: npt.ArrayLike, value: Any) -> Self:
+        """Mark the cells at the flat indices (see codec) at once."""
+        flat = self.writable_data().reshape(-1)
+        flat[np.asarray(indices, dtype=np.int64)] = self.encode_value(value)
+        return self
+
+    def snapshot(self) -> Grid:
+        """
+        An immutable grid of the current state, in O(1): the next write
+        copies the data instead.
+        """
+        self._owns_data = False
+        return self.snapshot_type(self.data)
+
+
+class MutableByteGrid(MutableGrid, ByteGrid):
+    """
+    >>> grid = MutableByteGrid.from_string("..\\n..")
+    >>> snapshot = grid.snapshot()
+    >>> print(grid.mark_many(grid.codec.encode_many([Point(0, 1), Point(1, 0)]), "#"))
+    .#
+    #.
+    >>> type(snapshot).__name__, str(snapshot) == "..\\n.."
+    ('ByteGrid', True)
+    """
+
+    snapshot_type = ByteGrid
+
+
+# absolute coordinates of a periodic grid, packed into one int64 key:
+# both must be within +-KEY_OFFSET, and the shifted y must stay below 2**63
+KEY_SHIFT = 32
+KEY_OFFSET = 1 << 30
+KEY_MASK = (1 << KEY_SHIFT) - 1
+
+
+class PeriodicGrid:
+    """
+    The infinite plane tiled with copies of a base grid, without materialising
+    the tiles: the cell at (y, x) is the base's at (y mod height, x mod width).
+
+    >>> garden = PeriodicGrid(ByteGrid.from_string("S.\\n.#"))
+    >>> garden[Point(-1, 5)], garden[Point(4, 2)], garden.tile_of(Point(-1, 5))
+    ('#', 'S', (-1, 2))
+    >>> garden.distance_counts([Point(0, 0)], lambda c: c != "#", 6).tolist()
+    [1, 4, 4, 12, 8, 20, 12]
+    """
+
+    def __init__(self, base: Grid):
+        self.base = base
+        self.height, self.width = base.data.shape
+
+    def __getitem__(self, item: Point | PointTuple) -> Any:
+        y, x = item.to_tuple() if isinstance(item, Point) else item
+        return self.base[y % self.height, x % self.width]
+
+    def tile_of(self, p: Point) -> PointTuple:
+        return p.y // self.height, p.x // self.width
+
+    def distance_counts(
+        self,
+        sources: Iterable[Point],
+        passable: Callable[[Any], Any] | None = None,
+        max_steps: int = 0,
+    ) -> npt.NDArray[np.int64]:
+        """
+        Breadth-first search from the sources over the whole plane: the number
+        of cells at each distance from 0 to max_steps.
+        As the moves are reversible, the cells of the next layer are the
+        neighbours of the current layer that are not in it or the previous one,
+        so no set of all the visited cells is kept: the memory is in
+        the size of the frontier, whatever the radius.
+        """
+        if passable is None:
+            mask = np.ones(self.base.data.shape, dtype=np.bool_)
+        else:
+            mask = self.base.mask(passable)
+        frontier = np.unique([self.key(p.y, p.x) for p in sources]).astype(np.int64)
+        previous = np.empty(0, dtype=np.int64)
+        counts = np.zeros(max_steps + 1, dtype=np.int64)
+        counts[0] = len(frontier)
+        for step in range(1, max_steps + 1):
+            y = (frontier >> KEY_SHIFT) - KEY_OFFSET
+            x = (frontier & KEY_MASK) - KEY_OFFSET
+            ys = np.concatenate([y - 1, y + 1, y, y])
+            xs = np.concatenate([x, x, x - 1, x + 1])
+            is_passable = mask[ys % self.height, xs % self.width]
+            neighbours = np.unique(self.key(ys[is_passable], xs[is_passable]))
+            layer = np.setdiff1d(neighbours, frontier, assume_unique=True)
+            layer = np.setdiff1d(layer, previous, assume_unique=True)
+            previous, frontier = frontier, layer
+            counts[step] = len(frontier)
+        return counts
+
+    @staticmethod
+    def key(y: Any, x: Any) -> Any:
+        return ((y + KEY_OFFSET) << KEY_SHIFT) | (x + KEY_OFFSET)
+
+
 if __name__ == "__main__":
     from aocd import get_data  # type: ignore[attr-defined]
 
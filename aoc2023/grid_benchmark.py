@@ -0,0 +1,337 @@
+# micro-benchmarks of the grid primitives (Point, PointCodec, the grids and
+# their adjacency), in operations per second, for a range of grid sizes.
+
+import argparse
+import json
+import random
+import sys
+import timeit
+from collections.abc import Callable
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any
+
+from aoc2023.grid import (
+    ByteGrid,
+    Grid,
+    MutableByteGrid,
+    PeriodicGrid,
+    Point,
+    PointCodec,
+)
+
+DEFAULT_SIZES = [10, 100, 1000]
+# an ops/sec this much below the baseline's is a regression
+DEFAULT_TOLERANCE = 0.3
+# the minimum time of each of the repeated measurements of a case
+MIN_TIME_S = 0.05
+# the best of this many measurements, as timeit's command line does
+DEFAULT_REPEAT = 5
+
+
+def random_map(size: int, seed: int = 0) -> str:
+    """A size x size map of "." and "#", with an "S" in the middle."""
+    rng = random.Random(seed)
+    rows = [[rng.choice("....#") for _ in range(size)] for _ in range(size)]
+    rows[size // 2][size // 2] = "S"
+    return "".join("".join(row) + "\n" for row in rows)
+
+
+def grid_namespace(size: int) -> dict[str, Any]:
+    data = random_map(size)
+    grid = Grid.from_string(data)
+    byte_grid = ByteGrid.from_string(data)
+    middle = Point(size // 2, size // 2)
+    return {
+        "size": size,
+        "data": data,
+        "grid": grid,
+        "byte_grid": byte_grid,
+        "mutable": MutableByteGrid.from_string(data),
+        "periodic": PeriodicGrid(byte_grid),
+        "codec": byte_grid.codec,
+        "adjacency": byte_grid.adjacency(is_open),
+        "p": middle,
+        "yx": middle.to_tuple(),
+        "i": byte_grid.codec.encode(middle),
+        "far": Point(-3 * size, 5 * size),
+        "indices": list(range(0, size * size, 7)),
+        "m": {".": "o", "#": "X", "S": "S"},
+        "is_open": is_open,
+        "ByteGrid": ByteGrid,
+        "Grid": Grid,
+    }
+
+
+def point_namespace(_size: int) -> dict[str, Any]:
+    p, q = Point(3, 4), Point(-1, 2)
+    return {
+        "p": p,
+        "q": q,
+        "points": {Point(y, x) for y in range(10) for x in range(10)},
+        "point_list": [Point(y, x) for y in range(10) for x in range(10)],
+        "indices": list(range(0, 10_000, 100)),
+        "codec": PointCodec(100, 100),
+        "i": 5050,
+        "j": 9999,
+        "Point": Point,
+    }
+
+
+def is_open(char: str) -> bool:
+    return char != "#"
+
+
+@dataclass
+class Case:
+    name: str
+    stmt: str
+    namespace: Callable[[int], dict[str, Any]]
+    # whether the cost depends on the grid size
+    sized: bool = True
+
+
+CASES = [
+    Case("Point()", "Point(3, 4)", point_namespace, sized=False),
+    Case("Point.__add__", "p + q", point_namespace, sized=False),
+    Case("Point.__sub__", "p - q", point_namespace, sized=False),
+    Case("Point.__mul__", "p * 3", point_namespace, sized=False),
+    Case("Point.__rmul__", "3 * p", point_namespace, sized=False),
+    Case("Point.up", "p.up()", point_namespace, sized=False),
+    Case("Point.down", "p.down()", point_namespace, sized=False),
+    Case("Point.left", "p.left()", point_namespace, sized=False),
+    Case("Point.right", "p.right()", point_namespace, sized=False),
+    Case("Point.__repr__", "repr(p)", point_namespace, sized=False),
+    Case("Point.to_tuple", "p.to_tuple()", point_namespace, sized=False),
+    Case("Point.__hash__", "hash(p)", point_namespace, sized=False),
+    Case("Point in set", "p in points", point_namespace, sized=False),
+    Case("Point.manhattan", "p.manhattan_distance(q)", point_namespace, sized=False),
+    Case("Point.to_area", "p.to_area(expand=1)", point_namespace, sized=False),
+    Case("PointCodec.encode", "codec.encode(p)", point_namespace, sized=False),
+    Case("PointCodec.decode", "codec.decode(i)", point_namespace, sized=False),
+    Case("PointCodec.neighbours", "codec.neighbours(i)", point_namespace, sized=False),
+    Case("PointCodec.in_bounds", "codec.in_bounds(p)", point_namespace, sized=False),
+    Case("PointCodec.up", "codec.up(i)", point_namespace, sized=False),
+    Case("PointCodec.down", "codec.down(i)", point_namespace, sized=False),
+    Case("PointCodec.left", "codec.left(i)", point_namespace, sized=False),
+    Case("PointCodec.right", "codec.right(i)", point_namespace, sized=False),
+    Case(
+        "PointCodec.manhattan",
+        "codec.manhattan_distance(i, j)",
+        point_namespace,
+        sized=False,
+    ),
+    Case(
+        "PointCodec.encode_many",
+        "codec.encode_many(point_list)",
+        point_namespace,
+        sized=False,
+    ),
+    Case(
+        "PointCodec.decode_many",
+        "codec.decode_many(indices)",
+        point_namespace,
+        sized=False,
+    ),
+    Case("Grid.from_string", "Grid.from_string(data)", grid_namespace),
+    Case("Grid[Point]", "grid[p]", grid_namespace),
+    Case("Grid[tuple]", "grid[yx]", grid_namespace),
+    Case("Grid.in_bounds", "grid.in_bounds(p)", grid_namespace),
+    Case("Grid.codec", "grid.codec", grid_namespace),
+    Case("Grid.find", "grid.find('S')", grid_namespace),
+    Case("Grid.neighbours diag", "grid.neighbours(p)", grid_namespace),
+    Case(
+        "Grid.neighbours orth",
+        "grid.neighbours(p, include_diagonals=False)",
+        grid_namespace,
+    ),
+    Case("Grid.apply", "grid.apply(str.upper)", grid_namespace),
+    Case("Grid.map_values", "grid.map_values(m)", grid_namespace),
+    Case("Grid.map_some_values", "grid.map_some_values(m)", grid_namespace),
+    Case("Grid.where", "grid.where(is_open, 'X')", grid_namespace),
+    Case("Grid.mask", "grid.mask(is_open)", grid_namespace),
+    Case("Grid.__str__", "str(grid)", grid_namespace),
+    Case("Grid.mark", "grid.mark(p, 'o')", grid_namespace),
+    Case("Grid.slice", "grid.slice(0, 5, 0, 5)", grid_namespace),
+    Case("Grid.transpose", "grid.transpose()", grid_namespace),
+    Case("Grid.rotate90", "grid.rotate90()", grid_namespace),
+    Case("Grid.flip", "grid.flip()", grid_namespace),
+    Case("Grid.rows", "for row in grid.rows(): pass", grid_namespace),
+    Case("Grid.columns", "for column in grid.columns(): pass", grid_namespace),
+    # on a new grid each time, so the adjacency is built and not cached
+    Case("Grid.adjacency", "Grid(grid.data).adjacency(is_open)", grid_namespace),
+    Case("Grid.neighbours_of", "grid.neighbours_of(indices)", grid_namespace),
+    Case(
+        "Grid.distance_map",
+        "Grid(grid.data).distance_map([p], is_open)",
+        grid_namespace,
+    ),
+    Case("ByteGrid.from_string", "ByteGrid.from_string(data)", grid_namespace),
+    Case("ByteGrid[Point]", "byte_grid[p]", grid_namespace),
+    Case("ByteGrid.find", "byte_grid.find('S')", grid_namespace),
+    Case("ByteGrid.map_values", "byte_grid.map_values(m)", grid_namespace),
+    Case("ByteGrid.where", "byte_grid.where(is_open, 'X')", grid_namespace),
+    Case("ByteGrid.mask", "byte_grid.mask(is_open)", grid_namespace),
+    Case("ByteGrid.__str__", "str(byte_grid)", grid_namespace),
+    Case("ByteGrid.mark", "byte_grid.mark(p, 'o')", grid_namespace),
+    Case("ByteGrid.row_bytes", "byte_grid.row_bytes()", grid_namespace),
+    Case("ByteGrid.column_bytes", "byte_grid.column_bytes()", grid_namespace),
+    Case("ByteGrid.neighbours", "byte_grid.neighbours(p)", grid_namespace),
+    Case(
+        "ByteGrid.adjacency",
+        "ByteGrid(byte_grid.data).adjacency(is_open)",
+        grid_namespace,
+    ),
+    Case(
+        "ByteGrid.distance_map",
+        "ByteGrid(byte_grid.data).distance_map([p], is_open)",
+        grid_namespace,
+    ),
+    Case("GridAdjacency.neighbours", "adjacency.neighbours(i)", grid_namespace),
+    Case(
+        "GridAdjacency.neighbours_of",
+        "adjacency.neighbours_of(indices)",
+        grid_namespace,
+    ),
+    Case("GridAdjacency.distances", "adjacency.distances([i])", grid_namespace),
+    Case("MutableByteGrid.mark", "mutable.mark(p, 'o')", grid_namespace),
+    Case(
+        "MutableByteGrid.mark_many", "mutable.mark_many(indices, 'o')", grid_namespace
+    ),
+    Case("MutableByteGrid.snapshot", "mutable.snapshot()", grid_namespace),
+    Case("PeriodicGrid[Point]", "periodic[far]", grid_namespace),
+    Case("PeriodicGrid.tile_of", "periodic.tile_of(far)", grid_namespace),
+    Case(
+        "PeriodicGrid.distance_counts",
+        "periodic.distance_counts([p], is_open, max_steps=size)",
+        grid_namespace,
+    ),
+]
+
+
+@dataclass
+class MicroResult:
+    name: str
+    size: int | None
+    ops_per_sec: float
+
+    @property
+    def key(self) -> str:
+        return self.name if self.size is None else f"{self.name}@{self.size}"
+
+
+def measure(case: Case, size: int | None, repeat: int = DEFAULT_REPEAT) -> MicroResult:
+    """
+    Time the statement in a loop (timeit's, so there is no function call
+    overhead per operation), for at least MIN_TIME_S, repeat times.
+    The fastest run is the least disturbed by the rest of the machine.
+    """
+    timer = timeit.Timer(case.stmt, globals=case.namespace(size or 0))
+    number, seconds = timer.autorange()
+    while seconds < MIN_TIME_S:
+        number *= 2
+        seconds = timer.timeit(number)
+    best = min([seconds, *timer.repeat(repeat - 1, number)])
+    return MicroResult(case.name, size, number / best)
+
+
+def run_cases(
+    cases: list[Case], sizes: list[int], repeat: int = DEFAULT_REPEAT
+) -> list[MicroResult]:
+    results = []
+    for case in cases:
+        for size in sizes if case.sized else [None]:
+            result = measure(case, size, repeat)
+            print_result(result)
+            results.append(result)
+    return results
+
+
+def print_result(result: MicroResult) -> None:
+    size = "" if result.size is None else str(result.size)
+    print(
+        f"{result.name:<30} {size:>6} {result.ops_per_sec:14,.0f} ops/s "
+        f"{1e9 / result.ops_per_sec:14,.0f} ns/op"
+    )
+
+
+def find_regressions(
+    results: list[MicroResult], baseline: dict[str, float], tolerance: float
+) -> list[str]:
+    """
+    >>> results = [MicroResult("a", None, 60.0), MicroResult("b", 10, 100.0)]
+    >>> find_regressions(results, {"a": 100.0, "b@10": 100.0, "c": 1.0}, 0.3)
+    ['a: 60 ops/s, was 100 ops/s (-40%)']
+    """
+    regressions = []
+    for result in results:
+        expected = baseline.get(result.key)
+        if expected is None:
+            continue
+        if result.ops_per_sec < expected * (1 - tolerance):
+            change = result.ops_per_sec / expected - 1
+            regressions.append(
+                f"{result.key}: {result.ops_per_sec:,.0f} ops/s, "
+                f"was {expected:,.0f} ops/s ({change:+.0%})"
+            )
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Micro-benchmark the grid primitives, in operations per second."
+    )
+    parser.add_argument(
+        "-k", "--filter", default="", help="only run the cases whose name contains this"
+    )
+    parser.add_argument(
+        "-s",
+        "--sizes",
+        type=int,
+        nargs="+",
+        default=DEFAULT_SIZES,
+        help="side lengths of the square grids",
+    )
+    parser.add_argument(
+        "--baseline",
+        type=Path,
+        help="fail if an ops/sec is more than --tolerance below this file's",
+    )
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE)
+    parser.add_argument(
+        "-r",
+        "--repeat",
+        type=int,
+        default=DEFAULT_REPEAT,
+        help="measurements per case, of which the fastest is kept",
+    )
+    parser.add_argument(
+        "-o", "--output", type=Path, help="write the results (a baseline) as JSON"
+    )
+    args = parser.parse_args()
+
+    cases = [case for case in CASES if args.filter in case.name]
+    results = run_cases(cases, args.sizes, args.repeat)
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(
+            json.dumps(
+                {
+                    "ops_per_sec": {r.key: r.ops_per_sec for r in results},
+                    "results": [asdict(r) for r in results],
+                },
+                indent=2,
+            )
+            + "\n"
+        )
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text())["ops_per_sec"]
+        regressions = find_regressions(results, baseline, args.tolerance)
+        if regressions:
+            print("\nRegressions:")
+            print("\n".join(regressions))
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
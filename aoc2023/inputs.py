@@ -0,0 +1,180 @@
+# a local, content-addressed store of puzzle inputs:
+# inputs are stored once as objects/<sha256>, and index.json maps "year/day" to it.
+# reads are hash-checked, then served from an in-process cache.
+
+import argparse
+import functools
+import hashlib
+import json
+import os
+import re
+from pathlib import Path
+
+DEFAULT_STORE_DIR = Path("~", ".cache", "aoc2023", "inputs")
+DEFAULT_YEAR = 2023
+# matches "5.txt", "d05.txt", "day5.txt" and aocd's cache files "2023_05_input.txt"
+INPUT_FILENAME_RE = re.compile(
+    r"(?:(?P<year>\d{4})_)?(?:day|d)?(?P<day>\d{1,2})(?:_input)?\.txt"
+)
+
+
+def content_hash(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def normalize(data: str) -> str:
+    """
+    Inputs are stored as aocd returns them, without the trailing newline.
+
+    >>> normalize("1\\n2\\r\\n")
+    '1\\n2'
+    """
+    return data.rstrip("\r\n")
+
+
+class InputStore:
+    """
+    >>> import tempfile
+    >>> with tempfile.TemporaryDirectory() as tmp_dir:
+    ...     store = InputStore(Path(tmp_dir))
+    ...     digest = store.put(2023, 1, "1abc2\\n")
+    ...     print(InputStore(Path(tmp_dir)).get(2023, 1), store.get(2023, 2))
+    1abc2 None
+
+    Stores of the same directory, e.g. in other processes, keep each other's puts:
+
+    >>> with tempfile.TemporaryDirectory() as tmp_dir:
+    ...     store, other = InputStore(Path(tmp_dir)), InputStore(Path(tmp_dir))
+    ...     store.hash_of(2023, 1), other.hash_of(2023, 1)
+    ...     _ = store.put(2023, 1, "1"), other.put(2023, 2, "2")
+    ...     sorted(InputStore(Path(tmp_dir)).index())
+    (None, None)
+    ['2023/1', '2023/2']
+    """
+
+    def __init__(self, root: Path):
+        self.root = root
+        self._cache: dict[tuple[int, int], str] = {}
+        # read once per store, and kept up to date by put
+        self._index: dict[str, str] | None = None
+
+    @property
+    def index_path(self) -> Path:
+        return self.root / "index.json"
+
+    @property
+    def objects_dir(self) -> Path:
+        return self.root / "objects"
+
+    def read_index(self) -> dict[str, str]:
+        try:
+            index: dict[str, str] = json.loads(self.index_path.read_text())
+        except FileNotFoundError:
+            return {}
+        return index
+
+    def _loaded_index(self) -> dict[str, str]:
+        if self._index is None:
+            self._index = self.read_index()
+        return self._index
+
+    def index(self) -> dict[str, str]:
+        return dict(self._loaded_index())
+
+    def hash_of(self, year: int, day: int) -> str | None:
+        return self._loaded_index().get(f"{year}/{day}")
+
+    def path(self, year: int, day: int) -> Path | None:
+        digest = self.hash_of(year, day)
+        return None if digest is None else self.objects_dir / digest
+
+    def get(self, year: int, day: int) -> str | None:
+        if (year, day) in self._cache:
+            return self._cache[year, day]
+        digest = self.hash_of(year, day)
+        if digest is None:
+            return None
+        path = self.objects_dir / digest
+        data = path.read_bytes()
+        if content_hash(data) != digest:
+            raise ValueError(f"corrupted input for {year}/{day}: {path}")
+        self._cache[year, day] = data.decode()
+        return self._cache[year, day]
+
+    def put(self, year: int, day: int, data: str) -> str:
+        data = normalize(data)
+        data_bytes = data.encode()
+        digest = content_hash(data_bytes)
+        path = self.objects_dir / digest
+        if not path.exists():
+            self.objects_dir.mkdir(parents=True, exist_ok=True)
+            atomic_write(path, data_bytes)
+        # from the disk, not the cached copy: other processes may have added
+        # inputs since, and writing a stale copy would drop them
+        index = self.read_index()
+        if index.get(f"{year}/{day}") != digest:
+            index[f"{year}/{day}"] = digest
+            atomic_write(self.index_path, (json.dumps(index, indent=2) + "\n").encode())
+        self._index = index
+        self._cache[year, day] = data
+        return digest
+
+    def import_dir(self, directory: Path, year: int = DEFAULT_YEAR) -> dict[int, str]:
+        imported = {}
+        for path in sorted(directory.iterdir()):
+            match = INPUT_FILENAME_RE.fullmatch(path.name)
+            if match is None or not path.is_file():
+                continue
+            if match["year"] is not None and int(match["year"]) != year:
+                continue
+            day = int(match["day"])
+            imported[day] = self.put(year, day, path.read_text())
+        return imported
+
+
+def atomic_write(path: Path, data: bytes) -> None:
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    tmp_path.write_bytes(data)
+    tmp_path.replace(path)
+
+
+def default_store_dir() -> Path:
+    return Path(os.environ.get("AOC2023_INPUTS_DIR", DEFAULT_STORE_DIR)).expanduser()
+
+
+@functools.cache
+def default_store() -> InputStore:
+    return InputStore(default_store_dir())
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Manage the local input store.")
+    parser.add_argument(
+        "--store",
+        type=Path,
+        default=None,
+        help="store directory (default: $AOC2023_INPUTS_DIR, ~/.cache/aoc2023/inputs)",
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    import_parser = subparsers.add_parser(
+        "import", help="import inputs from a directory of files"
+    )
+    import_parser.add_argument("directory", type=Path)
+    import_parser.add_argument("--year", type=int, default=DEFAULT_YEAR)
+    subparsers.add_parser("list", help="list the stored inputs")
+    args = parser.parse_args()
+
+    store = InputStore(args.store) if args.store else default_store()
+    match args.command:
+        case "import":
+            imported = store.import_dir(args.directory, args.year)
+            for day, digest in imported.items():
+                print(f"{args.year}/{day}: {digest}")
+            print(f"imported {len(imported)} inputs into {store.root}")
+        case "list":
+            for key, digest in store.index().items():
+                print(f"{key}: {digest}")
+
+
+if __name__ == "__main__":
+    main()
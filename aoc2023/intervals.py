@@ -0,0 +1,235 @@
+# sets of integer intervals and of boxes, as arrays of bounds rather than
+# an object per interval: splitting, shifting and combining them are array
+# operations, however many intervals there are. bounds are half-open, [start, end).
+
+from collections.abc import Iterator
+from dataclasses import dataclass
+from typing import Self
+
+import numpy as np
+import numpy.typing as npt
+
+Int64Array = npt.NDArray[np.int64]
+
+
+def spread(counts: Int64Array) -> tuple[Int64Array, Int64Array]:
+    """
+    For groups of the given sizes: the group of each element, and its
+    position within the group.
+
+    >>> owners, positions = spread(np.array([2, 0, 3]))
+    >>> owners.tolist(), positions.tolist()
+    ([0, 0, 2, 2, 2], [0, 1, 0, 1, 2])
+    """
+    owners = np.repeat(np.arange(len(counts)), counts)
+    first_of_owner = np.cumsum(counts) - counts
+    return owners, np.arange(counts.sum()) - first_of_owner[owners]
+
+
+@dataclass(frozen=True)
+class IntervalSet:
+    """
+    Sorted, disjoint, non-empty intervals (that may touch, after a split).
+    from_intervals makes the canonical set: sorted and merged.
+
+    >>> intervals = IntervalSet.from_intervals([5, 0, 3], [8, 2, 6])
+    >>> intervals, intervals.measure(), intervals.lowest()
+    (IntervalSet([(0, 2), (3, 8)]), 7, 0)
+    >>> intervals.split([1, 4, 5])
+    IntervalSet([(0, 1), (1, 2), (3, 4), (4, 5), (5, 8)])
+    >>> intervals.shift(10)
+    IntervalSet([(10, 12), (13, 18)])
+    """
+
+    starts: Int64Array
+    ends: Int64Array
+
+    @classmethod
+    def from_intervals(cls, starts: npt.ArrayLike, ends: npt.ArrayLike) -> Self:
+        """Sort the intervals, drop the empty ones and merge the overlapping ones."""
+        starts = np.asarray(starts, dtype=np.int64)
+        ends = np.asarray(ends, dtype=np.int64)
+        non_empty = starts < ends
+        starts, ends = starts[non_empty], ends[non_empty]
+        if not len(starts):
+            return cls.empty()
+        order = np.argsort(starts, kind="stable")
+        starts, ends = starts[order], ends[order]
+        # an interval starts a new merged one if it begins after all the previous end
+        reach = np.maximum.accumulate(ends)
+        is_first = np.ones(len(starts), dtype=np.bool_)
+        is_first[1:] = starts[1:] > reach[:-1]
+        last = np.flatnonzero(np.append(is_first[1:], True))
+        return cls(starts[is_first], reach[last])
+
+    @classmethod
+    def from_lengths(cls, starts: npt.ArrayLike, lengths: npt.ArrayLike) -> Self:
+        starts = np.asarray(starts, dtype=np.int64)
+        return cls.from_intervals(starts, starts + np.asarray(lengths, dtype=np.int64))
+
+    @classmethod
+    def empty(cls) -> Self:
+        return cls(np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64))
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def __iter__(self) -> Iterator[tuple[int, int]]:
+        return zip(self.starts.tolist(), self.ends.tolist(), strict=True)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({list(self)})"
+
+    def measure(self) -> int:
+        """The number of integers in the set."""
+        return int((self.ends - self.starts).sum())
+
+    def lowest(self) -> int:
+        return int(self.starts[0])
+
+    def split(self, points: npt.ArrayLike) -> Self:
+        """Cut the intervals at every point that is inside one."""
+        points = np.unique(np.asarray(points, dtype=np.int64))
+        if not len(points):
+            return self
+        # the points inside interval i are points[first[i]:first[i] + inside[i]]
+        first = np.searchsorted(points, self.starts, side="right")
+        inside = np.searchsorted(points, self.ends, side="left") - first
+        owners, positions = spread(inside + 1)
+        cut_before = first[owners] + positions - 1
+        cut_after = first[owners] + positions
+        last = len(points) - 1
+        starts = np.where(
+            positions == 0,
+            self.starts[owners],
+            points[np.clip(cut_before, 0, last)],
+        )
+        ends = np.where(
+            positions == inside[owners],
+            self.ends[owners],
+            points[np.clip(cut_after, 0, last)],
+        )
+        return type(self)(starts, ends)
+
+    def shift(self, offsets: int | npt.ArrayLike) -> Self:
+        """Move all the intervals, or each by its own offset."""
+        offsets = np.asarray(offsets, dtype=np.int64)
+        if offsets.ndim == 0:
+            return type(self)(self.starts + offsets, self.ends + offsets)
+        return type(self).from_intervals(self.starts + offsets, self.ends + offsets)
+
+    def remap(
+        self, starts: npt.ArrayLike, ends: npt.ArrayLike, offsets: npt.ArrayLike
+    ) -> Self:
+        """
+        Move the values in each of the disjoint source intervals [starts, ends)
+        by its offset, and keep the rest of the values in place.
+
+        >>> IntervalSet.from_intervals([0], [100]).remap([98, 50], [100, 98], [-48, 2])
+        IntervalSet([(0, 100)])
+        >>> IntervalSet.from_intervals([79], [93]).remap([98, 50], [100, 98], [-48, 2])
+        IntervalSet([(81, 95)])
+        >>> IntervalSet.from_intervals([0], [5]).remap([], [], [])
+        IntervalSet([(0, 5)])
+        """
+        starts = np.asarray(starts, dtype=np.int64)
+        if not len(starts):
+            return self
+        ends = np.asarray(ends, dtype=np.int64)
+        offsets = np.asarray(offsets, dtype=np.int64)
+        order = np.argsort(starts)
+        starts, ends, offsets = starts[order], ends[order], offsets[order]
+        pieces = self.split(np.concatenate([starts, ends]))
+        # after the split, a piece is either inside a source interval or outside all
+        source = np.searchsorted(starts, pieces.starts, side="right") - 1
+        inside = (source >= 0) & (pieces.starts < ends[np.maximum(source, 0)])
+        return pieces.shift(np.where(inside, offsets[np.maximum(source, 0)], 0))
+
+    def _combine(self, other: "IntervalSet", keep: list[int]) -> Self:
+        # sweep the bounds of both sets, with self counting 1 and other 2,
+        # and keep the stretches with a total in keep
+        positions = np.concatenate([self.starts, self.ends, other.starts, other.ends])
+        deltas = np.concatenate(
+            [
+                np.ones(len(self), dtype=np.int64),
+                -np.ones(len(self), dtype=np.int64),
+                np.full(len(other), 2, dtype=np.int64),
+                np.full(len(other), -2, dtype=np.int64),
+            ]
+        )
+        bounds, where = np.unique(positions, return_inverse=True)
+        coverage = np.cumsum(np.bincount(where, weights=deltas, minlength=len(bounds)))
+        kept = np.isin(coverage[:-1].astype(np.int64), keep)
+        return type(self).from_intervals(bounds[:-1][kept], bounds[1:][kept])
+
+    def union(self, other: "IntervalSet") -> Self:
+        """
+        >>> a = IntervalSet.from_intervals([0, 10], [5, 15])
+        >>> b = IntervalSet.from_intervals([3, 20], [12, 25])
+        >>> a.union(b)
+        IntervalSet([(0, 15), (20, 25)])
+        >>> a.intersect(b)
+        IntervalSet([(3, 5), (10, 12)])
+        >>> a.difference(b)
+        IntervalSet([(0, 3), (12, 15)])
+        """
+        return self._combine(other, [1, 2, 3])
+
+    def intersect(self, other: "IntervalSet") -> Self:
+        return self._combine(other, [3])
+
+    def difference(self, other: "IntervalSet") -> Self:
+        return self._combine(other, [1])
+
+
+@dataclass(frozen=True)
+class BoxSet:
+    """
+    Disjoint N-dimensional boxes: box i spans [lows[i, d], highs[i, d])
+    in each dimension d.
+
+    >>> boxes = BoxSet.full(2, 0, 10)
+    >>> below, above = boxes.split(0, 4)
+    >>> below.volume(), above.volume(), len(BoxSet.concat([below, above]))
+    (40, 60, 2)
+    >>> left, right = above.split(1, 0)
+    >>> len(left), len(right)
+    (0, 1)
+    """
+
+    lows: Int64Array
+    highs: Int64Array
+
+    @classmethod
+    def full(cls, dimensions: int, low: int, high: int) -> Self:
+        return cls(
+            np.full((1, dimensions), low, dtype=np.int64),
+            np.full((1, dimensions), high, dtype=np.int64),
+        )
+
+    @classmethod
+    def concat(cls, box_sets: list[Self]) -> Self:
+        return cls(
+            np.concatenate([boxes.lows for boxes in box_sets]),
+            np.concatenate([boxes.highs for boxes in box_sets]),
+        )
+
+    def __len__(self) -> int:
+        return len(self.lows)
+
+    def volume(self) -> int:
+        """The number of integer points in the boxes."""
+        return int(np.prod(self.highs - self.lows, axis=1).sum())
+
+    def split(self, axis: int, value: int) -> tuple[Self, Self]:
+        """Cut all the boxes along axis, into the parts below value and the rest."""
+        below_highs = self.highs.copy()
+        below_highs[:, axis] = np.minimum(below_highs[:, axis], value)
+        above_lows = self.lows.copy()
+        above_lows[:, axis] = np.maximum(above_lows[:, axis], value)
+        is_below = self.lows[:, axis] < below_highs[:, axis]
+        is_above = above_lows[:, axis] < self.highs[:, axis]
+        return (
+            type(self)(self.lows[is_below], below_highs[is_below]),
+            type(self)(above_lows[is_above], self.highs[is_above]),
+        )
@@ -0,0 +1,187 @@
+# bounded memoisation: least recently used caches with a budget of entries
+# and/or (shallow) bytes, that count their hits, misses and evictions.
+# every cache is registered by name, so a benchmark can report them all,
+# along with the counts recorded from functools caches on hot paths.
+
+import contextlib
+import sys
+from collections import OrderedDict
+from collections.abc import Hashable, Iterator
+from dataclasses import dataclass
+from typing import Any, Generic, Protocol, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+DEFAULT_MAX_ENTRIES = 1 << 20
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    size: int = 0
+    peak_size: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def __str__(self) -> str:
+        return (
+            f"{self.hits} hits | {self.misses} misses | {self.hit_rate:6.1%} hit rate"
+            f" | {self.evictions} evictions | {self.peak_size} peak entries"
+        )
+
+
+class CacheInfo(Protocol):
+    """What record_cache_info reads of functools' cache_info()."""
+
+    @property
+    def hits(self) -> int: ...
+
+    @property
+    def misses(self) -> int: ...
+
+    @property
+    def currsize(self) -> int: ...
+
+
+_caches: dict[str, "BoundedCache[Any, Any]"] = {}
+# the stats of functools caches, see record_cache_info
+_recorded: dict[str, CacheStats] = {}
+
+
+class BoundedCache(Generic[K, V]):
+    """
+    A mapping that evicts its least recently used entries beyond max_entries,
+    or beyond max_bytes of keys and values (measured with sys.getsizeof,
+    so not counting what they refer to). None cannot be a value.
+
+    >>> cache = BoundedCache("doctest", max_entries=2)
+    >>> cache.put("a", 1); cache.put("b", 2)
+    >>> cache.get("a"), cache.get("c")
+    (1, None)
+    >>> cache.put("c", 3)
+    >>> cache.get("b"), cache.get("a"), len(cache)
+    (None, 1, 2)
+    >>> str(cache.stats)
+    '2 hits | 2 misses |  50.0% hit rate | 1 evictions | 2 peak entries'
+    """
+
+    def __init__(
+        self,
+        name: str,
+        max_entries: int | None = DEFAULT_MAX_ENTRIES,
+        max_bytes: int | None = None,
+    ):
+        self.name = name
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[K, V] = OrderedDict()
+        self._bytes = 0
+        # plain counters in the hot path, gathered into a CacheStats on demand
+        self.hits = self.misses = self.evictions = self.peak_size = 0
+        _caches[name] = self
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def stats(self) -> CacheStats:
+        return CacheStats(
+            self.hits, self.misses, self.evictions, len(self), self.peak_size
+        )
+
+    def reset_stats(self) -> None:
+        self.hits = self.misses = self.evictions = 0
+        self.peak_size = len(self)
+
+    def get(self, key: K) -> V | None:
+        value = self._entries.get(key)
+        if value is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._entries.move_to_end(key)
+        return value
+
+    def put(self, key: K, value: V) -> None:
+        entries = self._entries
+        if self.max_bytes is not None:
+            old_value = entries.get(key)
+            if old_value is not None:
+                self._bytes -= entry_size(key, old_value)
+            self._bytes += entry_size(key, value)
+        entries[key] = value
+        entries.move_to_end(key)
+        if len(entries) > self.peak_size:
+            if self.max_entries is not None and len(entries) > self.max_entries:
+                self.evict()
+            self.peak_size = max(self.peak_size, len(entries))
+        if self.max_bytes is not None and self._bytes > self.max_bytes:
+            self.evict()
+
+    def evict(self) -> None:
+        """Drop the least recently used entries until the cache is within budget."""
+        while self._entries and (
+            (self.max_entries is not None and len(self._entries) > self.max_entries)
+            or (self.max_bytes is not None and self._bytes > self.max_bytes)
+        ):
+            key, value = self._entries.popitem(last=False)
+            if self.max_bytes is not None:
+                self._bytes -= entry_size(key, value)
+            self.evictions += 1
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._bytes = 0
+
+    @contextlib.contextmanager
+    def scope(self) -> Iterator[None]:
+        """Start the block with an empty cache, and empty it after."""
+        self.clear()
+        try:
+            yield
+        finally:
+            self.clear()
+
+
+def entry_size(key: object, value: object) -> int:
+    return sys.getsizeof(key) + sys.getsizeof(value)
+
+
+def record_cache_info(name: str, info: CacheInfo) -> None:
+    """
+    Add the counts of a functools cache, from its cache_info() once it is
+    done with, to the stats reported under name. The hot path then keeps
+    the C implementation, and is counted once rather than on every call.
+
+    >>> import functools
+    >>> @functools.lru_cache(maxsize=3)
+    ... def fibonacci(n):
+    ...     return n if n < 2 else fibonacci(n - 1) + fibonacci(n - 2)
+    >>> fibonacci(50)
+    12586269025
+    >>> record_cache_info("doctest.fibonacci", fibonacci.cache_info())
+    >>> str(cache_stats()["doctest.fibonacci"])
+    '48 hits | 51 misses |  48.5% hit rate | 48 evictions | 3 peak entries'
+    """
+    stats = _recorded.setdefault(name, CacheStats())
+    stats.hits += info.hits
+    stats.misses += info.misses
+    # every miss adds an entry
+    stats.evictions += info.misses - info.currsize
+    stats.peak_size = max(stats.peak_size, info.currsize)
+
+
+def cache_stats() -> dict[str, CacheStats]:
+    return {name: cache.stats for name, cache in _caches.items()} | _recorded
+
+
+def reset_stats() -> None:
+    for cache in _caches.values():
+        cache.reset_stats()
+    _recorded.clear()
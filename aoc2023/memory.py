@@ -0,0 +1,106 @@
+# memory profiling: the tracemalloc peak, the peak RSS of the process,
+# and the allocation sites holding the most memory near the traced peak.
+
+import contextlib
+import resource
+import threading
+import tracemalloc
+from collections.abc import Iterator
+from dataclasses import dataclass, field
+
+# a new snapshot is taken when the traced memory grows this much past the last one
+SNAPSHOT_GROWTH = 1.1
+SAMPLE_INTERVAL_S = 0.005
+TOP_SITES = 5
+
+
+@dataclass
+class AllocationSite:
+    location: str
+    size: int
+    count: int
+
+    def __str__(self) -> str:
+        return f"{self.size / 2**20:9.2f} MiB in {self.count:8} blocks: {self.location}"
+
+
+@dataclass
+class MemoryStats:
+    traced_peak: int = 0
+    # for the whole process: per day (or per solution, with --separate-parts)
+    # only when run_all runs each in its own worker
+    peak_rss: int = 0
+    top_sites: list[AllocationSite] = field(default_factory=list)
+
+    def __str__(self) -> str:
+        return (
+            f"{self.traced_peak / 2**20:9.2f} MiB traced peak | "
+            f"{self.peak_rss / 2**20:9.2f} MiB peak RSS"
+        )
+
+
+class _PeakSampler(threading.Thread):
+    """
+    tracemalloc only keeps the size of the peak, so a snapshot is taken
+    whenever the traced memory reaches a new high (by SNAPSHOT_GROWTH).
+    """
+
+    def __init__(self) -> None:
+        super().__init__(daemon=True)
+        self.stop = threading.Event()
+        self.snapshot: tracemalloc.Snapshot | None = None
+        self.snapshot_size = 0
+
+    def sample(self) -> None:
+        current, _ = tracemalloc.get_traced_memory()
+        if current > self.snapshot_size * SNAPSHOT_GROWTH:
+            self.snapshot = tracemalloc.take_snapshot()
+            self.snapshot_size = current
+
+    def run(self) -> None:
+        while not self.stop.wait(SAMPLE_INTERVAL_S):
+            self.sample()
+
+
+def top_sites(snapshot: tracemalloc.Snapshot, top: int) -> list[AllocationSite]:
+    snapshot = snapshot.filter_traces(
+        [
+            tracemalloc.Filter(False, tracemalloc.__file__),  # noqa: FBT003
+            tracemalloc.Filter(False, threading.__file__),  # noqa: FBT003
+        ]
+    )
+    return [
+        AllocationSite(str(stat.traceback[0]), stat.size, stat.count)
+        for stat in snapshot.statistics("lineno")[:top]
+    ]
+
+
+@contextlib.contextmanager
+def profile_memory(top: int = TOP_SITES) -> Iterator[MemoryStats]:
+    """
+    Trace the allocations made in the with block, and fill in the stats
+    when it exits. Tracing makes the code in the block noticeably slower.
+
+    >>> with profile_memory(top=1) as stats:
+    ...     data = [bytes(1000) for _ in range(1000)]
+    >>> stats.traced_peak > 1_000_000, stats.peak_rss > stats.traced_peak
+    (True, True)
+    >>> stats.top_sites[0].count >= 1000
+    True
+    """
+    stats = MemoryStats()
+    sampler = _PeakSampler()
+    tracemalloc.start()
+    sampler.start()
+    try:
+        yield stats
+    finally:
+        sampler.stop.set()
+        sampler.join()
+        sampler.sample()
+        _, stats.traced_peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        # ru_maxrss is in KiB on Linux
+        stats.peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+        if sampler.snapshot is not None:
+            stats.top_sites = top_sites(sampler.snapshot, top)
@@ -0,0 +1,139 @@
+# bulk parsing of numeric inputs: every integer of the input in one pass
+# over its bytes, instead of split() and int() per token.
+
+from collections.abc import Sequence
+
+import numpy as np
+import numpy.typing as npt
+
+Int64Array = npt.NDArray[np.int64]
+
+MINUS = ord("-")
+SPACE = ord(" ")
+NEWLINE = ord("\n")
+# every byte that is not part of a number becomes a space
+NUMERIC_BYTES = bytes(
+    byte if chr(byte) in "0123456789-" else SPACE for byte in range(256)
+)
+INT64_MIN, INT64_MAX = np.iinfo(np.int64).min, np.iinfo(np.int64).max
+
+
+def is_digit(flat: npt.NDArray[np.uint8]) -> npt.NDArray[np.bool_]:
+    # the bytes below "0" wrap around
+    return flat - np.uint8(ord("0")) < 10  # noqa: PLR2004
+
+
+def numeric_text(data: bytes) -> bytes:
+    """
+    The input with a space for every byte that is not part of a number,
+    including the "-" that are not signs.
+    """
+    text = data.translate(NUMERIC_BYTES)
+    if b"-" in text:
+        flat = np.frombuffer(text, dtype=np.uint8)
+        minus = np.flatnonzero(flat == MINUS)
+        after = minus + 1 < len(flat)
+        after[after] = is_digit(flat[minus[after] + 1])
+        before = minus > 0
+        before[before] = is_digit(flat[minus[before] - 1])
+        not_signs = minus[~after | before]
+        if len(not_signs):
+            writable = bytearray(text)
+            np.frombuffer(writable, dtype=np.uint8)[not_signs] = SPACE
+            text = bytes(writable)
+    return text
+
+
+def extract_ints(data: str | bytes) -> Int64Array:
+    """
+    Every integer in the input, in order, as one int64 array.
+    A "-" is a sign when it is right before the digits and not right after
+    other digits, so "7-8" is 7 and 8.
+
+    >>> extract_ints("19, 13, 30 @ -2,  1, -2\\n").tolist()
+    [19, 13, 30, -2, 1, -2]
+    >>> extract_ints("seed-to-soil map: -5 --3 7-8").tolist()
+    [-5, -3, 7, 8]
+    >>> extract_ints("no numbers").tolist()
+    []
+    """
+    if isinstance(data, str):
+        data = data.encode()
+    # the parsing itself is numpy's, in C, once the separators are all spaces
+    text = numeric_text(data)
+    if not text.strip():
+        return np.zeros(0, dtype=np.int64)
+    values = np.fromstring(text, dtype=np.int64, sep=" ")
+    # numpy saturates the integers that overflow
+    if ((values == INT64_MIN) | (values == INT64_MAX)).any():
+        raise ValueError("an integer does not fit in an int64")
+    return values
+
+
+def ints_per_line(data: str | bytes) -> Int64Array:
+    """
+    The number of integers on each non-blank line.
+
+    >>> ints_per_line("1 -2 3\\n\\n4-5\\nno numbers\\n").tolist()
+    [3, 2, 0]
+    """
+    if isinstance(data, str):
+        data = data.encode()
+    flat = np.frombuffer(numeric_text(data), dtype=np.uint8)
+    is_numeric = flat != SPACE
+    # a number starts where a run of numeric bytes does
+    starts = np.flatnonzero(is_numeric & ~np.append(False, is_numeric[:-1]))
+    newlines = np.flatnonzero(np.frombuffer(data, dtype=np.uint8) == NEWLINE)
+    counts = np.bincount(np.searchsorted(newlines, starts), minlength=len(newlines) + 1)
+    non_blank = [bool(line.strip()) for line in data.split(b"\n")]
+    return counts[non_blank]
+
+
+def extract_records(data: str | bytes, width: int | None = None) -> Int64Array:
+    """
+    The integers of the input as records of width each, one per row.
+    Without a width, each non-blank line is a record, with as many integers
+    as the first one.
+
+    >>> extract_records("1,0,1~1,2,1\\n0,0,2~2,0,2\\n", 6).tolist()
+    [[1, 0, 1, 1, 2, 1], [0, 0, 2, 2, 0, 2]]
+    >>> extract_records("0 3 6\\n\\n1 3 6\\n").tolist()
+    [[0, 3, 6], [1, 3, 6]]
+    >>> extract_records("1 1 1\\n2 2\\n3 3 3 3\\n")
+    Traceback (most recent call last):
+    ...
+    ValueError: not all the lines have 3 integers
+    """
+    if isinstance(data, str):
+        data = data.encode()
+    values = extract_ints(data)
+    if width is None:
+        counts = ints_per_line(data)
+        width = int(counts[0]) if len(counts) else 1
+        if (counts != width).any():
+            raise ValueError(f"not all the lines have {width} integers")
+    if len(values) % width:
+        raise ValueError(f"{len(values)} integers do not make records of {width}")
+    return values.reshape(-1, width)
+
+
+def extract_fields(data: str | bytes, layout: Sequence[int]) -> list[Int64Array]:
+    """
+    One record of sum(layout) integers per non-blank line, split into fields
+    of layout[i] integers: one array of shape (records, layout[i]) per field.
+
+    >>> card = "Card 1: 41 48 | 83 86 6"
+    >>> card_ids, winning, numbers = extract_fields(card, [1, 2, 3])
+    >>> card_ids.tolist(), winning.tolist(), numbers.tolist()
+    ([[1]], [[41, 48]], [[83, 86, 6]])
+    >>> extract_fields("1 2 3\\n4 5 6 7 8 9\\n", [1, 2])
+    Traceback (most recent call last):
+    ...
+    ValueError: not all the lines have 3 integers
+    """
+    width = sum(layout)
+    counts = ints_per_line(data)
+    if (counts != width).any():
+        raise ValueError(f"not all the lines have {width} integers")
+    records = extract_records(data, width)
+    return np.split(records, np.cumsum(layout)[:-1].tolist(), axis=1)
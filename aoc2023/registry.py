@@ -0,0 +1,102 @@
+import importlib
+import itertools
+import re
+from collections.abc import Iterable
+from dataclasses import dataclass
+from pathlib import Path
+from time import perf_counter
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from aoc2023.common import Solution
+
+PACKAGE_DIR = Path(__file__).parent
+MODULE_NAME_RE = re.compile(r"d(?P<day>\d+)(?P<part>[ab])")
+
+
+@dataclass(frozen=True, order=True)
+class SolutionSpec:
+    day: int
+    part: str
+
+    @property
+    def name(self) -> str:
+        return f"d{self.day}{self.part}"
+
+    @property
+    def module_name(self) -> str:
+        return f"{__package__}.{self.name}"
+
+    def load(self) -> "Solution":
+        module = importlib.import_module(self.module_name)
+        solution: Solution = module.solution
+        return solution
+
+    def load_timed(self) -> tuple["Solution", float]:
+        """
+        Load the solution, and return the time it took in ms.
+        Modules that were already imported by this process are not counted.
+        """
+        t_start = perf_counter()
+        solution = self.load()
+        t_end = perf_counter()
+        return solution, (t_end - t_start) * 1000
+
+
+def available_solutions() -> list[SolutionSpec]:
+    """
+    Find the solutions by their filenames, without importing them.
+
+    >>> specs = available_solutions()
+    >>> [spec.name for spec in specs[:3]]
+    ['d1a', 'd1b', 'd2a']
+    >>> SolutionSpec(25, 'a') in specs and SolutionSpec(25, 'b') not in specs
+    True
+    """
+    matches = [
+        MODULE_NAME_RE.fullmatch(path.stem) for path in PACKAGE_DIR.glob("d*.py")
+    ]
+    return sorted(
+        SolutionSpec(int(match["day"]), match["part"]) for match in matches if match
+    )
+
+
+def select_solutions(selectors: Iterable[str] = ()) -> list[SolutionSpec]:
+    """
+    Select solutions by name ("d5b") or by day ("d5", "5").
+    With no selectors, select all the available solutions.
+
+    >>> [spec.name for spec in select_solutions(["d5", "7b", "d1a"])]
+    ['d1a', 'd5a', 'd5b', 'd7b']
+    >>> select_solutions(["d26"])
+    Traceback (most recent call last):
+    ...
+    ValueError: no solution matches 'd26'
+    """
+    specs = available_solutions()
+    selectors = list(selectors)
+    if not selectors:
+        return specs
+    selected = set()
+    for selector in selectors:
+        matching = [
+            spec
+            for spec in specs
+            if selector.removeprefix("d") in [str(spec.day), spec.name[1:]]
+        ]
+        if not matching:
+            raise ValueError(f"no solution matches {selector!r}")
+        selected.update(matching)
+    return sorted(selected)
+
+
+def group_by_day(specs: Iterable[SolutionSpec]) -> list[list[SolutionSpec]]:
+    """
+    >>> days = group_by_day(select_solutions(["d5", "7b"]))
+    >>> [[spec.name for spec in day_specs] for day_specs in days]
+    [['d5a', 'd5b'], ['d7b']]
+    """
+    return [
+        list(day_specs)
+        for _, day_specs in itertools.groupby(sorted(specs), key=lambda s: s.day)
+    ]
@@ -0,0 +1,213 @@
+# how the solutions scale: run each process_lines on synthetic inputs of
+# increasing sizes, and fit the exponent k of time ~ input_length ** k.
+
+import argparse
+import contextlib
+import io
+import json
+import multiprocessing
+import sys
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from time import perf_counter_ns
+
+import numpy as np
+
+from aoc2023.registry import SolutionSpec, select_solutions
+from aoc2023.synthetic import GENERATORS, generate
+
+DEFAULT_SCALES = [1, 2, 4, 8]
+# above this exponent, a solution is flagged as super-linear
+DEFAULT_THRESHOLD = 1.3
+# an exponent this much above the baseline's is a regression
+DEFAULT_TOLERANCE = 0.25
+DEFAULT_TIMEOUT = 60
+
+
+@dataclass
+class Measurement:
+    size: int
+    input_length: int
+    seconds: float | None = None
+    error: str | None = None
+
+
+@dataclass
+class ScalingResult:
+    name: str
+    size_unit: str
+    measurements: list[Measurement]
+    exponent: float | None
+
+    def is_super_linear(self, threshold: float = DEFAULT_THRESHOLD) -> bool:
+        return self.exponent is not None and self.exponent > threshold
+
+
+def fit_exponent(measurements: list[Measurement]) -> float | None:
+    """
+    The slope of log(time) against log(input length).
+
+    >>> fit_exponent([Measurement(n, 10 * n, (n / 100) ** 2) for n in [1, 2, 4]])
+    2.0
+    >>> fit_exponent([Measurement(1, 10, 0.5), Measurement(2, 20, error="boom")])
+    """
+    points = [(m.input_length, m.seconds) for m in measurements if m.seconds]
+    if len(points) < 2:  # noqa: PLR2004
+        return None
+    lengths, seconds = np.log(np.array(points)).T
+    return round(float(np.polyfit(lengths, seconds, 1)[0]), 2)
+
+
+def time_solution(spec: SolutionSpec, data: str, repeat: int) -> float:
+    solution = spec.load()
+    times = []
+    for _ in range(repeat):
+        t_start = perf_counter_ns()
+        # some solutions print their intermediate results
+        with contextlib.redirect_stdout(io.StringIO()):
+            solution.process_lines(data)
+        times.append(perf_counter_ns() - t_start)
+    return min(times) / 1e9
+
+
+def measure(
+    spec: SolutionSpec, size: int, seed: int, repeat: int, timeout: float
+) -> Measurement:
+    """
+    Time the solution in a fresh worker process, so that module-level caches
+    do not carry over from one size to the next, and runaway sizes can be killed.
+    """
+    data = generate(spec.day, size, seed)
+    measurement = Measurement(size, len(data))
+    with multiprocessing.Pool(1) as pool:
+        result = pool.apply_async(time_solution, (spec, data, repeat))
+        try:
+            measurement.seconds = result.get(timeout)
+        except multiprocessing.TimeoutError:
+            measurement.error = f"timed out after {timeout:g} s"
+        except Exception as e:  # noqa: BLE001
+            # e.g. d21b only solves inputs shaped like the real one
+            measurement.error = f"{type(e).__name__}: {e}"
+    return measurement
+
+
+def measure_scaling(
+    spec: SolutionSpec,
+    scales: list[int],
+    seed: int = 0,
+    repeat: int = 1,
+    timeout: float = DEFAULT_TIMEOUT,
+) -> ScalingResult:
+    """
+    Measure at base_size * scale for each scale,
+    stopping at the first measurement that fails or times out.
+    """
+    generator = GENERATORS[spec.day]
+    measurements = []
+    for scale in scales:
+        measurement = measure(spec, generator.base_size * scale, seed, repeat, timeout)
+        measurements.append(measurement)
+        if measurement.seconds is None:
+            break
+    return ScalingResult(
+        spec.name, generator.size_unit, measurements, fit_exponent(measurements)
+    )
+
+
+def print_result(result: ScalingResult, threshold: float) -> None:
+    exponent = "    ?" if result.exponent is None else f"{result.exponent:5.2f}"
+    flag = "  super-linear" if result.is_super_linear(threshold) else ""
+    print(f"{result.name:>4}: exponent {exponent}{flag}")
+    for m in result.measurements:
+        outcome = m.error if m.seconds is None else f"{m.seconds * 1000:9.1f} ms"
+        print(
+            f"{'':6}{m.size:7} {result.size_unit:<18} {m.input_length:10} chars"
+            f"  {outcome}"
+        )
+
+
+def find_regressions(
+    results: list[ScalingResult], baseline: dict[str, float | None], tolerance: float
+) -> list[str]:
+    regressions = []
+    for result in results:
+        expected = baseline.get(result.name)
+        if result.exponent is None or expected is None:
+            continue
+        if result.exponent > expected + tolerance:
+            regressions.append(
+                f"{result.name}: exponent {result.exponent:.2f}, was {expected:.2f}"
+            )
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Measure how the solutions scale with the size of their input."
+    )
+    parser.add_argument(
+        "solutions", nargs="*", help="solutions or days to measure, e.g. d11 d24a"
+    )
+    parser.add_argument(
+        "-s",
+        "--scales",
+        type=int,
+        nargs="+",
+        default=DEFAULT_SCALES,
+        help="multiples of each day's base input size",
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "-r", "--repeat", type=int, default=1, help="keep the best of this many runs"
+    )
+    parser.add_argument(
+        "--timeout",
+        type=float,
+        default=DEFAULT_TIMEOUT,
+        help="seconds before a run is abandoned, along with the larger sizes",
+    )
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    parser.add_argument(
+        "--baseline",
+        type=Path,
+        help="fail if an exponent is more than --tolerance above this file's",
+    )
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE)
+    parser.add_argument(
+        "-o", "--output", type=Path, help="write the results (a baseline) as JSON"
+    )
+    args = parser.parse_args()
+
+    results = []
+    for spec in select_solutions(args.solutions):
+        result = measure_scaling(
+            spec, args.scales, args.seed, args.repeat, args.timeout
+        )
+        print_result(result, args.threshold)
+        results.append(result)
+
+    super_linear = [r.name for r in results if r.is_super_linear(args.threshold)]
+    print(f"\nSuper-linear (exponent > {args.threshold}): {' '.join(super_linear)}")
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(
+            json.dumps(
+                {
+                    "exponents": {r.name: r.exponent for r in results},
+                    "results": [asdict(r) for r in results],
+                },
+                indent=2,
+            )
+            + "\n"
+        )
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text())["exponents"]
+        regressions = find_regressions(results, baseline, args.tolerance)
+        if regressions:
+            print("\nRegressions:")
+            print("\n".join(regressions))
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+# shortest paths over implicit graphs: states are ints (e.g. from a PointCodec),
+# and a callback yields the (state, cost) moves out of a state, so no graph
+# is built. every search counts its queue operations in SearchStats.
+
+import heapq
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass, field
+
+Neighbours = Callable[[int], Iterable[tuple[int, int]]]
+IsGoal = Callable[[int], bool]
+Heuristic = Callable[[int], int]
+
+
+@dataclass
+class SearchStats:
+    pushes: int = 0
+    pops: int = 0
+    # popped entries of states already reached at a lower cost
+    stale: int = 0
+    peak_queue: int = 0
+
+    def __str__(self) -> str:
+        return (
+            f"{self.pushes} pushes | {self.pops} pops | {self.stale} stale | "
+            f"{self.peak_queue} peak queue"
+        )
+
+
+@dataclass
+class SearchResult:
+    # None if no goal can be reached
+    cost: int | None
+    goal: int | None
+    stats: SearchStats = field(default_factory=SearchStats)
+
+
+def dijkstra(
+    sources: Iterable[int], neighbours: Neighbours, is_goal: IsGoal
+) -> SearchResult:
+    """
+    The cheapest path from any of the sources to a goal, with non-negative costs.
+
+    >>> moves = {0: [(1, 4), (2, 1)], 1: [(3, 1)], 2: [(1, 1), (3, 5)], 3: []}
+    >>> result = dijkstra([0], moves.__getitem__, lambda state: state == 3)
+    >>> result.cost, str(result.stats)
+    (3, '6 pushes | 4 pops | 0 stale | 3 peak queue')
+    """
+    return astar(sources, neighbours, is_goal, lambda _state: 0)
+
+
+def astar(
+    sources: Iterable[int],
+    neighbours: Neighbours,
+    is_goal: IsGoal,
+    heuristic: Heuristic,
+) -> SearchResult:
+    """
+    Dijkstra's search, in the order of cost plus heuristic: with a heuristic
+    that never overestimates the cost to a goal, the first goal popped
+    is the cheapest.
+
+    >>> moves = lambda state: [(state + 1, 1), (state + 2, 3)]
+    >>> result = astar([0], moves, lambda state: state >= 10, lambda s: 10 - s)
+    >>> result.cost, result.goal
+    (10, 10)
+    """
+    stats = SearchStats()
+    costs: dict[int, int] = {}
+    queue: list[tuple[int, int, int]] = []
+    for source in sources:
+        costs[source] = 0
+        queue.append((heuristic(source), 0, source))
+    heapq.heapify(queue)
+    stats.pushes = stats.peak_queue = len(queue)
+    while queue:
+        _, cost, state = heapq.heappop(queue)
+        stats.pops += 1
+        if cost > costs[state]:
+            stats.stale += 1
+            continue
+        if is_goal(state):
+            return SearchResult(cost, state, stats)
+        for next_state, move_cost in neighbours(state):
+            next_cost = cost + move_cost
+            if next_cost < costs.get(next_state, next_cost + 1):
+                costs[next_state] = next_cost
+                heapq.heappush(
+                    queue, (next_cost + heuristic(next_state), next_cost, next_state)
+                )
+                stats.pushes += 1
+        stats.peak_queue = max(stats.peak_queue, len(queue))
+    return SearchResult(None, None, stats)
+
+
+def dial(
+    sources: Iterable[int], neighbours: Neighbours, is_goal: IsGoal, max_cost: int
+) -> SearchResult:
+    """
+    Dijkstra's search with a bucket queue (Dial's algorithm), for small
+    integer move costs between 0 and max_cost: a state of cost c waits in
+    bucket c % (max_cost + 1), so pushes and pops take constant time.
+
+    >>> moves = {0: [(1, 4), (2, 1)], 1: [(3, 1)], 2: [(1, 1), (3, 5)], 3: []}
+    >>> dial([0], moves.__getitem__, lambda state: state == 3, max_cost=5).cost
+    3
+    """
+    stats = SearchStats()
+    costs: dict[int, int] = {}
+    # all the queued costs are within max_cost of the lowest one
+    buckets: list[list[int]] = [[] for _ in range(max_cost + 1)]
+    for source in sources:
+        costs[source] = 0
+        buckets[0].append(source)
+    queued = stats.pushes = stats.peak_queue = len(buckets[0])
+    cost = 0
+    while queued:
+        bucket = buckets[cost % len(buckets)]
+        while bucket:
+            state = bucket.pop()
+            queued -= 1
+            stats.pops += 1
+            if costs[state] < cost:
+                stats.stale += 1
+                continue
+            if is_goal(state):
+                return SearchResult(cost, state, stats)
+            for next_state, move_cost in neighbours(state):
+                next_cost = cost + move_cost
+                if next_cost < costs.get(next_state, next_cost + 1):
+                    costs[next_state] = next_cost
+                    buckets[next_cost % len(buckets)].append(next_state)
+                    queued += 1
+                    stats.pushes += 1
+            stats.peak_queue = max(stats.peak_queue, queued)
+        cost += 1
+    return SearchResult(None, None, stats)
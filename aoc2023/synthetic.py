@@ -0,0 +1,561 @@
+# generators of synthetic puzzle inputs, modelled on the TEST_INPUTs.
+# every generator takes a size (a number of lines, records or a grid side,
+# see InputGenerator.size_unit) and a seeded random.Random, and returns a valid input.
+# base_size is small enough for both parts to be solved in well under a second
+# (d21b only solves the real size, 131).
+
+import itertools
+import random
+import string
+from collections.abc import Callable
+from dataclasses import dataclass
+
+DIGIT_WORDS = ["one", "two", "three", "four", "five", "six", "seven", "eight", "nine"]
+
+
+@dataclass(frozen=True)
+class InputGenerator:
+    generate: Callable[[int, random.Random], str]
+    base_size: int
+    size_unit: str
+
+
+def generate_d1(size: int, rng: random.Random) -> str:
+    lines = []
+    for _ in range(size):
+        tokens = [
+            rng.choice(
+                [
+                    "".join(rng.choices(string.ascii_lowercase, k=rng.randint(1, 5))),
+                    rng.choice(DIGIT_WORDS),
+                ]
+            )
+            for _ in range(rng.randint(1, 5))
+        ]
+        tokens.insert(rng.randint(0, len(tokens)), str(rng.randint(1, 9)))
+        lines.append("".join(tokens))
+    return "\n".join(lines)
+
+
+def generate_d2(size: int, rng: random.Random) -> str:
+    lines = []
+    for game_id in range(1, size + 1):
+        draws = []
+        for _ in range(rng.randint(1, 6)):
+            colors = rng.sample(["red", "green", "blue"], rng.randint(1, 3))
+            draws.append(", ".join(f"{rng.randint(1, 20)} {c}" for c in colors))
+        lines.append(f"Game {game_id}: " + "; ".join(draws))
+    return "\n".join(lines)
+
+
+def generate_d3(size: int, rng: random.Random) -> str:
+    width = 140
+    rows = [["."] * width for _ in range(size)]
+    for row in rows:
+        x = rng.randint(0, 4)
+        while x < width - 3:
+            if rng.random() < 0.5:  # noqa: PLR2004
+                number = str(rng.randint(1, 999))
+                row[x : x + len(number)] = number
+                x += len(number)
+            else:
+                row[x] = rng.choice("*#+$/@=%-&")
+                x += 1
+            x += rng.randint(1, 8)
+    return "\n".join("".join(row) for row in rows)
+
+
+def generate_d4(size: int, rng: random.Random) -> str:
+    lines = []
+    for card_id in range(1, size + 1):
+        # a card can not win copies of cards past the end of the table
+        wins = min(rng.choice([0, 0, 0, 1, 1, 2, 3, 5, 10]), size - card_id)
+        numbers = rng.sample(range(1, 100), 35 - wins)
+        winning = numbers[:10]
+        card = winning[:wins] + numbers[10:]
+        rng.shuffle(card)
+        lines.append(
+            f"Card {card_id:3}: "
+            + " ".join(f"{n:2}" for n in winning)
+            + " | "
+            + " ".join(f"{n:2}" for n in card)
+        )
+    return "\n".join(lines)
+
+
+def generate_d5(size: int, rng: random.Random) -> str:
+    max_value = 2**32
+    seeds = []
+    for _ in range(max(1, size // 10)):
+        start = rng.randrange(max_value // 2)
+        seeds += [start, rng.randrange(1, max_value // 4)]
+    sections = [f"seeds: {' '.join(map(str, seeds))}"]
+    names = [
+        "seed",
+        "soil",
+        "fertilizer",
+        "water",
+        "light",
+        "temperature",
+        "humidity",
+        "location",
+    ]
+    for source, destination in itertools.pairwise(names):
+        # the source ranges of a map do not overlap
+        cuts = sorted(rng.sample(range(1, max_value), 2 * size))
+        lines = [f"{source}-to-{destination} map:"]
+        for start, end in zip(cuts[::2], cuts[1::2], strict=True):
+            length = end - start
+            lines.append(f"{rng.randrange(max_value - length)} {start} {length}")
+        sections.append("\n".join(lines))
+    return "\n\n".join(sections)
+
+
+def generate_d6(size: int, rng: random.Random) -> str:
+    times = [rng.randint(7, 99) for _ in range(size)]
+    distances = [rng.randint(1, t * t // 4 - 1) for t in times]
+    return "\n".join(
+        [
+            "Time:     " + " ".join(f"{t:4}" for t in times),
+            "Distance: " + " ".join(f"{d:4}" for d in distances),
+        ]
+    )
+
+
+def generate_d7(size: int, rng: random.Random) -> str:
+    return "\n".join(
+        "".join(rng.choices("23456789TJQKA", k=5)) + f" {rng.randint(1, 1000)}"
+        for _ in range(size)
+    )
+
+
+def node_names(count: int, rng: random.Random, suffix: str = "") -> list[str]:
+    length = 3 - len(suffix)
+    names: set[str] = set()
+    while len(names) < count:
+        name = "".join(rng.choices(string.ascii_uppercase[:24], k=length)) + suffix
+        names.add(name)
+    return sorted(names)
+
+
+def generate_d8(size: int, rng: random.Random) -> str:
+    """
+    >>> from aoc2023.d8a import solution
+    >>> [solution.process_lines(generate(8, seed=seed)) > 0 for seed in range(56, 64)]
+    [True, True, True, True, True, True, True, True]
+    """
+    instructions = "".join(rng.choices("LR", k=rng.randint(5, 300)))
+    # AAA reaches ZZZ through a chain where both directions lead on,
+    # every ghost (..A) walks a loop that goes through a ..Z node
+    others = [
+        name for name in node_names(size, rng) if name[-1] not in "AZ" and name != "XXX"
+    ]
+    chain_length = max(1, len(others) // 4)
+    chain = ["AAA", *others[:chain_length], "ZZZ"]
+    network = {
+        node: (next_node, next_node) for node, next_node in itertools.pairwise(chain)
+    }
+    network["ZZZ"] = ("ZZZ", "ZZZ")
+    rest = others[chain_length:]
+    num_ghosts = min(6, len(rest) // 3)
+    # AAA starts the chain, so it cannot start a ghost loop too
+    ghost_starts = [
+        name for name in node_names(num_ghosts + 1, rng, suffix="A") if name != "AAA"
+    ][:num_ghosts]
+    ghost_ends = node_names(num_ghosts, rng, suffix="Z")
+    for g, (start, end) in enumerate(zip(ghost_starts, ghost_ends, strict=True)):
+        loop = [end, *rest[g::num_ghosts]]
+        for node, next_node in zip(loop, loop[1:] + loop[:1], strict=True):
+            network[node] = (next_node, next_node)
+        network[start] = network[end]
+    lines = [f"{node} = ({left}, {right})" for node, (left, right) in network.items()]
+    rng.shuffle(lines)
+    return instructions + "\n\n" + "\n".join(lines)
+
+
+def generate_d9(size: int, rng: random.Random) -> str:
+    lines = []
+    for _ in range(size):
+        coefficients = [rng.randint(-5, 5) for _ in range(rng.randint(1, 5))]
+        values = [
+            sum(c * x**i for i, c in enumerate(coefficients)) for x in range(-5, 16)
+        ]
+        lines.append(" ".join(map(str, values)))
+    return "\n".join(lines)
+
+
+def staircase_loop(
+    height: int, width: int, rng: random.Random
+) -> list[tuple[int, int]]:
+    """
+    A closed loop of cells: a random staircase on top, straight on the other sides.
+    """
+    bottom = height - 1
+    tops = [rng.randint(0, bottom - 1) for _ in range(width - 1)]
+    # the right side only goes down
+    tops.append(tops[-1])
+    cells = [(tops[0], 0)]
+    for x in range(1, width):
+        y = cells[-1][0]
+        cells.append((y, x))
+        step = 1 if tops[x] > y else -1
+        cells.extend((yy, x) for yy in range(y + step, tops[x] + step, step))
+    y, x = cells[-1]
+    cells.extend((yy, x) for yy in range(y + 1, bottom + 1))
+    cells.extend((bottom, xx) for xx in range(width - 2, -1, -1))
+    cells.extend((yy, 0) for yy in range(bottom - 1, tops[0], -1))
+    return cells
+
+
+def generate_d10(size: int, rng: random.Random) -> str:
+    pipes = {
+        frozenset([(0, -1), (0, 1)]): "-",
+        frozenset([(-1, 0), (1, 0)]): "|",
+        frozenset([(-1, 0), (0, 1)]): "L",
+        frozenset([(-1, 0), (0, -1)]): "J",
+        frozenset([(1, 0), (0, -1)]): "7",
+        frozenset([(1, 0), (0, 1)]): "F",
+    }
+    # a margin of ground around the loop
+    rows = [
+        [rng.choice(".......|-LJ7F") for _ in range(size + 2)] for _ in range(size + 2)
+    ]
+    cells = [(y + 1, x + 1) for y, x in staircase_loop(size, size, rng)]
+    for i, (y, x) in enumerate(cells):
+        (py, px), (ny, nx) = cells[i - 1], cells[(i + 1) % len(cells)]
+        rows[y][x] = pipes[frozenset([(py - y, px - x), (ny - y, nx - x)])]
+    sy, sx = cells[rng.randrange(len(cells))]
+    loop = set(cells)
+    # junk pipes next to the start could be mistaken for the loop
+    for dy, dx in [(0, 1), (0, -1), (1, 0), (-1, 0)]:
+        if (sy + dy, sx + dx) not in loop:
+            rows[sy + dy][sx + dx] = "."
+    rows[sy][sx] = "S"
+    return "\n".join("".join(row) for row in rows)
+
+
+def generate_d11(size: int, rng: random.Random) -> str:
+    empty_rows = set(rng.sample(range(size), size // 10))
+    empty_cols = set(rng.sample(range(size), size // 10))
+    return "\n".join(
+        "".join(
+            (
+                "#"
+                if y not in empty_rows
+                and x not in empty_cols
+                and rng.random() < 0.03  # noqa: PLR2004
+                else "."
+            )
+            for x in range(size)
+        )
+        for y in range(size)
+    )
+
+
+def generate_d12(size: int, rng: random.Random) -> str:
+    lines = []
+    for _ in range(size):
+        groups = [rng.randint(1, 4) for _ in range(rng.randint(1, 5))]
+        springs = "." * rng.randint(0, 2)
+        for group in groups:
+            springs += "#" * group + "." * rng.randint(1, 3)
+        springs = "".join(rng.choice([c, c, "?"]) for c in springs)
+        lines.append(f"{springs} {','.join(map(str, groups))}")
+    return "\n".join(lines)
+
+
+def generate_d13(size: int, rng: random.Random) -> str:
+    patterns = []
+    for _ in range(size):
+        width = rng.randint(5, 17)
+        half = ["".join(rng.choices("#.", k=width)) for _ in range(rng.randint(1, 8))]
+        rows = [
+            *("".join(rng.choices("#.", k=width)) for _ in range(rng.randint(0, 3))),
+            *half,
+            *reversed(half),
+        ]
+        # a smudge, so there is also a reflection line for part b
+        y, x = rng.randrange(len(rows)), rng.randrange(width)
+        rows[y] = rows[y][:x] + ("#" if rows[y][x] == "." else ".") + rows[y][x + 1 :]
+        if rng.random() < 0.5:  # noqa: PLR2004
+            rows = ["".join(column) for column in zip(*rows, strict=True)]
+        patterns.append("\n".join(rows))
+    return "\n\n".join(patterns)
+
+
+def generate_d14(size: int, rng: random.Random) -> str:
+    return "\n".join(
+        "".join(rng.choices("O#.", weights=[2, 1, 5], k=size)) for _ in range(size)
+    )
+
+
+def generate_d15(size: int, rng: random.Random) -> str:
+    labels = [
+        "".join(rng.choices(string.ascii_lowercase, k=rng.randint(2, 6)))
+        for _ in range(max(1, size // 4))
+    ]
+    return ",".join(
+        (
+            f"{rng.choice(labels)}=" + str(rng.randint(1, 9))
+            if rng.random() < 0.7  # noqa: PLR2004
+            else f"{rng.choice(labels)}-"
+        )
+        for _ in range(size)
+    )
+
+
+def generate_d16(size: int, rng: random.Random) -> str:
+    return "\n".join(
+        "".join(rng.choices(".|-/\\", weights=[20, 1, 1, 1, 1], k=size))
+        for _ in range(size)
+    )
+
+
+def generate_d17(size: int, rng: random.Random) -> str:
+    return "\n".join("".join(rng.choices("123456789", k=size)) for _ in range(size))
+
+
+def rectilinear_polygon(
+    steps: int, max_distance: int, rng: random.Random
+) -> list[tuple[str, int]]:
+    """
+    A closed, non-crossing dig plan with 2 * steps + 4 edges:
+    a staircase going right, then down, left and up back to the start.
+    """
+    heights = [0]
+    for _ in range(steps):
+        heights.append(heights[-1] + rng.choice([-1, 1]) * rng.randint(1, max_distance))
+    bottom = max(heights) + rng.randint(1, max_distance)
+    widths = [rng.randint(1, max_distance) for _ in range(steps + 1)]
+    plan = []
+    for width, (y0, y1) in zip(widths, itertools.pairwise(heights), strict=False):
+        plan.append(("R", width))
+        plan.append(("D" if y1 > y0 else "U", abs(y1 - y0)))
+    plan.append(("R", widths[-1]))
+    plan.append(("D", bottom - heights[-1]))
+    plan.append(("L", sum(widths)))
+    plan.append(("U", bottom))
+    return plan
+
+
+def generate_d18(size: int, rng: random.Random) -> str:
+    plan = rectilinear_polygon(size, 10, rng)
+    hex_plan = rectilinear_polygon(size, 0xFFFFF, rng)
+    return "\n".join(
+        f"{direction} {distance} (#{hex_distance:05x}{'RDLU'.index(hex_direction)})"
+        for (direction, distance), (hex_direction, hex_distance) in zip(
+            plan, hex_plan, strict=True
+        )
+    )
+
+
+def generate_d19(size: int, rng: random.Random) -> str:
+    # the workflows form a tree, so every part ends up accepted or rejected
+    names = ["in"] + [
+        "".join(rng.choices(string.ascii_lowercase, k=3)) for _ in range(size - 1)
+    ]
+    names = list(dict.fromkeys(names))
+    children: dict[str, list[str]] = {name: [] for name in names}
+    for i, name in enumerate(names[1:], 1):
+        children[names[rng.randrange(i)]].append(name)
+    lines = []
+    for name in names:
+        targets = children[name] + rng.choices(["A", "R"], k=rng.randint(1, 2))
+        rng.shuffle(targets)
+        rules = [
+            f"{rng.choice('xmas')}{rng.choice('<>')}{rng.randint(1, 4000)}:{target}"
+            for target in targets[:-1]
+        ]
+        lines.append(f"{name}{{{','.join([*rules, targets[-1]])}}}")
+    rng.shuffle(lines)
+    parts = [
+        "{" + ",".join(f"{c}={rng.randint(1, 4000)}" for c in "xmas") + "}"
+        for _ in range(size)
+    ]
+    return "\n".join(lines) + "\n\n" + "\n".join(parts)
+
+
+def generate_d20(size: int, rng: random.Random) -> str:
+    # like the real inputs: 12-bit counters made of flip-flops, each resetting
+    # itself through a conjunction when it reaches its number
+    bits = 12
+    names = iter(
+        "".join(name)
+        for name in itertools.product(string.ascii_lowercase, repeat=2)
+        if "".join(name) not in ["rx"]
+    )
+    counters = []
+    lines = []
+    final = next(names)
+    for _ in range(size):
+        number = rng.randrange(2 ** (bits - 1), 2**bits) | 1
+        flip_flops = [next(names) for _ in range(bits)]
+        conjunction, inverter = next(names), next(names)
+        for i, flip_flop in enumerate(flip_flops):
+            targets = flip_flops[i + 1 : i + 2]
+            if number >> i & 1:
+                targets.append(conjunction)
+            lines.append(f"%{flip_flop} -> {', '.join(targets)}")
+        resets = [f for i, f in enumerate(flip_flops) if not number >> i & 1]
+        lines.append(
+            f"&{conjunction} -> {', '.join([*resets, flip_flops[0], inverter])}"
+        )
+        lines.append(f"&{inverter} -> {final}")
+        counters.append(flip_flops[0])
+    lines.append(f"&{final} -> rx")
+    lines.append(f"broadcaster -> {', '.join(counters)}")
+    rng.shuffle(lines)
+    return "\n".join(lines)
+
+
+def generate_d21(size: int, rng: random.Random) -> str:
+    # like the real inputs: odd side, start in the center, clear center lines and edges
+    size |= 1
+    center = size // 2
+    rows = []
+    for y in range(size):
+        row = [
+            (
+                "."
+                if y in [0, center, size - 1] or x in [0, center, size - 1]
+                else rng.choices(".#", weights=[6, 1])[0]
+            )
+            for x in range(size)
+        ]
+        rows.append(row)
+    rows[center][center] = "S"
+    return "\n".join("".join(row) for row in rows)
+
+
+def generate_d22(size: int, rng: random.Random) -> str:
+    # each brick starts above the previous one, so no bricks overlap
+    lines = []
+    z = 1
+    for _ in range(size):
+        x, y = rng.randint(0, 9), rng.randint(0, 9)
+        length = rng.randint(0, 3)
+        axis = rng.randrange(3)
+        end = [x, y, z]
+        end[axis] += length
+        end[0], end[1] = min(end[0], 9), min(end[1], 9)
+        lines.append(f"{x},{y},{z}~{end[0]},{end[1]},{end[2]}")
+        z = end[2] + rng.randint(1, 2)
+    rng.shuffle(lines)
+    return "\n".join(lines)
+
+
+def generate_d23(size: int, rng: random.Random) -> str:
+    # a size x size lattice of junctions, joined by corridors that go
+    # right or down, with slopes at both ends like the real inputs
+    row_gaps = [rng.randint(4, 8) for _ in range(size)]
+    col_gaps = [rng.randint(4, 8) for _ in range(size - 1)]
+    junction_ys = list(itertools.accumulate(row_gaps))
+    junction_xs = [1, *(1 + x for x in itertools.accumulate(col_gaps))]
+    height = junction_ys[-1] + rng.randint(4, 8) + 1
+    width = junction_xs[-1] + 2
+    maze = [["#"] * width for _ in range(height)]
+    for y in range(junction_ys[0] - 1):
+        maze[y][1] = "."
+    maze[junction_ys[0] - 1][1] = "v"
+    for y in range(junction_ys[-1] + 1, height):
+        maze[y][width - 2] = "."
+    maze[junction_ys[-1] + 1][width - 2] = "v"
+    for i, y in enumerate(junction_ys):
+        for j, x in enumerate(junction_xs):
+            maze[y][x] = "."
+            if j + 1 < size:
+                x_next = junction_xs[j + 1]
+                maze[y][x + 1 : x_next] = ">" + "." * (x_next - x - 3) + ">"
+                # a detour down, so that not all the paths have the same length
+                y_below = junction_ys[i + 1] if i + 1 < size else height - 1
+                if x_next - x >= 6:  # noqa: PLR2004
+                    detour = rng.randint(0, y_below - y - 2)
+                    maze[y][x + 3 : x_next - 2] = "#" * (x_next - x - 5)
+                    for yy in range(y + 1, y + detour + 1):
+                        maze[yy][x + 2] = maze[yy][x_next - 2] = "."
+                    maze[y + detour][x + 2 : x_next - 1] = "." * (x_next - x - 3)
+            if i + 1 < size:
+                y_next = junction_ys[i + 1]
+                for yy in range(y + 1, y_next):
+                    maze[yy][x] = "v" if yy in [y + 1, y_next - 1] else "."
+    return "\n".join("".join(row) for row in maze)
+
+
+def generate_d24(size: int, rng: random.Random) -> str:
+    # every hailstone is hit by the same rock, at a distinct integer time
+    rock = [rng.randint(2 * 10**14, 4 * 10**14) for _ in range(3)]
+    rock_v = [rng.randint(-300, 300) for _ in range(3)]
+    times = rng.sample(range(10**11, 10**12), size)
+    lines = []
+    for t in times:
+        v = [rng.randint(-300, 300) for _ in range(3)]
+        p = [pr + (vr - vs) * t for pr, vr, vs in zip(rock, rock_v, v, strict=True)]
+        lines.append(f"{p[0]}, {p[1]}, {p[2]} @ {v[0]}, {v[1]}, {v[2]}")
+    return "\n".join(lines)
+
+
+def generate_d25(size: int, rng: random.Random) -> str:
+    # two well-connected halves, joined by exactly three wires
+    names = node_names(max(size, 10), rng)
+    names = [name.lower() for name in names]
+    rng.shuffle(names)
+    halves = [names[: len(names) // 2], names[len(names) // 2 :]]
+    edges = set()
+    for half in halves:
+        for i, node in enumerate(half):
+            for other in rng.sample(half[:i] + half[i + 1 :], min(4, len(half) - 1)):
+                edges.add(tuple(sorted([node, other])))
+    for node1, node2 in zip(
+        rng.sample(halves[0], 3), rng.sample(halves[1], 3), strict=True
+    ):
+        edges.add((node1, node2))
+    connections: dict[str, list[str]] = {}
+    for node1, node2 in sorted(edges):
+        connections.setdefault(node1, []).append(node2)
+    return "\n".join(
+        f"{node}: {' '.join(others)}" for node, others in connections.items()
+    )
+
+
+GENERATORS = {
+    1: InputGenerator(generate_d1, 1000, "lines"),
+    2: InputGenerator(generate_d2, 100, "games"),
+    3: InputGenerator(generate_d3, 140, "rows"),
+    4: InputGenerator(generate_d4, 200, "cards"),
+    5: InputGenerator(generate_d5, 30, "ranges per map"),
+    6: InputGenerator(generate_d6, 4, "races"),
+    7: InputGenerator(generate_d7, 1000, "hands"),
+    8: InputGenerator(generate_d8, 700, "nodes"),
+    9: InputGenerator(generate_d9, 200, "lines"),
+    10: InputGenerator(generate_d10, 140, "side"),
+    11: InputGenerator(generate_d11, 40, "side"),
+    12: InputGenerator(generate_d12, 1000, "lines"),
+    13: InputGenerator(generate_d13, 100, "patterns"),
+    14: InputGenerator(generate_d14, 30, "side"),
+    15: InputGenerator(generate_d15, 4000, "steps"),
+    16: InputGenerator(generate_d16, 20, "side"),
+    17: InputGenerator(generate_d17, 20, "side"),
+    18: InputGenerator(generate_d18, 50, "steps"),
+    19: InputGenerator(generate_d19, 500, "workflows"),
+    20: InputGenerator(generate_d20, 4, "counters"),
+    21: InputGenerator(generate_d21, 131, "side"),
+    22: InputGenerator(generate_d22, 200, "bricks"),
+    23: InputGenerator(generate_d23, 3, "junctions per side"),
+    24: InputGenerator(generate_d24, 300, "hailstones"),
+    25: InputGenerator(generate_d25, 200, "components"),
+}
+
+
+def generate(day: int, size: int | None = None, seed: int = 0) -> str:
+    """
+    >>> print(generate(7, 3, seed=1))
+    3KJ58 461
+    8648K 400
+    7J27J 235
+    >>> from aoc2023.d7b import solution
+    >>> solution.process_lines(generate(7, 3, seed=1))
+    1966
+    """
+    generator = GENERATORS[day]
+    rng = random.Random(seed)
+    return generator.generate(generator.base_size if size is None else size, rng)
@@ -1,22 +1,133 @@
-import importlib
+import argparse
+import contextlib
+import functools
+import os
+import traceback
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass, field
 from time import time
 
+from aoc2023.common import Phases, shared_parse
+from aoc2023.memory import MemoryStats, profile_memory
+from aoc2023.registry import SolutionSpec, group_by_day, select_solutions
 
-def main() -> None:
-    solve_times: dict[str, float] = {}
-    for day in range(1, 25 + 1):
-        solve_times[f"d{day}"] = 0
-        for part in ["a", "b"]:
+
+@dataclass
+class SolveResult:
+    name: str
+    # None if the solution failed, with the error instead
+    answer: int | None
+    solve_ms: float
+    import_ms: float
+    phases: Phases = field(default_factory=dict)
+    memory: MemoryStats | None = None
+    error: str | None = None
+
+
+def run_day(
+    specs: list[SolutionSpec],
+    *,
+    phases: bool = False,
+    use_cache: bool | None = None,
+    memory: bool = False,
+) -> list[SolveResult]:
+    """
+    Solve the parts of a day. If they share a parse step, the input is parsed
+    once, by (and in the time and memory of) the first part that needs it.
+    """
+    loaded = [spec.load_timed() for spec in specs]
+    parsed = shared_parse([solution for solution, _ in loaded])
+    results = []
+    for spec, (solution, import_ms) in zip(specs, loaded, strict=True):
+        profiler = profile_memory() if memory else contextlib.nullcontext()
+        solve_phases: Phases = {}
+        with profiler as memory_stats:
+            if phases:
+                answer, solve_phases = solution.solve_with_phases(parsed)
+                t_ns = sum(
+                    solve_phases[phase].wall_ns
+                    for phase in ["load", "parse", "solve"]
+                    if phase in solve_phases
+                )
+                t_ms = t_ns / 1e6
+            else:
+                t_start = time()
+                answer = solution.solve(use_cache=use_cache, parsed=parsed)
+                t_ms = (time() - t_start) * 1000
+        results.append(
+            SolveResult(spec.name, answer, t_ms, import_ms, solve_phases, memory_stats)
+        )
+    return results
+
+
+def print_result(result: SolveResult) -> None:
+    outcome = result.answer if result.error is None else result.error
+    print(f"[{result.solve_ms:7.1f} ms] {result.name}: {outcome}")
+    for phase, stats in result.phases.items():
+        print(f"{phase:>15}: {stats}")
+    if result.memory is not None:
+        print(f"{'memory':>15}: {result.memory}")
+        for site in result.memory.top_sites:
+            print(f"{'':>15}  {site}")
+
+
+def run_serial(
+    groups: list[list[SolutionSpec]],
+    *,
+    phases: bool,
+    use_cache: bool | None,
+    memory: bool,
+) -> list[SolveResult]:
+    results = []
+    for specs in groups:
+        for result in run_day(specs, phases=phases, use_cache=use_cache, memory=memory):
+            print_result(result)
+            results.append(result)
+    return results
+
+
+def run_parallel(
+    groups: list[list[SolutionSpec]],
+    jobs: int | None,
+    *,
+    phases: bool,
+    use_cache: bool | None,
+    memory: bool,
+) -> list[SolveResult]:
+    # max_tasks_per_child=1 gives every day a fresh interpreter, so module-level
+    # state (e.g. d23b.longest_path_cache) cannot leak from one day to another
+    with ProcessPoolExecutor(max_workers=jobs, max_tasks_per_child=1) as executor:
+        futures: list[Future[list[SolveResult]]] = [
+            executor.submit(
+                functools.partial(
+                    run_day, phases=phases, use_cache=use_cache, memory=memory
+                ),
+                specs,
+            )
+            for specs in groups
+        ]
+        results = []
+        for specs, future in zip(groups, futures, strict=True):
+            # a day that fails (or crashes its worker) only loses its own results
             try:
-                module = importlib.import_module(f"aoc2023.d{day}{part}")
-            except ModuleNotFoundError:
-                continue
-            t_start = time()
-            answer = module.solution.solve()
-            t_end = time()
-            t_ms = (t_end - t_start) * 1000
-            solve_times[f"d{day}"] += t_ms
-            print(f"[{t_ms:7.1f} ms] d{day}{part}: {answer}")
+                day_results = future.result()
+            except Exception as e:  # noqa: BLE001
+                error = traceback.format_exception_only(e)[-1].strip()
+                day_results = [
+                    SolveResult(spec.name, None, 0.0, 0.0, error=error)
+                    for spec in specs
+                ]
+            for result in day_results:
+                print_result(result)
+                results.append(result)
+    return results
+
+
+def print_most_time_consuming(results: list[SolveResult]) -> None:
+    solve_times: dict[str, float] = {}
+    for result in results:
+        day = result.name[:-1]
+        solve_times[day] = solve_times.get(day, 0) + result.solve_ms
 
     print("\nMost time-consuming:")
     for day, solve_time in sorted(
@@ -25,5 +136,112 @@ def main() -> None:
         print(f"{day}: {solve_time:7.1f} ms")
 
 
+def print_most_memory_hungry(results: list[SolveResult]) -> None:
+    peaks: dict[str, MemoryStats] = {}
+    for result in results:
+        if result.memory is None:
+            continue
+        day = result.name[:-1]
+        if day not in peaks or result.memory.traced_peak > peaks[day].traced_peak:
+            peaks[day] = result.memory
+
+    print("\nMost memory-hungry:")
+    for day, stats in sorted(
+        peaks.items(), key=lambda x: x[1].traced_peak, reverse=True
+    )[:5]:
+        print(f"{day}: {stats}")
+
+
+def print_import_times(results: list[SolveResult]) -> None:
+    print("\nImport times:")
+    for result in sorted(results, key=lambda r: r.import_ms, reverse=True):
+        print(f"{result.name}: {result.import_ms:7.1f} ms")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Solve all days and time them.")
+    parser.add_argument(
+        "solutions", nargs="*", help="solutions or days to run, e.g. d5 d7b"
+    )
+    parser.add_argument(
+        "-l", "--list", action="store_true", help="list the solutions and exit"
+    )
+    parser.add_argument(
+        "-p",
+        "--parallel",
+        action="store_true",
+        help="run each day (or solution, with --separate-parts) in its own worker",
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=os.cpu_count(),
+        help="number of worker processes for --parallel (default: number of cores)",
+    )
+    parser.add_argument(
+        "--import-times",
+        action="store_true",
+        help=(
+            "report the import time of each solution module; "
+            "use with --parallel to measure each one in a fresh interpreter"
+        ),
+    )
+    parser.add_argument(
+        "--separate-parts",
+        action="store_true",
+        help="parse the input for each part, instead of once for both parts of a day",
+    )
+    parser.add_argument(
+        "--phases",
+        action="store_true",
+        help="report the time spent in each phase (span) of each solution",
+    )
+    parser.add_argument(
+        "--cache",
+        action=argparse.BooleanOptionalAction,
+        default=None,
+        help="reuse answers of unchanged solutions (default: $AOC2023_ANSWER_CACHE)",
+    )
+    parser.add_argument(
+        "--memory",
+        action="store_true",
+        help=(
+            "report the peak memory and the top allocation sites of each solution "
+            "(slower); the peak RSS is that of the process: use with --parallel "
+            "for a peak RSS per day, and add --separate-parts for one per solution"
+        ),
+    )
+    args = parser.parse_args()
+
+    specs = select_solutions(args.solutions)
+    if args.list:
+        print(" ".join(spec.name for spec in specs))
+        return
+    groups = [[spec] for spec in specs] if args.separate_parts else group_by_day(specs)
+    if args.parallel:
+        results = run_parallel(
+            groups,
+            args.jobs,
+            phases=args.phases,
+            use_cache=args.cache,
+            memory=args.memory,
+        )
+    else:
+        results = run_serial(
+            groups, phases=args.phases, use_cache=args.cache, memory=args.memory
+        )
+    failed = [result.name for result in results if result.error is not None]
+    if failed:
+        print(f"\nFailed: {' '.join(failed)}")
+    print_most_time_consuming(results)
+    if args.memory:
+        print_most_memory_hungry(results)
+    if args.import_times:
+        print_import_times(results)
+    if failed:
+        raise SystemExit(1)
+
+
 if __name__ == "__main__":
     main()